@@ -0,0 +1,59 @@
+"""add filter and membership indexes
+
+Revision ID: 4b9e2c71d0a3
+Revises: 97f108fb518e
+Create Date: 2025-07-20 10:12:44.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b9e2c71d0a3'
+down_revision: Union[str, None] = '97f108fb518e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) – mirrors the index=True / __table_args__
+# declarations on the models.
+INDEXES = [
+    ("ix_tasks_project_id_status",               "tasks",            ["project_id", "status"]),
+    ("ix_tasks_big_task_id",                     "tasks",            ["big_task_id"]),
+    ("ix_tasks_assignee_id",                     "tasks",            ["assignee_id"]),
+    ("ix_tasks_reporter_id",                     "tasks",            ["reporter_id"]),
+    ("ix_tasks_due_date",                        "tasks",            ["due_date"]),
+    ("ix_big_tasks_project_id",                  "big_tasks",        ["project_id"]),
+    ("ix_projects_owner_id",                     "projects",         ["owner_id"]),
+    ("ix_project_members_user_id_project_id",    "project_members",  ["user_id", "project_id"]),
+    ("ix_big_task_members_user_id_big_task_id",  "big_task_members", ["user_id", "big_task_id"]),
+    ("ix_notifications_user_id_read_created_at", "notifications",    ["user_id", "read", "created_at"]),
+    ("ix_task_comments_task_id_created_at",      "task_comments",    ["task_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction; building online keeps
+    # writes flowing on big tables. Other dialects ignore the flag.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
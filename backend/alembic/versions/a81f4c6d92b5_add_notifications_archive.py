@@ -0,0 +1,55 @@
+"""add notifications archive and created_at index
+
+Revision ID: a81f4c6d92b5
+Revises: c3f1a8d25e67
+Create Date: 2025-07-24 15:03:27.190412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81f4c6d92b5'
+down_revision: Union[str, None] = 'c3f1a8d25e67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "notifications_archive",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_index("ix_notifications_archive_user_id", "notifications_archive",
+                    ["user_id"], if_not_exists=True)
+    op.create_index("ix_notifications_archive_archived_at", "notifications_archive",
+                    ["archived_at"], if_not_exists=True)
+
+    # the retention job scans by age across all users
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_created_at", "notifications", ["created_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notifications_created_at", table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+    op.drop_table("notifications_archive", if_exists=True)
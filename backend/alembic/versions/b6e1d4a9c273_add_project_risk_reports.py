@@ -0,0 +1,39 @@
+"""add project_risk_reports for precomputed risk analyses
+
+Revision ID: b6e1d4a9c273
+Revises: f2b8d3c6a914
+Create Date: 2025-07-29 14:41:37.208115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1d4a9c273'
+down_revision: Union[str, None] = 'f2b8d3c6a914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "project_risk_reports",
+        sa.Column("project_id", sa.Integer(),
+                  sa.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("mode", sa.String(16), primary_key=True),
+        sa.Column("data_version", sa.Integer(), nullable=False),
+        sa.Column("report", sa.JSON(), nullable=False),
+        sa.Column("generated_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_project_risk_reports_generated_at", "project_risk_reports",
+                    ["generated_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("project_risk_reports", if_exists=True)
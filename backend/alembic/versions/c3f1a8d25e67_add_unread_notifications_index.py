@@ -0,0 +1,40 @@
+"""add partial index for unread notifications
+
+Revision ID: c3f1a8d25e67
+Revises: 4b9e2c71d0a3
+Create Date: 2025-07-22 09:41:03.551870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a8d25e67'
+down_revision: Union[str, None] = '4b9e2c71d0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_unread_user_id", "notifications", ["user_id"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("read IS false"),   # same predicate the ORM emits
+            sqlite_where=sa.text("read IS 0"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notifications_unread_user_id", table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,57 @@
+"""add full-text search vectors on tasks and task_comments
+
+Revision ID: c8d2f5a1e934
+Revises: b6e1d4a9c273
+Create Date: 2025-07-31 10:06:54.381902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2f5a1e934'
+down_revision: Union[str, None] = 'b6e1d4a9c273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres only – the same SQL as common/fulltext.py emits for create_all().
+# SQLite dev databases get their FTS5 tables from create_all().
+# Adding a STORED generated column rewrites the table once.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)"
+    )
+    op.execute(
+        "ALTER TABLE task_comments ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(content, '')), 'A')"
+        ") STORED"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_task_comments_search_vector "
+        "ON task_comments USING gin (search_vector)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_task_comments_search_vector")
+    op.execute("ALTER TABLE task_comments DROP COLUMN IF EXISTS search_vector")
+    op.execute("DROP INDEX IF EXISTS ix_tasks_search_vector")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
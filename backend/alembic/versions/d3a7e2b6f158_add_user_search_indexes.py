@@ -0,0 +1,45 @@
+"""add trigram and prefix indexes for user typeahead
+
+Revision ID: d3a7e2b6f158
+Revises: c8d2f5a1e934
+Create Date: 2025-08-01 16:22:09.517340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7e2b6f158'
+down_revision: Union[str, None] = 'c8d2f5a1e934'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres only – expressions must match services/user_service/search.py.
+#   gin_trgm_ops       → `%` similarity matches (queries of 3+ chars)
+#   text_pattern_ops   → LIKE 'ab%' prefix matches of any length
+
+INDEXES = {
+    "ix_users_username_trgm":       "USING gin (lower(username) gin_trgm_ops)",
+    "ix_users_display_name_trgm":   "USING gin (lower(coalesce(display_name, '')) gin_trgm_ops)",
+    "ix_users_username_prefix":     "(lower(username) text_pattern_ops)",
+    "ix_users_display_name_prefix": "(lower(coalesce(display_name, '')) text_pattern_ops)",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON users {definition}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
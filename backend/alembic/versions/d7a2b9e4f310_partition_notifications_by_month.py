@@ -0,0 +1,132 @@
+"""partition notifications by month (optional, Postgres)
+
+Revision ID: d7a2b9e4f310
+Revises: a81f4c6d92b5
+Create Date: 2025-07-24 15:40:51.602277
+
+Opt-in: only runs with NOTIFICATIONS_PARTITIONING=1 on Postgres, otherwise
+it is a no-op. Rebuilds `notifications` as a table range-partitioned on
+created_at (one partition per month + a default), copying existing rows.
+The copy takes an exclusive lock – run it in a maintenance window.
+The scheduler's retention job creates future partitions afterwards.
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2b9e4f310'
+down_revision: Union[str, None] = 'a81f4c6d92b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 2
+
+
+def _enabled() -> bool:
+    return (
+        os.getenv("NOTIFICATIONS_PARTITIONING") == "1"
+        and op.get_bind().dialect.name == "postgresql"
+    )
+
+
+def _is_partitioned() -> bool:
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'notifications'"
+    )).first())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _enabled() or _is_partitioned():
+        return
+
+    op.execute("LOCK TABLE notifications IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    # keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY NONE")
+
+    # the partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE notifications (
+            id         integer     NOT NULL DEFAULT nextval('notifications_id_seq'),
+            user_id    integer     NOT NULL REFERENCES users(id),
+            message    varchar     NOT NULL,
+            read       boolean     NOT NULL DEFAULT false,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY notifications.id")
+
+    # one partition per month from the oldest row up to MONTHS_AHEAD ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            m date := date_trunc('month', coalesce(
+                (SELECT min(created_at) FROM notifications_unpartitioned), now()))::date;
+            last date := (date_trunc('month', now()) + interval '{MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE m <= last LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF notifications '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                    m, (m + interval '1 month')::date);
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    op.execute("""
+        INSERT INTO notifications (id, user_id, message, read, created_at)
+        SELECT id, user_id, message, read, coalesce(created_at, now())
+        FROM notifications_unpartitioned
+    """)
+    op.execute("DROP TABLE notifications_unpartitioned")
+
+    # indexes on the parent cascade to every partition
+    op.create_index("ix_notifications_id", "notifications", ["id"])
+    op.create_index("ix_notifications_created_at", "notifications", ["created_at"])
+    op.create_index("ix_notifications_user_id_read_created_at", "notifications",
+                    ["user_id", "read", "created_at"])
+    op.create_index("ix_notifications_unread_user_id", "notifications", ["user_id"],
+                    postgresql_where=sa.text("read IS false"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql" or not _is_partitioned():
+        return
+
+    op.execute("LOCK TABLE notifications IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE notifications (
+            id         integer     PRIMARY KEY DEFAULT nextval('notifications_id_seq'),
+            user_id    integer     NOT NULL REFERENCES users(id),
+            message    varchar     NOT NULL,
+            read       boolean     NOT NULL DEFAULT false,
+            created_at timestamptz DEFAULT now()
+        )
+    """)
+    op.execute("ALTER SEQUENCE notifications_id_seq OWNED BY notifications.id")
+    op.execute("""
+        INSERT INTO notifications (id, user_id, message, read, created_at)
+        SELECT id, user_id, message, read, created_at FROM notifications_partitioned
+    """)
+    op.execute("DROP TABLE notifications_partitioned CASCADE")
+
+    op.create_index("ix_notifications_id", "notifications", ["id"])
+    op.create_index("ix_notifications_created_at", "notifications", ["created_at"])
+    op.create_index("ix_notifications_user_id_read_created_at", "notifications",
+                    ["user_id", "read", "created_at"])
+    op.create_index("ix_notifications_unread_user_id", "notifications", ["user_id"],
+                    postgresql_where=sa.text("read IS false"))
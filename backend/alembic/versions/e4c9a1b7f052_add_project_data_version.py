@@ -0,0 +1,36 @@
+"""add projects.data_version for the board change feed
+
+Revision ID: e4c9a1b7f052
+Revises: d7a2b9e4f310
+Create Date: 2025-07-26 11:40:18.552903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c9a1b7f052'
+down_revision: Union[str, None] = 'd7a2b9e4f310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # common/database.py runs create_all at import, so the column may exist
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("projects")}
+    if "data_version" in columns:
+        return
+    # constant server default → metadata-only change on Postgres 11+, no rewrite
+    op.add_column(
+        "projects",
+        sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("projects", "data_version")
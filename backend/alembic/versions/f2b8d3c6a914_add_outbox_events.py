@@ -0,0 +1,41 @@
+"""add outbox_events for transactional realtime delivery
+
+Revision ID: f2b8d3c6a914
+Revises: e4c9a1b7f052
+Create Date: 2025-07-27 09:18:02.447615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d3c6a914'
+down_revision: Union[str, None] = 'e4c9a1b7f052'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("key", sa.String(32), nullable=False, unique=True),
+        sa.Column("target_kind", sa.String(16), nullable=False),
+        sa.Column("target", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_outbox_events_available_at", "outbox_events",
+                    ["available_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("outbox_events", if_exists=True)
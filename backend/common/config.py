@@ -21,6 +21,70 @@ class Settings(BaseSettings):
 
     FRONTEND_ORIGIN: str
 
+    # ─────────── DB pool (see common/db_pool.py) ─
+    DB_POOL_PROFILE: str = "default"          # per-service profile name
+    DB_POOL_SIZE: Optional[int] = None        # overrides the profile
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None
+    DB_PGBOUNCER: bool = False                # NullPool behind PgBouncer
+
+    # ─────────── read replica (see common/db_routing.py) ─
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_MAX_LAG: float = 5.0           # seconds before reads fall back
+    DB_READ_YOUR_WRITES_WINDOW: float = 10.0  # max seconds a write stamp keeps reads on primary
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 2.0
+
+    # ─────────── notification retention (see notification_service/retention.py) ─
+    NOTIFICATION_READ_TTL_DAYS: int = 30        # read rows older than this leave the inbox
+    NOTIFICATION_UNREAD_TTL_DAYS: int = 180     # … and unread ones after this
+    NOTIFICATION_ARCHIVE: bool = True           # move to notifications_archive (else delete)
+    NOTIFICATION_ARCHIVE_TTL_DAYS: int = 365    # archive rows are purged after this
+    NOTIFICATION_RETENTION_BATCH: int = 1000    # rows per short transaction
+    NOTIFICATION_RETENTION_MAX_BATCHES: int = 500  # batches per run – bounds one job's runtime
+
+    # ─────────── user typeahead (see user_service/search.py) ─
+    USER_SEARCH_CACHE_TTL: float = 30.0         # seconds an identical query is reused
+    USER_SEARCH_CACHE_MAX_ENTRIES: int = 1024
+
+    # ─────────── transactional outbox (see common/outbox.py) ─
+    OUTBOX_RELAY_INLINE: bool = True           # drain right after commit in the writing process
+    OUTBOX_BATCH_SIZE: int = 200               # events per gateway request
+    OUTBOX_MAX_ATTEMPTS: int = 20              # then the event is dropped (it's only a live push)
+    OUTBOX_LEASE_SECONDS: int = 30             # a batch being sent stays claimed (> gateway timeout)
+
+    # ─────────── OpenAI upstream (see ai_service/upstream.py) ─
+    OPENAI_BASE_URL: Optional[str] = None      # e.g. a local stub server
+    AI_MAX_CONCURRENCY: int = 8                # completions in flight per process
+    AI_QUEUE_TIMEOUT: float = 10.0             # seconds to wait for a slot → 503
+    AI_CALL_DEADLINE: float = 30.0             # all attempts of one call → 504
+    AI_MAX_RETRIES: int = 2                    # on 429 / 5xx / timeouts
+
+    # ─────────── prompt budget (see ai_service/prompt_budget.py) ─
+    AI_RISK_PROMPT_TOKENS: int = 700           # whole risk-narrative prompt, estimated
+
+    # ─────────── AI response cache (see ai_service/cache.py) ─
+    AI_CACHE_TTL: float = 86_400.0             # seconds a completion is reused
+    AI_CACHE_MAX_ENTRIES: int = 512            # in-process LRU
+    AI_CACHE_PATH: str = "/tmp/powerboard-ai-cache.sqlite3"   # "" → memory only
+    AI_CACHE_MAX_DISK_ENTRIES: int = 10_000
+
+    # ─────────── risk report cache (see ai_service/risk_cache.py) ─
+    AI_RISK_CACHE_TTL: float = 900.0           # same data_version → reuse this long
+    AI_RISK_CACHE_MAX_STALE: float = 86_400.0  # older/outdated → serve while refreshing
+    AI_RISK_CACHE_MAX_ENTRIES: int = 1024
+
+    # ─────────── risk report precompute (see ai_service/risk_batch.py) ─
+    AI_RISK_BATCH_INTERVAL: float = 600.0      # scheduler job period, seconds
+    AI_RISK_BATCH_SIZE: int = 20               # projects selected per round
+    AI_RISK_BATCH_MAX_PROJECTS: int = 200      # per run – bounds a single job's runtime
+    AI_RISK_BATCH_WORKERS: int = 4             # reports built concurrently
+    AI_RISK_BATCH_RATE_PER_MINUTE: float = 30.0  # narrative completions per minute
+    AI_RISK_BATCH_ACTIVE_DAYS: int = 14        # only projects with task activity this recent
+    AI_RISK_BATCH_REFRESH_AFTER: float = 900.0 # rebuild unchanged reports older than this
+
+    # ─────────── dev diagnostics ─
+    QUERY_STATS_HEADERS: bool = False         # X-DB-* headers on every response
+
     # ─────────── admin-role config ─
     AUTH0_ROLES_CLAIM_NAMESPACE: str = "https://powerboard.local/"
     PLATFORM_ADMIN_ROLE: str = "platform_admin"
@@ -2,15 +2,22 @@
 # ──────────────────────────────────────────────────────────────────────────────
 # Central SQLAlchemy engine + session factory.
 # Designed for Supabase Nano:
-#   • Default pool size = 2 sockets per process (override with DB_POOL_SIZE)
-#   • No overflow, so we never exceed the hard 200-connection limit.
+#   • Pool size comes from a per-service profile (DB_POOL_PROFILE, see
+#     common/db_pool.py) – override with DB_POOL_SIZE / DB_MAX_OVERFLOW.
+#   • Profiles are budgeted so we never exceed the hard 200-connection limit.
+#   • DB_PGBOUNCER=true switches to NullPool and lets PgBouncer do the pooling.
 #   • Pre-ping and recycle keep long-lived services healthy.
 # ──────────────────────────────────────────────────────────────────────────────
 
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from common.config import settings
+from common.db_pool import engine_kwargs, instrument_engine, resolve_pool_profile
+from common.db_routing import (
+    LAST_WRITE_HEADER, ReplicaRouter, RoutingSession, parse_last_write, track_writes,
+)
 
 # -----------------------------------------------------------------------------
 # Connection string (set this in Railway / .env)
@@ -20,25 +27,49 @@ DATABASE_URL: str = settings.DATABASE_URL
 # -----------------------------------------------------------------------------
 # Pool configuration
 # -----------------------------------------------------------------------------
-POOL_SIZE       = int(getattr(settings, "DB_POOL_SIZE", 2))   # sockets / process
-MAX_OVERFLOW    = 0        # never go beyond POOL_SIZE
-POOL_TIMEOUT    = 30       # seconds to wait before raising
-POOL_RECYCLE    = 1_800    # drop idle sockets after 30 min
-POOL_PRE_PING   = True     # heal TCP half-opens automatically
+POOL_PROFILE = resolve_pool_profile(
+    settings.DB_POOL_PROFILE,
+    pool_size    = settings.DB_POOL_SIZE,
+    max_overflow = settings.DB_MAX_OVERFLOW,
+    pool_timeout = settings.DB_POOL_TIMEOUT,
+)
+
+
+def make_engine(url: str, label: str):
+    """Create an engine for `url` whose pool metrics report as `pool=<label>`."""
+    return instrument_engine(
+        create_engine(url, **engine_kwargs(url, POOL_PROFILE, settings.DB_PGBOUNCER)),
+        label,
+    )
+
+
+engine = make_engine(DATABASE_URL, "primary")
+
+# -----------------------------------------------------------------------------
+# Optional read replica – without DATABASE_REPLICA_URL reads use the primary
+# -----------------------------------------------------------------------------
+REPLICA_URL = settings.DATABASE_REPLICA_URL
+replica_engine = make_engine(REPLICA_URL, "replica") if REPLICA_URL else None
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_size     = POOL_SIZE,
-    max_overflow  = MAX_OVERFLOW,
-    pool_timeout  = POOL_TIMEOUT,
-    pool_recycle  = POOL_RECYCLE,
-    pool_pre_ping = POOL_PRE_PING,
+replica_router = ReplicaRouter(
+    engine,
+    replica_engine,
+    max_lag        = settings.DB_REPLICA_MAX_LAG,
+    ryw_window     = settings.DB_READ_YOUR_WRITES_WINDOW,
+    check_interval = settings.DB_REPLICA_LAG_CHECK_INTERVAL,
 )
 
 # -----------------------------------------------------------------------------
-# Session factory and base model
+# Session factories and base model
 # -----------------------------------------------------------------------------
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    info={"router": replica_router},
+)
+track_writes(SessionLocal)
 Base = declarative_base()
 
 # -----------------------------------------------------------------------------
@@ -51,6 +82,23 @@ def get_db():
     finally:
         db.close()
 
+
+def get_read_db(request: Request):
+    """
+    Read-only session for GET routes: replica when healthy and caught up,
+    primary when the caller's X-Last-Write may not be replicated yet or
+    when no replica is configured.
+    """
+    if replica_engine is None:
+        yield from get_db()
+        return
+    last_write = parse_last_write(request.headers.get(LAST_WRITE_HEADER))
+    db = ReadSessionLocal(info={"last_write": last_write})
+    try:
+        yield db
+    finally:
+        db.close()
+
 # -----------------------------------------------------------------------------
 # (Development only) import all models so `metadata.create_all()` sees them.
 # Remove the import block if you run your migrations with Alembic.
@@ -62,5 +110,7 @@ import common.models.task
 import common.models.task_comment
 import common.models.big_task
 import common.models.notification
+import common.models.outbox
+import common.models.risk_report
 
 Base.metadata.create_all(bind=engine)
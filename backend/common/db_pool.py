@@ -0,0 +1,207 @@
+# common/db_pool.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Connection-pool sizing + telemetry.
+#   • Per-service pool profiles (DB_POOL_PROFILE), overridable per setting
+#   • Optional PgBouncer mode: NullPool, no pre-ping, no server-side
+#     prepared statements – PgBouncer (transaction mode) owns the pooling
+#   • Pool events feed common.metrics: checked-out connections, checkout
+#     wait-time histogram, pool-timeout counter
+# ──────────────────────────────────────────────────────────────────────────────
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+from common import metrics
+
+# -----------------------------------------------------------------------------
+# Pool profiles – sockets per *process*.
+# Budget (one process per service): 2+6+3+2+2+2+1 = 18 steady, 22 with overflow,
+# which leaves plenty of room under the 200-connection limit for replicas.
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class PoolProfile:
+    pool_size:    int
+    max_overflow: int
+    pool_timeout: float
+
+
+POOL_PROFILES: Dict[str, PoolProfile] = {
+    "default":      PoolProfile(pool_size=2, max_overflow=0, pool_timeout=30),
+    "user":         PoolProfile(pool_size=2, max_overflow=0, pool_timeout=10),
+    "project":      PoolProfile(pool_size=6, max_overflow=2, pool_timeout=10),
+    "analytics":    PoolProfile(pool_size=3, max_overflow=1, pool_timeout=15),
+    "notification": PoolProfile(pool_size=2, max_overflow=1, pool_timeout=10),
+    "scheduler":    PoolProfile(pool_size=2, max_overflow=0, pool_timeout=30),
+    "ai":           PoolProfile(pool_size=2, max_overflow=0, pool_timeout=10),
+    "gateway":      PoolProfile(pool_size=1, max_overflow=0, pool_timeout=5),
+}
+
+POOL_RECYCLE  = 1_800    # drop idle sockets after 30 min
+POOL_PRE_PING = True     # heal TCP half-opens automatically
+
+
+def resolve_pool_profile(
+    profile: str = "default",
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_timeout: Optional[float] = None,
+) -> PoolProfile:
+    """
+    Look up `profile` (unknown names fall back to "default") and apply any
+    explicit DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT overrides.
+    """
+    base = POOL_PROFILES.get(profile, POOL_PROFILES["default"])
+    return PoolProfile(
+        pool_size    = base.pool_size    if pool_size    is None else pool_size,
+        max_overflow = base.max_overflow if max_overflow is None else max_overflow,
+        pool_timeout = base.pool_timeout if pool_timeout is None else pool_timeout,
+    )
+
+
+def pgbouncer_connect_args(url: str) -> dict:
+    """
+    Disable server-side prepared statements for drivers that use them –
+    they break when PgBouncer hands the next transaction to another backend.
+    psycopg2 never prepares server-side, so it needs nothing.
+    """
+    driver = make_url(url).get_driver_name()
+    if driver == "asyncpg":
+        return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    return {}
+
+
+def engine_kwargs(url: str, profile: PoolProfile, pgbouncer: bool = False) -> dict:
+    """Keyword arguments for `create_engine` for the given pool profile."""
+    if pgbouncer:
+        return {
+            "poolclass":    NullPool,
+            "connect_args": pgbouncer_connect_args(url),
+        }
+    return {
+        "poolclass":     InstrumentedQueuePool,
+        "pool_size":     profile.pool_size,
+        "max_overflow":  profile.max_overflow,
+        "pool_timeout":  profile.pool_timeout,
+        "pool_recycle":  POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Telemetry
+# -----------------------------------------------------------------------------
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+POOL_WAIT = metrics.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"], buckets=WAIT_BUCKETS,
+)
+POOL_TIMEOUTS = metrics.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ["pool"],
+)
+POOL_CONNECTS = metrics.counter(
+    "db_pool_connections_created_total",
+    "New DBAPI connections opened",
+    ["pool"],
+)
+POOL_CHECKOUTS = metrics.counter(
+    "db_pool_checkouts_total",
+    "Connections handed out by the pool",
+    ["pool"],
+)
+
+# label → live engine, sampled by the gauges below
+_ENGINES: Dict[str, Engine] = {}
+_checked_out: Dict[str, int] = {}
+_checked_out_lock = threading.Lock()
+
+
+def _sample_checked_out():
+    with _checked_out_lock:
+        return [((label,), n) for label, n in _checked_out.items()]
+
+
+def _sample_pool_size():
+    return [
+        ((label,), eng.pool.size())
+        for label, eng in _ENGINES.items()
+        if isinstance(eng.pool, QueuePool)
+    ]
+
+
+metrics.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"], fn=_sample_checked_out,
+)
+metrics.gauge(
+    "db_pool_size",
+    "Configured steady-state pool size",
+    ["pool"], fn=_sample_pool_size,
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a socket."""
+
+    _depth = threading.local()
+    metrics_label = "primary"
+
+    def _do_get(self):
+        # QueuePool._do_get recurses on retry – only time the outermost call
+        depth = getattr(self._depth, "n", 0)
+        self._depth.n = depth + 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if depth == 0:
+                POOL_TIMEOUTS.inc(pool=self.metrics_label)
+            raise
+        finally:
+            self._depth.n = depth
+            if depth == 0:
+                POOL_WAIT.observe(time.perf_counter() - start, pool=self.metrics_label)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool – keep reporting under our label
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+def instrument_engine(engine: Engine, label: str) -> Engine:
+    """Attach pool event listeners that feed the `pool=<label>` series."""
+    _ENGINES[label] = engine
+    with _checked_out_lock:
+        _checked_out.setdefault(label, 0)
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics_label = label
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        POOL_CONNECTS.inc(pool=label)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        POOL_CHECKOUTS.inc(pool=label)
+        with _checked_out_lock:
+            _checked_out[label] += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        with _checked_out_lock:
+            _checked_out[label] = max(0, _checked_out[label] - 1)
+
+    return engine
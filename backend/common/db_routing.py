@@ -0,0 +1,211 @@
+# common/db_routing.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Read-replica routing.
+#   • RoutingSession sends read-only work to the replica engine
+#   • Falls back to the primary when the replica lags > DB_REPLICA_MAX_LAG,
+#     when the lag probe fails, or for read-your-writes (below)
+#   • Flushes / INSERT / UPDATE / DELETE always go to the primary
+#   • read-your-writes travels with the client, not with a process: a
+#     response whose request committed a write carries X-Last-Write (unix
+#     time of the commit), the frontend echoes the newest one it has seen
+#     on every request, and a read whose stamp the replica may not have
+#     replayed yet (younger than lag + probe interval, capped at
+#     DB_READ_YOUR_WRITES_WINDOW) goes to the primary – whichever service
+#     wrote and whichever worker serves the read
+# ──────────────────────────────────────────────────────────────────────────────
+import contextvars
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from common import metrics
+
+# Zero when the replica has replayed everything it received; otherwise the
+# age of the last replayed transaction.
+PG_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+LAST_WRITE_HEADER = "X-Last-Write"
+
+READS_ROUTED = metrics.counter(
+    "db_read_sessions_total",
+    "Read-only sessions by the engine they were routed to",
+    ["target", "reason"],
+)
+
+
+def probe_lag(engine: Engine) -> float:
+    """Replication lag in seconds (always 0 for non-Postgres replicas)."""
+    if engine.dialect.name != "postgresql":
+        return 0.0
+    with engine.connect() as conn:
+        return float(conn.execute(PG_LAG_SQL).scalar() or 0.0)
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Optional[Engine],
+        max_lag: float = 5.0,
+        ryw_window: float = 10.0,
+        check_interval: float = 2.0,
+        lag_probe: Callable[[Engine], float] = probe_lag,
+    ):
+        self.primary        = primary
+        self.replica        = replica
+        self.max_lag        = max_lag
+        self.ryw_window     = ryw_window
+        self.check_interval = check_interval
+        self._lag_probe     = lag_probe
+
+        self._lag: Optional[float] = None      # None ⇒ unknown / unhealthy
+        self._lag_checked_at = float("-inf")
+        self._lag_lock = threading.Lock()
+
+        metrics.gauge(
+            "db_replica_lag_seconds",
+            "Last measured replication lag (-1 when the replica is unhealthy)",
+            fn=lambda: -1 if self._lag is None else self._lag,
+        )
+
+    # ── replication lag ──────────────────────────────────────────
+    def lag(self) -> Optional[float]:
+        now = time.monotonic()
+        if now - self._lag_checked_at < self.check_interval:
+            return self._lag
+        with self._lag_lock:
+            if now - self._lag_checked_at >= self.check_interval:
+                try:
+                    self._lag = self._lag_probe(self.replica)
+                except Exception as e:
+                    print(f"[db] replica lag probe failed: {e}")
+                    self._lag = None
+                self._lag_checked_at = now
+        return self._lag
+
+    # ── read-your-writes ─────────────────────────────────────────
+    def recently_wrote(self, last_write: Optional[float], lag: float,
+                       now: Optional[float] = None) -> bool:
+        """
+        Could the replica still be missing a write committed at `last_write`
+        (unix time)? It has replayed everything older than `lag`, measured
+        at most `check_interval` ago.
+        """
+        if last_write is None:
+            return False
+        age = (time.time() if now is None else now) - last_write
+        return age <= min(self.ryw_window, lag + self.check_interval)
+
+    # ── decision ────────────────────────────────────────────────
+    def pick(self, last_write: Optional[float] = None) -> Engine:
+        if self.replica is None:
+            return self.primary
+        lag = self.lag()
+        if lag is None or lag > self.max_lag:
+            READS_ROUTED.inc(target="primary", reason="replica_lag")
+            return self.primary
+        if self.recently_wrote(last_write, lag):
+            READS_ROUTED.inc(target="primary", reason="read_your_writes")
+            return self.primary
+        READS_ROUTED.inc(target="replica", reason="ok")
+        return self.replica
+
+
+def parse_last_write(value: Optional[str]) -> Optional[float]:
+    """The X-Last-Write request header, or None when absent / garbled."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class RoutingSession(Session):
+    """
+    Session for read-only dependencies. The engine is chosen on first use
+    and pinned for the rest of the session so every read sees one
+    consistent snapshot. The factory passes the ReplicaRouter in
+    `info["router"]`; `get_read_db` passes the request's X-Last-Write
+    stamp in `info["last_write"]`.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        router: ReplicaRouter = self.info["router"]
+        if self._flushing or isinstance(clause, UpdateBase):
+            return router.primary
+        bind = self.info.get("bind")
+        if bind is None:
+            bind = self.info["bind"] = router.pick(self.info.get("last_write"))
+        return bind
+
+
+# -----------------------------------------------------------------------------
+# Write stamps – X-Last-Write on responses of requests that committed a write
+# -----------------------------------------------------------------------------
+_request_write: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "request_write", default=None
+)
+
+
+def track_writes(session_factory) -> None:
+    """
+    Stamp the current request (see WriteStampMiddleware) whenever a session
+    of `session_factory` commits rows.
+    """
+    @event.listens_for(session_factory, "after_flush")
+    def _mark_dirty(session, flush_context):
+        session.info["wrote"] = True
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _mark_bulk_dml(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            orm_execute_state.session.info["wrote"] = True
+
+    @event.listens_for(session_factory, "after_commit")
+    def _note_write(session):
+        if session.info.pop("wrote", False):
+            stamp = _request_write.get()
+            if stamp is not None:
+                stamp["at"] = time.time()
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _clear(session):
+        session.info.pop("wrote", None)
+
+
+class WriteStampMiddleware:
+    """Adds X-Last-Write to responses whose request committed a write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stamp: dict = {}                      # filled in by track_writes
+        token = _request_write.set(stamp)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and "at" in stamp:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (LAST_WRITE_HEADER.lower().encode(), f"{stamp['at']:.3f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_write.reset(token)
@@ -0,0 +1,111 @@
+# common/fulltext.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Full-text indexes that live next to their table.
+#   • Postgres: a generated, weighted `search_vector tsvector` column and a
+#     GIN index on it – kept current by the database itself
+#   • SQLite (dev / tests): an external-content FTS5 table `<table>_fts`
+#     synced by triggers
+# `index(Task.__table__, title="A", description="B")` hooks the DDL into
+# metadata.create_all(); production schemas get the same SQL from the
+# Alembic migration (c8d2f5a1e934). Queries: services/project_service/search.py
+# ──────────────────────────────────────────────────────────────────────────────
+import re
+from typing import Dict, List, Tuple
+
+from sqlalchemy import DDL, Table, column, event, func, literal_column, table as table_clause
+
+LANGUAGE     = "english"          # text search configuration (stemming, stop words)
+VECTOR_COL   = "search_vector"
+_TERM        = re.compile(r"\w+", re.UNICODE)
+BM25_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 2.0, "D": 1.0}
+
+_indexed: Dict[str, dict] = {}    # table name → {column: weight}
+
+
+def fts_table(table: str) -> str:
+    return f"{table}_fts"
+
+
+# -----------------------------------------------------------------------------
+# DDL
+# -----------------------------------------------------------------------------
+def postgres_ddl(table: str, weights: dict) -> List[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('{LANGUAGE}', coalesce({col}, '')), '{w}')"
+        for col, w in weights.items()
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {VECTOR_COL} tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{VECTOR_COL} ON {table} USING gin ({VECTOR_COL})",
+    ]
+
+
+def sqlite_ddl(table: str, columns: List[str]) -> List[str]:
+    fts   = fts_table(table)
+    cols  = ", ".join(columns)
+    new   = ", ".join(f"new.{c}" for c in columns)
+    old   = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def index(table: Table, **weights: str) -> None:
+    """Column → weight ("A" highest … "D"); order is kept for SQLite's bm25 weights."""
+    _indexed[table.name] = dict(weights)
+    for sql in postgres_ddl(table.name, weights):
+        event.listen(table, "after_create", DDL(sql).execute_if(dialect="postgresql"))
+    for sql in sqlite_ddl(table.name, list(weights)):
+        event.listen(table, "after_create", DDL(sql).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(
+        f"DROP TABLE IF EXISTS {fts_table(table.name)}"
+    ).execute_if(dialect="sqlite"))
+
+
+# -----------------------------------------------------------------------------
+# Query text
+# -----------------------------------------------------------------------------
+def terms(text: str, limit: int = 8) -> List[str]:
+    """Words of a user query – operators and quotes never reach the parser."""
+    return _TERM.findall(text.lower())[:limit]
+
+
+def postgres_query(words: List[str]) -> str:
+    """to_tsquery input: every word, the last one as a prefix (search-as-you-type)."""
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"])
+
+
+def sqlite_query(words: List[str]) -> str:
+    """FTS5 MATCH input with the same semantics."""
+    return " AND ".join([f'"{w}"' for w in words[:-1]] + [f'"{words[-1]}"*'])
+
+
+# -----------------------------------------------------------------------------
+# Query clauses
+# -----------------------------------------------------------------------------
+def match(table: Table, dialect: str, words: List[str]) -> Tuple[object, object, object]:
+    """
+    (FROM clause, WHERE condition, score) for rows of `table` matching all
+    `words`; higher score = better match on both backends.
+    """
+    if dialect == "postgresql":
+        vector = literal_column(f"{table.name}.{VECTOR_COL}")
+        query  = func.to_tsquery(LANGUAGE, postgres_query(words))
+        return table, vector.op("@@")(query), func.ts_rank_cd(vector, query)
+
+    fts     = table_clause(fts_table(table.name), column("rowid"))
+    weights = [BM25_WEIGHTS[w] for w in _indexed[table.name].values()]
+    return (
+        table.join(fts, fts.c.rowid == table.c.id),
+        literal_column(fts.name).op("MATCH")(sqlite_query(words)),
+        -func.bm25(literal_column(fts.name), *weights),      # bm25: lower is better
+    )
@@ -0,0 +1,122 @@
+# common/http_metrics.py
+# ──────────────────────────────────────────────────────────────────────────────
+# HTTP request metrics shared by every service.
+#   • MetricsMiddleware – latency / DB-time histograms by method, route
+#     template and status, plus an in-flight gauge
+#   • a threadpool probe measuring how long a sync endpoint waits for a
+#     worker thread (anyio's default limiter, 40 threads)
+#   • instrument_app(app) wires both; serve them with `metrics_router`
+# Route templates (/api/projects/{project_id}) keep label cardinality bounded.
+# Stays free of common.config / SQLAlchemy so the gateway can use it too.
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import time
+
+import anyio
+import anyio.to_thread
+
+from common import metrics
+
+REQUEST_LATENCY = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+)
+REQUEST_DB_TIME = metrics.histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL while serving a request",
+    ["method", "route", "status"],
+)
+IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+)
+THREADPOOL_QUEUE = metrics.histogram(
+    "threadpool_queue_seconds",
+    "Time a probe waited for a worker thread",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+THREADPOOL_BUSY = metrics.gauge(
+    "threadpool_threads_busy",
+    "Worker threads in use at the last probe",
+)
+THREADPOOL_WAITING = metrics.gauge(
+    "threadpool_tasks_waiting",
+    "Calls queued for a worker thread at the last probe",
+)
+
+PROBE_INTERVAL = 1.0          # seconds between threadpool probes
+
+
+# -----------------------------------------------------------------------------
+# ASGI middleware
+# -----------------------------------------------------------------------------
+class MetricsMiddleware:
+    """
+    Add it *after* QueryStatsMiddleware so it wraps it and can read the
+    request's SQL time from scope["query_stats"].
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            labels = {
+                "method": scope["method"],
+                "route":  getattr(scope.get("route"), "path", "<unmatched>"),
+                "status": str(status["code"]),
+            }
+            REQUEST_LATENCY.observe(elapsed, **labels)
+            stats = scope.get("query_stats")
+            if stats is not None:
+                REQUEST_DB_TIME.observe(stats.seconds, **labels)
+
+
+# -----------------------------------------------------------------------------
+# Threadpool probe
+# -----------------------------------------------------------------------------
+async def _probe_threadpool(interval: float = PROBE_INTERVAL):
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    while True:
+        stats = limiter.statistics()
+        THREADPOOL_BUSY.set(stats.borrowed_tokens)
+        THREADPOOL_WAITING.set(stats.tasks_waiting)
+
+        queued = time.perf_counter()
+        await anyio.to_thread.run_sync(lambda: None)
+        THREADPOOL_QUEUE.observe(time.perf_counter() - queued)
+
+        await asyncio.sleep(interval)
+
+
+def instrument_app(app) -> None:
+    """Request metrics + threadpool probe (started with the app)."""
+    app.add_middleware(MetricsMiddleware)
+    tasks = []
+
+    async def _start_probe():
+        tasks.append(asyncio.create_task(_probe_threadpool()))
+
+    async def _stop_probe():
+        for task in tasks:
+            task.cancel()
+
+    app.add_event_handler("startup", _start_probe)
+    app.add_event_handler("shutdown", _stop_probe)
@@ -27,7 +27,7 @@ class BigTask(Base):
     )
 
     due_date    = Column(DateTime(timezone=True), nullable=True)
-    project_id  = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"))
+    project_id  = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), index=True)
     created_at  = Column(DateTime(timezone=True), server_default=func.now())
 
     # relationships
@@ -1,11 +1,14 @@
 # common/models/big_task_member.py
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from common.database import Base
 from common.enums import ProjectRole          # reuse the same enum
 
 class BigTaskMember(Base):
     __tablename__ = "big_task_members"
+    __table_args__ = (
+        Index("ix_big_task_members_user_id_big_task_id", "user_id", "big_task_id"),
+    )
 
     big_task_id = Column(
         Integer,
@@ -1,15 +1,44 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from common.database import Base
 from common.models.user import User
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # inbox: WHERE user_id = ? [AND read = false] ORDER BY created_at DESC
+        Index("ix_notifications_user_id_read_created_at", "user_id", "read", "created_at"),
+    )
 
     id         = Column(Integer, primary_key=True, index=True)
     user_id    = Column(Integer, ForeignKey("users.id"), nullable=False)
     message    = Column(String, nullable=False)
     read       = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     user = relationship(User)
+
+
+# unread badge: COUNT(*) WHERE user_id = ? AND read = false only touches the
+# (usually tiny) set of unread rows
+Index(
+    "ix_notifications_unread_user_id",
+    Notification.user_id,
+    postgresql_where=Notification.read.is_(False),
+    sqlite_where=Notification.read.is_(False),
+)
+
+
+class NotificationArchive(Base):
+    """
+    Cold storage for notifications moved out by the retention job
+    (services/notification_service/retention.py). Not read by the inbox.
+    """
+    __tablename__ = "notifications_archive"
+
+    id          = Column(Integer, primary_key=True)          # original id
+    user_id     = Column(Integer, nullable=False, index=True)
+    message     = Column(String, nullable=False)
+    read        = Column(Boolean, nullable=False)
+    created_at  = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
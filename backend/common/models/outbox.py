@@ -0,0 +1,25 @@
+# common/models/outbox.py
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+
+from common.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    A realtime message waiting to be delivered to the gateway. Written in
+    the same transaction as the change it announces; drained by the relay
+    in common/outbox.py and deleted once the gateway accepted it.
+    """
+    __tablename__ = "outbox_events"
+
+    id           = Column(Integer, primary_key=True)
+    key          = Column(String(32), nullable=False, unique=True)   # idempotency key
+    target_kind  = Column(String(16), nullable=False)                # "user" | "channel"
+    target       = Column(String, nullable=False)                    # auth0 sub / channel name
+    payload      = Column(JSON, nullable=False)
+    attempts     = Column(Integer, nullable=False, default=0, server_default="0")
+    # relay picks rows with available_at <= now; pushed back on failure
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    created_at   = Column(DateTime, nullable=False, default=datetime.utcnow)   # naive UTC
@@ -12,8 +12,11 @@ class Project(Base):
     description = Column(String,  nullable=True)
     status      = Column(Enum(ProjectStatus), default=ProjectStatus.IN_PROGRESS, nullable=False)  # ← NEW
     due_date    = Column(DateTime(timezone=True), nullable=True)
-    owner_id    = Column(Integer, ForeignKey("users.id"))
+    owner_id    = Column(Integer, ForeignKey("users.id"), index=True)
     created_at  = Column(DateTime(timezone=True), server_default=func.now())
+    # bumped with every board write (tasks / big tasks) – see
+    # services/project_service/board_events.py
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     owner      = relationship("User", back_populates="owned_projects")
     tasks      = relationship(
@@ -1,5 +1,5 @@
 # common/models/project_member.py
-from sqlalchemy import Column, Integer, ForeignKey, String
+from sqlalchemy import Column, Integer, ForeignKey, String, Index
 from sqlalchemy.orm import relationship
 from common.database import Base
 from common.enums import ProjectRole
@@ -7,6 +7,11 @@ from common.enums import ProjectRole
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    # The PK already serves (project_id, user_id) lookups; this one serves
+    # the "which projects can this user see" side of every access check.
+    __table_args__ = (
+        Index("ix_project_members_user_id_project_id", "user_id", "project_id"),
+    )
 
     # 👉 on‑delete CASCADE means the DB itself will erase these rows when
     #    the referenced project or user is removed.
@@ -0,0 +1,20 @@
+# common/models/risk_report.py
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+
+from common.database import Base
+
+
+class ProjectRiskReport(Base):
+    """
+    Last risk report built for a project (per analysis mode), written by the
+    scheduler's batch precompute and by on-demand analyses – see
+    services/ai_service/risk_batch.py. analyze_risks answers from here
+    before computing anything.
+    """
+    __tablename__ = "project_risk_reports"
+
+    project_id   = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    mode         = Column(String(16), primary_key=True)              # "auto" | "local"
+    data_version = Column(Integer, nullable=False)                   # Project.data_version it reflects
+    report       = Column(JSON, nullable=False)                      # RiskAnalysisResponse as JSON
+    generated_at = Column(DateTime, nullable=False, index=True)      # naive UTC
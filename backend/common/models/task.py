@@ -1,12 +1,17 @@
 # common/models/task.py
 
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime, Index, func
+from sqlalchemy.orm import relationship, selectinload
+from common import fulltext
 from common.database import Base
 from common.enums import IssueType, Priority
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # board / summary queries: WHERE project_id = ? [AND status = ?]
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -14,10 +19,10 @@ class Task(Base):
     status = Column(String, default="To Do")
     issue_type = Column(Enum(IssueType), default=IssueType.TASK, nullable=False)
     priority = Column(Enum(Priority), default=Priority.MEDIUM, nullable=False)
-    reporter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    reporter_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    due_date = Column(DateTime, nullable=True)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    due_date = Column(DateTime, nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -27,9 +32,41 @@ class Task(Base):
     comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan")
     big_task_id = Column(Integer,
                          ForeignKey("big_tasks.id", ondelete="RESTRICT"),
-                         nullable=True)
+                         nullable=True,
+                         index=True)
     big_task = relationship("BigTask", back_populates="tasks")
 
     @property
     def creator_name(self) -> str:
         return self.reporter.username if self.reporter else ""
+
+    @property
+    def assignee_name(self) -> str:
+        return self.assignee.username if self.assignee else ""
+
+
+# full-text search over title (ranked higher) and description –
+# see common/fulltext.py and services/project_service/search.py
+fulltext.index(Task.__table__, title="A", description="B")
+
+
+def task_read_options(via=None):
+    """
+    Loader options for everything the Task response schema reads
+    (reporter / assignee names, project → owner, members → user), so a list
+    of N tasks serialises with a fixed number of SELECTs instead of lazy
+    loads per row. Pass `via` to chain from a parent loader, e.g.
+    `task_read_options(joinedload(BigTask.tasks))`.
+    """
+    from common.models.project import Project
+    from common.models.project_member import ProjectMember
+
+    def load(attr):
+        return via.selectinload(attr) if via is not None else selectinload(attr)
+
+    return [
+        load(Task.reporter),
+        load(Task.assignee),
+        load(Task.project).joinedload(Project.owner),
+        load(Task.project).selectinload(Project.members).joinedload(ProjectMember.user),
+    ]
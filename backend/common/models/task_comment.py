@@ -1,12 +1,16 @@
 # common/models/task_comment.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
+from common import fulltext
 from common.database import Base
 
 
 class TaskComment(Base):
     __tablename__ = "task_comments"
+    __table_args__ = (
+        Index("ix_task_comments_task_id_created_at", "task_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -22,3 +26,7 @@ class TaskComment(Base):
     @property
     def username(self):
         return self.user.username if self.user else None
+
+
+# full-text search over comment text – see common/fulltext.py
+fulltext.index(TaskComment.__table__, content="A")
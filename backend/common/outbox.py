@@ -0,0 +1,253 @@
+# common/outbox.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Transactional outbox for realtime pushes.
+#   • enqueue_message / enqueue_channel add an outbox_events row to the
+#     caller's session – it commits (or rolls back) together with the change
+#     it announces, in the same round trip
+#   • the relay leases rows in id order (short committed transaction),
+#     POSTs them in batches to the gateway's /publish/batch and deletes them
+#     once accepted; failures back off exponentially. Delivery is
+#     at-least-once: every row carries an idempotency key and the gateway
+#     drops keys it has already seen
+#   • order holds per target: while a row is in flight or backs off, newer
+#     rows for the same user / channel wait behind it (an older unread count
+#     must never land after a newer one); other targets keep flowing
+#   • two relays:
+#       – inline: after a commit that wrote outbox rows, a daemon thread in
+#         the same process is woken to deliver right away (low latency)
+#       – sweep: the scheduler drains everything every few seconds, so a
+#         process that dies between commit and push loses nothing
+#     Leased rows are invisible to other relays; on Postgres the lease step
+#     itself is serialized with an advisory lock.
+# ──────────────────────────────────────────────────────────────────────────────
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+import httpx
+from sqlalchemy import delete, event, exists, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from common import metrics
+from common.config import settings
+from common.database import SessionLocal
+from common.models.outbox import OutboxEvent
+from common.realtime import GATEWAY_URL, INTERNAL_SECRET
+
+ENQUEUED = metrics.counter(
+    "outbox_enqueued_total", "Realtime events written to the outbox", ["kind"],
+)
+DELIVERED = metrics.counter(
+    "outbox_delivered_total", "Outbox events accepted by the gateway",
+)
+FAILED = metrics.counter(
+    "outbox_failed_total", "Outbox events whose delivery attempt failed",
+)
+DROPPED = metrics.counter(
+    "outbox_dropped_total", "Outbox events dropped after OUTBOX_MAX_ATTEMPTS",
+)
+DELIVERY_LAG = metrics.histogram(
+    "outbox_delivery_lag_seconds", "Commit → gateway acceptance",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+_DIRTY       = "outbox_dirty"
+MAX_BACKOFF  = 300.0            # seconds
+_RELAY_LOCK  = 0x6F7574626F78   # pg advisory lock key ("outbox")
+
+
+# -----------------------------------------------------------------------------
+# Producer side – always inside the caller's transaction
+# -----------------------------------------------------------------------------
+def _enqueue(db: Session, kind: str, target: str, payload: dict) -> OutboxEvent:
+    row = OutboxEvent(key=uuid.uuid4().hex, target_kind=kind, target=target, payload=payload)
+    db.add(row)
+    db.info[_DIRTY] = True
+    ENQUEUED.inc(kind=kind)
+    return row
+
+
+def enqueue_message(db: Session, user_id: str, payload: dict) -> OutboxEvent:
+    """Queue `payload` for every socket of gateway user `user_id` (Auth0 sub)."""
+    return _enqueue(db, "user", user_id, payload)
+
+
+def enqueue_channel(db: Session, channel: str, payload: dict) -> OutboxEvent:
+    """Queue `payload` for everyone subscribed to `channel`."""
+    return _enqueue(db, "channel", channel, payload)
+
+
+# -----------------------------------------------------------------------------
+# Relay
+# -----------------------------------------------------------------------------
+def send_batch(items: List[dict]) -> None:
+    """POST one batch to the gateway; raises on any failure."""
+    response = httpx.post(
+        f"{GATEWAY_URL}/publish/batch",
+        json={"items": items},
+        headers={"secret": INTERNAL_SECRET},
+        timeout=5.0,
+    )
+    response.raise_for_status()
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(MAX_BACKOFF, 2 ** attempts))
+
+
+def _claim(db: Session, batch_size: int, now: datetime) -> List[dict]:
+    """
+    Lease the next due, unblocked rows and commit, so the gateway request
+    runs outside any transaction or row lock. A leased row is pushed to
+    now + OUTBOX_LEASE_SECONDS: other relays neither pick it nor anything
+    newer for its target until it is delivered, backs off, or (relay died)
+    the lease runs out.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # claims are short – relays queue here instead of racing each other
+        # past rows that are leased but not committed yet
+        db.execute(select(func.pg_advisory_xact_lock(_RELAY_LOCK)))
+
+    # an older row of the same target that is backing off or in flight
+    # blocks this one (the probe only visits those rows – available_at is indexed)
+    older = aliased(OutboxEvent)
+    blocked = exists().where(
+        older.target_kind == OutboxEvent.target_kind,
+        older.target == OutboxEvent.target,
+        older.id < OutboxEvent.id,
+        older.available_at > now,
+    )
+    rows = db.execute(
+        select(OutboxEvent.id, OutboxEvent.key, OutboxEvent.target_kind,
+               OutboxEvent.target, OutboxEvent.payload, OutboxEvent.attempts,
+               OutboxEvent.created_at)
+        .where(OutboxEvent.available_at <= now, ~blocked)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+    ).mappings().all()
+    if rows:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_([r["id"] for r in rows]))
+            .values(available_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return rows
+
+
+def relay_batch(db: Session, batch_size: Optional[int] = None,
+                send: Callable[[List[dict]], None] = None,
+                now: Optional[datetime] = None) -> int:
+    """
+    Deliver up to `batch_size` due events in one gateway request.
+    Returns how many rows were handled (delivered or dropped).
+    """
+    send       = send or send_batch
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    now        = now or datetime.utcnow()
+
+    rows = _claim(db, batch_size, now)
+    if not rows:
+        return 0
+
+    items = [
+        {"key": r["key"], "kind": r["target_kind"], "target": r["target"], "msg": r["payload"]}
+        for r in rows
+    ]
+    try:
+        send(items)
+    except Exception as e:
+        FAILED.inc(len(rows))
+        print(f"[outbox] delivery of {len(rows)} event(s) failed: {e}")
+        retry = defaultdict(list)               # attempts → ids, one UPDATE per backoff step
+        dropped = []
+        for r in rows:
+            attempts = r["attempts"] + 1
+            if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                dropped.append(r["id"])
+            else:
+                retry[attempts].append(r["id"])
+        for attempts, ids in retry.items():
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(ids))
+                .values(attempts=attempts, available_at=now + _backoff(attempts))
+                .execution_options(synchronize_session=False)
+            )
+        _delete(db, dropped)
+        db.commit()
+        DROPPED.inc(len(dropped))
+        return len(dropped)
+
+    for r in rows:
+        DELIVERY_LAG.observe(max(0.0, (now - r["created_at"]).total_seconds()))
+    _delete(db, [r["id"] for r in rows])
+    db.commit()
+    DELIVERED.inc(len(rows))
+    return len(rows)
+
+
+def _delete(db: Session, ids: List[int]) -> None:
+    if ids:
+        db.execute(
+            delete(OutboxEvent)
+            .where(OutboxEvent.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+
+
+def relay(db: Session, max_batches: int = 50, **kwargs) -> int:
+    """Drain due events batch by batch. Returns the number handled."""
+    batch_size = kwargs.get("batch_size") or settings.OUTBOX_BATCH_SIZE
+    total = 0
+    for _ in range(max_batches):
+        n = relay_batch(db, **kwargs)
+        total += n
+        if n < batch_size:
+            break
+    return total
+
+
+# -----------------------------------------------------------------------------
+# Inline relay – one daemon thread per process, woken after outbox commits
+# -----------------------------------------------------------------------------
+class _InlineRelay:
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock   = threading.Lock()
+
+    def kick(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="outbox-relay", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                with SessionLocal() as db:
+                    relay(db)
+            except Exception as e:
+                # rows stay in the table – the scheduler sweep retries them
+                print(f"[outbox] inline relay failed: {e}")
+
+
+inline_relay = _InlineRelay()
+
+
+@event.listens_for(Session, "after_commit")
+def _kick_relay(session: Session):
+    if session.info.pop(_DIRTY, False) and settings.OUTBOX_RELAY_INLINE:
+        inline_relay.kick()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget(session: Session):
+    session.info.pop(_DIRTY, None)
@@ -0,0 +1,159 @@
+# common/query_stats.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Per-request SQL instrumentation.
+#   • Engine events count statements + DB time for the current request
+#   • Repeated identical statement shapes are flagged as likely N+1s
+#   • QueryStatsMiddleware exposes the numbers as X-DB-* response headers
+#     (dev, QUERY_STATS_HEADERS=true) and always as /metrics series
+#   • capture() collects statements from every thread – used by the
+#     `query_budget` pytest fixture
+# ──────────────────────────────────────────────────────────────────────────────
+import contextvars
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from common import metrics
+
+# a statement shape repeated this often in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+QUERIES_PER_REQUEST = metrics.histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request",
+    ["route"], buckets=QUERY_BUCKETS,
+)
+DB_TIME_PER_REQUEST = metrics.histogram(
+    "db_time_per_request_seconds",
+    "Time spent in SQL per request",
+    ["route"],
+)
+N_PLUS_ONE = metrics.counter(
+    "db_repeated_statements_total",
+    f"Requests that ran one statement shape >= {N_PLUS_ONE_THRESHOLD} times",
+    ["route"],
+)
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*\)")
+_SPACES  = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse whitespace and expanded IN-lists so equal queries compare equal."""
+    return _IN_LIST.sub("(…)", _SPACES.sub(" ", statement).strip())
+
+
+class QueryStats:
+    def __init__(self):
+        self.count   = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        with self._lock:
+            self.count   += 1
+            self.seconds += elapsed
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        return [(s, n) for s, n in self.shapes.most_common() if n >= threshold]
+
+    def max_repeat(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements, {self.seconds * 1000:.1f} ms"]
+        lines += [f"  {n:>3}× {shape[:160]}" for shape, n in self.shapes.most_common()]
+        return "\n".join(lines)
+
+
+_current: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+_captures: List[QueryStats] = []
+
+
+def current() -> Optional[QueryStats]:
+    """Stats of the request being served on this context (None outside requests)."""
+    return _current.get()
+
+
+@contextmanager
+def capture():
+    """Collect every statement run anywhere in the process while active."""
+    stats = QueryStats()
+    _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        _captures.remove(stats)
+
+
+# -----------------------------------------------------------------------------
+# Engine hooks (all engines, including the test engine)
+# -----------------------------------------------------------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for cap in list(_captures):
+        cap.record(statement, elapsed)
+
+
+# -----------------------------------------------------------------------------
+# ASGI middleware
+# -----------------------------------------------------------------------------
+class QueryStatsMiddleware:
+    def __init__(self, app, headers: bool = False):
+        self.app     = app
+        self.headers = headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        scope["query_stats"] = stats          # read by MetricsMiddleware
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.headers:
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                    (b"x-db-max-repeat", str(stats.max_repeat()).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            QUERIES_PER_REQUEST.observe(stats.count, route=route)
+            DB_TIME_PER_REQUEST.observe(stats.seconds, route=route)
+            repeated = stats.repeated()
+            if repeated:
+                N_PLUS_ONE.inc(route=route)
+                shape, n = repeated[0]
+                print(f"[db] possible N+1 on {scope['method']} {route}: {n}× {shape[:160]}")
@@ -1,30 +1,30 @@
 #common/realtime.py
+# Gateway address + channel naming. Messages themselves are delivered
+# through the transactional outbox (common/outbox.py).
 import os
-import threading
-import httpx
+from typing import Tuple
 
 # Where the gateway lives
 GATEWAY_URL = os.getenv("GATEWAY_URL", "http://localhost:9000")
 INTERNAL_SECRET = os.getenv("GATEWAY_INTERNAL_SECRET", "dev-secret")
 
-def push_message(user_id: str, payload: dict):
+# Channel names: "<kind>:<id>", e.g. "project:12", "big_task:7"
+CHANNEL_KINDS = ("project", "big_task")
+
+
+def project_channel(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+def big_task_channel(big_task_id: int) -> str:
+    return f"big_task:{big_task_id}"
+
+
+def parse_channel(channel: str) -> Tuple[str, int]:
     """
-    Persistently fire-and-forget an HTTP POST to the gateway.
-    Runs in a background thread to avoid blocking.
+    "project:12" → ("project", 12). Raises ValueError for anything else.
     """
-    def _send():
-        try:
-            response = httpx.post(
-                f"{GATEWAY_URL}/publish",
-                params={"uid": user_id},
-                json=payload,
-                headers={"secret": INTERNAL_SECRET},
-                timeout=5.0
-            )
-            response.raise_for_status()
-        except Exception as e:
-            # Log but do not bubble up
-            print(f"[realtime] Failed to push message to {user_id}: {e}")
-
-    thread = threading.Thread(target=_send, daemon=True)
-    thread.start()
+    kind, sep, raw_id = channel.partition(":")
+    if not sep or kind not in CHANNEL_KINDS or not raw_id.isdigit():
+        raise ValueError(f"Unknown channel {channel!r}")
+    return kind, int(raw_id)
@@ -0,0 +1,57 @@
+# common/schemas/admin_schema.py
+# Slim, flat rows for the admin console – no nested project / members / tasks,
+# so listing a page never triggers relationship loads.
+from datetime import datetime
+from typing   import List, Optional
+
+from pydantic import BaseModel
+
+from common.enums import Priority, ProjectStatus, TaskStatus
+
+
+class AdminProjectRow(BaseModel):
+    id:             int
+    title:          str
+    status:         ProjectStatus
+    due_date:       Optional[datetime] = None
+    owner_id:       int
+    owner_username: Optional[str]      = None
+
+
+class AdminBigTaskRow(BaseModel):
+    id:         int
+    title:      str
+    status:     TaskStatus
+    priority:   Priority
+    due_date:   Optional[datetime] = None
+    project_id: Optional[int]      = None
+    created_at: Optional[datetime] = None
+
+
+class AdminTaskRow(BaseModel):
+    id:          int
+    title:       str
+    status:      Optional[str]      = None
+    priority:    Priority
+    due_date:    Optional[datetime] = None
+    project_id:  Optional[int]      = None
+    big_task_id: Optional[int]      = None
+    reporter_id: int
+    assignee_id: Optional[int]      = None
+    created_at:  Optional[datetime] = None
+
+
+# keyset pages: pass `next_after_id` back as `after_id` for the next page
+class AdminProjectPage(BaseModel):
+    items:         List[AdminProjectRow]
+    next_after_id: Optional[int] = None
+
+
+class AdminBigTaskPage(BaseModel):
+    items:         List[AdminBigTaskRow]
+    next_after_id: Optional[int] = None
+
+
+class AdminTaskPage(BaseModel):
+    items:         List[AdminTaskRow]
+    next_after_id: Optional[int] = None
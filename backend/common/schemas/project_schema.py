@@ -20,6 +20,7 @@ class Project(ProjectBase):
     owner_id:  int
     owner:     Optional[UserSchema]
     members:   List[ProjectMember]    = Field(default_factory=list)
+    data_version: int                 = 0
 
     model_config = {
         "from_attributes": True
@@ -0,0 +1,19 @@
+# common/schemas/search_schema.py
+from typing   import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind:       Literal["task", "comment"]
+    task_id:    int
+    comment_id: Optional[int] = None
+    project_id: Optional[int] = None
+    title:      str                        # the task's title (for comments too)
+    excerpt:    Optional[str] = None       # start of the description / comment
+    score:      float
+
+
+class SearchPage(BaseModel):
+    items:       List[SearchHit]
+    next_offset: Optional[int] = None      # null on the last page
@@ -1,6 +1,6 @@
 # common/schemas/task_schema.py
-from pydantic import BaseModel
-from typing   import Optional
+from pydantic import BaseModel, Field
+from typing   import Annotated, List, Literal, Optional, Union
 from datetime import datetime
 from common.enums import TaskStatus, IssueType, Priority
 from common.schemas.project_schema import Project as ProjectSchema
@@ -29,9 +29,65 @@ class Task(TaskBase):
     created_at:   datetime
     updated_at:   Optional[datetime]
     creator_name: str
+    assignee_name: Optional[str] = None
 
     # Nested project info
     project: Optional[ProjectSchema]
 
     class Config:
         from_attributes = True
+
+
+# ───────────── bulk writes (POST /api/projects/tasks/bulk) ─────────────
+BULK_MAX_ITEMS = 500
+
+
+class BulkTaskCreate(TaskCreate):
+    op: Literal["create"]
+
+
+class BulkTaskUpdate(BaseModel):
+    """Only the fields that are sent change."""
+    op:          Literal["update"]
+    id:          int
+    title:       Optional[str]        = None
+    description: Optional[str]        = None
+    status:      Optional[TaskStatus] = None
+    issue_type:  Optional[IssueType]  = None
+    priority:    Optional[Priority]   = None
+    due_date:    Optional[datetime]   = None
+    assignee_id: Optional[int]        = None
+    big_task_id: Optional[int]        = None
+
+
+class BulkTaskMove(BaseModel):
+    """Drag a card: into another epic (null = out of any) and/or column."""
+    op:          Literal["move"]
+    id:          int
+    big_task_id: Optional[int]
+    status:      Optional[TaskStatus] = None
+
+
+BulkTaskItem = Annotated[
+    Union[BulkTaskCreate, BulkTaskUpdate, BulkTaskMove], Field(discriminator="op")
+]
+
+
+class BulkTaskRequest(BaseModel):
+    items:  List[BulkTaskItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    atomic: bool = False           # true → any invalid item rejects the whole request
+
+
+class BulkTaskResult(BaseModel):
+    index:  int
+    ok:     bool
+    status: int                    # what the single-task endpoint would have answered
+    id:     Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkTaskResponse(BaseModel):
+    created: int
+    updated: int
+    failed:  int
+    results: List[BulkTaskResult]
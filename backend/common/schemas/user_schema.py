@@ -24,3 +24,11 @@ class User(UserBase):
     id: int
     class Config:
         from_attributes = True
+
+
+class UserSearchHit(BaseModel):
+    """Typeahead row – public profile fields only, no email."""
+    id:           int
+    username:     str
+    display_name: Optional[str] = None
+    avatar_url:   Optional[str] = None
@@ -0,0 +1,243 @@
+# services/ai_service/cache.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Response cache for AI completions.
+#   • content-addressed: the key is a sha256 over the *normalized* request
+#     (whitespace collapsed, case-folded description + n, model, temperature
+#     and a prompt version), so cosmetic differences share one entry
+#   • two tiers, both LRU with a TTL:
+#       – memory: OrderedDict, hot entries for this process
+#       – disk:   a small SQLite file, shared by workers on the host and kept
+#                 across restarts (AI_CACHE_PATH="" → memory only). The async
+#                 paths reach it through a worker thread, never on the event
+#                 loop; a hit only rewrites last_used once per TOUCH_INTERVAL,
+#                 so hot keys don't take the shared file's write lock
+#   • single-flight: concurrent misses for the same key (on the worker's event
+#     loop) await the one upstream call instead of each paying for their own
+#   • only successful, validated results are stored – errors are never cached
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from common import metrics
+from common.config import settings
+
+LOOKUPS = metrics.counter(
+    "ai_cache_lookups_total", "AI response cache lookups", ["result"],
+)
+COALESCED = metrics.counter(
+    "ai_cache_coalesced_total", "Requests that waited on an identical in-flight call",
+)
+
+TOUCH_INTERVAL = 300.0          # seconds – LRU recency on disk is this coarse
+
+
+def normalize_text(text: str) -> str:
+    """NFKC, collapse whitespace, case-fold – "Build  Login" == "build login"."""
+    return " ".join(unicodedata.normalize("NFKC", text).split()).casefold()
+
+
+def cache_key(*parts: Any) -> str:
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# -----------------------------------------------------------------------------
+# Disk tier
+# -----------------------------------------------------------------------------
+class _DiskStore:
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_ai_cache_last_used ON ai_cache (last_used)"
+        )
+
+    def get(self, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, last_used FROM ai_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM ai_cache WHERE key = ?", (key,))
+                return None
+            if row[2] <= now - TOUCH_INTERVAL:
+                self._conn.execute("UPDATE ai_cache SET last_used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float, now: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            # expired rows first, then least recently used beyond the cap
+            self._conn.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM ai_cache WHERE key IN ("
+                " SELECT key FROM ai_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0]
+
+
+# -----------------------------------------------------------------------------
+# Two-tier cache with single-flight
+# -----------------------------------------------------------------------------
+class ResponseCache:
+    def __init__(self, ttl: float = 86_400.0, max_entries: int = 512,
+                 path: Optional[str] = None, max_disk_entries: int = 10_000,
+                 clock: Callable[[], float] = time.time):
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._clock      = clock
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._disk       = _DiskStore(path, max_disk_entries) if path else None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock       = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "ResponseCache":
+        return cls(
+            ttl              = settings.AI_CACHE_TTL,
+            max_entries      = settings.AI_CACHE_MAX_ENTRIES,
+            path             = settings.AI_CACHE_PATH or None,
+            max_disk_entries = settings.AI_CACHE_MAX_DISK_ENTRIES,
+        )
+
+    # ───────────── plain get / set ─────────────
+    # Sync versions block on the disk tier; coroutines use aget / aset.
+    def get(self, key: str) -> Optional[Any]:
+        now = self._clock()
+        value = self._from_memory(key, now)
+        if value is not None or self._disk is None:
+            return value
+        return self._promote(key, self._disk.get(key, now))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        now = self._clock()
+        value = self._from_memory(key, now)
+        if value is not None or self._disk is None:
+            return value
+        return self._promote(key, await asyncio.to_thread(self._disk.get, key, now))
+
+    def set(self, key: str, value: Any) -> None:
+        now = self._clock()
+        expires_at = self._store_memory(key, value, now)
+        if self._disk is not None:
+            self._disk.set(key, value, expires_at, now)
+
+    async def aset(self, key: str, value: Any) -> None:
+        now = self._clock()
+        expires_at = self._store_memory(key, value, now)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, value, expires_at, now)
+
+    def _from_memory(self, key: str, now: float) -> Optional[Any]:
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                if hit[0] > now:
+                    self._memory.move_to_end(key)
+                    return hit[1]
+                del self._memory[key]
+        return None
+
+    def _promote(self, key: str, found: Optional[Tuple[Any, float]]) -> Optional[Any]:
+        if found is None:
+            return None
+        value, expires_at = found
+        with self._lock:
+            self._remember(key, value, expires_at)
+        return value
+
+    def _store_memory(self, key: str, value: Any, now: float) -> float:
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+        return expires_at
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    # ───────────── cached call ─────────────
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached value for `key`, else the result of `await compute()` – run
+        once even when several requests miss at the same time. Exceptions
+        reach every waiter and nothing is stored.
+        """
+        value = await self.aget(key)
+        if value is not None:
+            LOOKUPS.inc(result="hit")
+            return value
+
+        while key in self._inflight:
+            future = self._inflight[key]
+            COALESCED.inc()
+            LOOKUPS.inc(result="coalesced")
+            try:
+                # shield: a waiter going away must not cancel the shared call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise                          # we were cancelled
+                # the leader was cancelled – take over
+
+        # a leader may have finished while we were reading the disk
+        value = self._from_memory(key, self._clock())
+        if value is not None:
+            LOOKUPS.inc(result="hit")
+            return value
+
+        future = asyncio.get_running_loop().create_future()
+        # nobody may be waiting – don't log "exception was never retrieved"
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        LOOKUPS.inc(result="miss")
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            self._inflight.pop(key, None)
+        await self.aset(key, value)
+        return value
@@ -0,0 +1,55 @@
+# services/ai_service/fake_openai.py
+# ──────────────────────────────────────────────────────────────────────────────
+# In-process stand-in for `openai.AsyncOpenAI` in unit tests (for the real
+# SDK over HTTP against a stub server see stub_openai.py).
+#   client = FakeOpenAI('["a","b"]')                 # fixed reply
+#   client = FakeOpenAI(lambda **kw: "...")          # computed per call
+#   client = FakeOpenAI(OpenAIError("boom"))         # raise on every call
+# Every create() call is recorded in `client.calls` (its kwargs). With
+# stream=True the reply comes back as an async iterator of delta chunks.
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Callable, List, Union
+
+Reply = Union[str, BaseException, Callable[..., str]]
+
+
+async def _chunks(content: str, size: int):
+    for i in range(0, len(content), size):
+        delta = SimpleNamespace(content=content[i:i + size])
+        yield SimpleNamespace(choices=[SimpleNamespace(index=0, delta=delta)])
+        await asyncio.sleep(0)
+
+
+class _Completions:
+    def __init__(self, outer: "FakeOpenAI"):
+        self._outer = outer
+
+    async def create(self, **kwargs):
+        outer = self._outer
+        with outer._lock:
+            outer.calls.append(kwargs)
+        if outer.delay:
+            await asyncio.sleep(outer.delay)
+        reply = outer.reply
+        if isinstance(reply, BaseException):
+            raise reply
+        content = reply(**kwargs) if callable(reply) else reply
+        if kwargs.get("stream"):
+            return _chunks(content, outer.chunk_size)
+        message = SimpleNamespace(role="assistant", content=content)
+        prompt  = sum(len(m.get("content") or "") for m in kwargs.get("messages", []))
+        usage   = SimpleNamespace(prompt_tokens=prompt // 4, completion_tokens=len(content) // 4)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message)], usage=usage)
+
+
+class FakeOpenAI:
+    def __init__(self, reply: Reply = "[]", delay: float = 0.0, chunk_size: int = 4):
+        self.reply  = reply
+        self.delay  = delay                   # seconds each call takes
+        self.chunk_size = chunk_size          # characters per streamed delta
+        self.calls: List[dict] = []
+        self._lock  = threading.Lock()
+        self.chat   = SimpleNamespace(completions=_Completions(self))
@@ -7,6 +7,11 @@ from dotenv import load_dotenv
 # 🔑  Auth
 from common.security.auth0_bearer import Auth0Bearer
 from common.auth0_docs import wire_auth0_docs        # Swagger PKCE helper
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
+from common.config import settings
+from common.db_routing import LAST_WRITE_HEADER, WriteStampMiddleware
+from common.query_stats import QueryStatsMiddleware
 
 # 🔧  Routers
 from services.ai_service.routers.suggestions import router as ai_router
@@ -27,7 +32,11 @@ app.add_middleware(
     allow_origins=origins,  # Add both dev and prod
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],    # read-your-writes stamp
 )
+app.add_middleware(QueryStatsMiddleware, headers=settings.QUERY_STATS_HEADERS)
+app.add_middleware(WriteStampMiddleware)
+instrument_app(app)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Require Auth0 on every endpoint in this service
@@ -40,6 +49,8 @@ app.include_router(
     dependencies=[Security(auth0_scheme)],   # 👈  JWT required!
 )
 
+app.include_router(metrics_router)
+
 # Add PKCE “Authorize” button to /docs
 wire_auth0_docs(app, port=8006)
 
@@ -0,0 +1,149 @@
+# services/ai_service/prompt_budget.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Keeping prompts inside a token budget, whatever the project size.
+#   • tokens are estimated (~4 characters each – no tokenizer dependency);
+#     the real counts come back in `completion.usage` and are recorded too
+#   • risk facts are ranked by severity (examples inside an alert are already
+#     worst-first, see risk_engine.py), alerts of the same type are merged
+#     and numbered look-alike titles ("Fix login 1", "Fix login 2") collapse
+#     into one line
+#   • over budget → examples go first (lowest-ranked risks first), then
+#     whole low-ranked risks; the model is told how many were left out
+# ──────────────────────────────────────────────────────────────────────────────
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from common import metrics
+
+CHARS_PER_TOKEN  = 4
+MESSAGE_OVERHEAD = 4              # role / separators per chat message
+SEVERITY_RANK    = {"High": 0, "Medium": 1, "Low": 2}
+
+PROMPT_TOKENS = metrics.histogram(
+    "ai_prompt_tokens", "Estimated prompt tokens sent upstream", ["route"],
+    buckets=(50, 100, 200, 400, 800, 1600, 3200, 6400),
+)
+PROMPT_TRIMMED = metrics.counter(
+    "ai_prompt_trimmed_total", "Prompt items dropped to stay within the token budget",
+    ["route", "item"],
+)
+TOKENS_USED = metrics.counter(
+    "ai_tokens_total", "Tokens billed by the upstream (completion.usage)", ["route", "kind"],
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_messages(messages: List[dict]) -> int:
+    return sum(estimate_tokens(m.get("content") or "") + MESSAGE_OVERHEAD for m in messages)
+
+
+def record_prompt(route: str, messages: List[dict]) -> int:
+    tokens = estimate_messages(messages)
+    PROMPT_TOKENS.observe(tokens, route=route)
+    return tokens
+
+
+def record_usage(route: str, completion) -> None:
+    usage = getattr(completion, "usage", None)
+    if usage is None:
+        return
+    TOKENS_USED.inc(getattr(usage, "prompt_tokens", 0) or 0, route=route, kind="prompt")
+    TOKENS_USED.inc(getattr(usage, "completion_tokens", 0) or 0, route=route, kind="completion")
+
+
+# -----------------------------------------------------------------------------
+# Similar titles
+# -----------------------------------------------------------------------------
+_NUMBERS = re.compile(r"\d+")
+_SPACES  = re.compile(r"\s+")
+
+
+def group_titles(titles: List[str]) -> List[str]:
+    """["Fix login 1", "Fix login 2", "Docs"] → ["Fix login 1 (+1 similar)", "Docs"]"""
+    groups: "OrderedDict[str, List[str]]" = OrderedDict()
+    for title in titles:
+        key = _SPACES.sub(" ", _NUMBERS.sub("#", title.lower())).strip()
+        groups.setdefault(key, []).append(title)
+    return [
+        items[0] if len(items) == 1 else f"{items[0]} (+{len(items) - 1} similar)"
+        for items in groups.values()
+    ]
+
+
+# -----------------------------------------------------------------------------
+# Risk facts
+# -----------------------------------------------------------------------------
+@dataclass
+class BudgetedFacts:
+    facts:            dict
+    tokens:           int
+    dropped_examples: int = 0
+    dropped_risks:    int = 0
+
+
+def _merge_by_type(alerts: List[dict]) -> List[dict]:
+    merged: Dict[str, dict] = {}
+    for a in alerts:
+        entry = merged.get(a["risk_type"])
+        if entry is None:
+            merged[a["risk_type"]] = {
+                "type":     a["risk_type"],
+                "severity": a["severity"],
+                "facts":    [a["description"]],
+                "examples": list(a.get("affected_items") or []),
+            }
+            continue
+        if SEVERITY_RANK.get(a["severity"], 3) < SEVERITY_RANK.get(entry["severity"], 3):
+            entry["severity"] = a["severity"]
+        entry["facts"].append(a["description"])
+        entry["examples"].extend(a.get("affected_items") or [])
+
+    risks = []
+    for entry in merged.values():
+        facts = entry["facts"]
+        entry["facts"] = facts[0] if len(facts) == 1 else (
+            f"{facts[0]} (+{len(facts) - 1} more like this)"
+        )
+        entry["examples"] = group_titles(entry["examples"])
+        if not entry["examples"]:
+            del entry["examples"]
+        risks.append(entry)
+    risks.sort(key=lambda r: SEVERITY_RANK.get(r["severity"], 3))   # stable: engine order within
+    return risks
+
+
+def budget_risk_facts(header: dict, alerts: List[dict], budget: int,
+                      render: Callable[[dict], str], route: str = "analyze_risks") -> BudgetedFacts:
+    """
+    `header` + ranked risks, trimmed until `render(facts)` – the whole
+    prompt – is estimated at no more than `budget` tokens. The top risk is
+    always kept (without examples if need be).
+    """
+    risks = _merge_by_type(alerts)
+    out = BudgetedFacts(facts={**header, "risks": risks}, tokens=0)
+
+    def fits() -> bool:
+        out.tokens = estimate_tokens(render(out.facts))
+        return out.tokens <= budget
+
+    for risk in reversed(risks):
+        if fits():
+            break
+        if risk.pop("examples", None) is not None:
+            out.dropped_examples += 1
+    while len(risks) > 1 and not fits():
+        risks.pop()
+        out.dropped_risks += 1
+        out.facts["more_risks_not_listed"] = out.dropped_risks
+    fits()
+
+    if out.dropped_examples:
+        PROMPT_TRIMMED.inc(out.dropped_examples, route=route, item="examples")
+    if out.dropped_risks:
+        PROMPT_TRIMMED.inc(out.dropped_risks, route=route, item="risks")
+    return out
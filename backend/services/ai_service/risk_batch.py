@@ -0,0 +1,209 @@
+# services/ai_service/risk_batch.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Precomputed risk reports.
+#   • every report analyze_risks builds is written to project_risk_reports
+#     (one row per project and mode, tagged with the data_version it reflects)
+#     and the route answers from that table before computing anything
+#   • the scheduler runs `run_risk_batch` periodically: open projects with
+#     task activity in the last ACTIVE_DAYS whose stored report is missing,
+#     outdated (data_version moved on) or older than REFRESH_AFTER – most
+#     recently active first, BATCH_SIZE per round, at most MAX_PROJECTS a run
+#   • WORKERS reports are built concurrently; narrative completions go
+#     through a token bucket (RATE_PER_MINUTE) on top of the process-wide
+#     upstream limiter, so the batch never starves interactive requests
+# Run from the scheduler: services/scheduler_service/jobs.py
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Collection, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from common import metrics
+from common.config import settings
+from common.enums import ProjectStatus
+from common.models.project import Project
+from common.models.risk_report import ProjectRiskReport
+from common.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+BATCH_REPORTS = metrics.counter(
+    "ai_risk_batch_reports_total", "Risk reports built by the batch precompute", ["outcome"],
+)
+BATCH_SECONDS = metrics.histogram(
+    "ai_risk_batch_seconds", "Duration of one risk precompute run",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800),
+)
+THROTTLED = metrics.histogram(
+    "ai_risk_batch_throttle_seconds", "Time batch narratives waited for the rate limit",
+    buckets=(0.01, 0.1, 0.5, 1, 2, 5, 10, 30, 60),
+)
+
+
+@dataclass(frozen=True)
+class BatchPolicy:
+    batch_size:      int   = 20
+    max_projects:    int   = 200      # per run – bounds a single job's runtime
+    workers:         int   = 4
+    rate_per_minute: float = 30.0
+    active_days:     int   = 14
+    refresh_after:   float = 900.0    # seconds
+
+    @classmethod
+    def from_settings(cls) -> "BatchPolicy":
+        return cls(
+            batch_size      = settings.AI_RISK_BATCH_SIZE,
+            max_projects    = settings.AI_RISK_BATCH_MAX_PROJECTS,
+            workers         = settings.AI_RISK_BATCH_WORKERS,
+            rate_per_minute = settings.AI_RISK_BATCH_RATE_PER_MINUTE,
+            active_days     = settings.AI_RISK_BATCH_ACTIVE_DAYS,
+            refresh_after   = settings.AI_RISK_BATCH_REFRESH_AFTER,
+        )
+
+
+class RateLimiter:
+    """Token bucket: `acquire()` returns at most `rate_per_minute` times a minute."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.rate    = rate_per_minute / 60.0
+        self.burst   = burst
+        self._tokens = float(burst)
+        self._clock  = clock
+        self._sleep  = sleep
+        self._last   = clock()
+
+    async def acquire(self) -> None:
+        started = self._clock()
+        while True:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last   = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                THROTTLED.observe(now - started)
+                return
+            await self._sleep((1 - self._tokens) / self.rate)
+
+
+# -----------------------------------------------------------------------------
+# Stored reports
+# -----------------------------------------------------------------------------
+def load_report(db: Session, project_id: int, mode: str) -> Optional[ProjectRiskReport]:
+    return db.get(ProjectRiskReport, (project_id, mode))
+
+
+def save_report(db: Session, project_id: int, mode: str, version: int,
+                report: dict, generated_at: datetime) -> bool:
+    """
+    Upsert one report; False when a newer version is already stored. One
+    INSERT … ON CONFLICT, so concurrent builders (batch + interactive miss,
+    several AI workers) can't trip over each other's first insert.
+    """
+    generated_at = generated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    insert = _UPSERTS[db.get_bind().dialect.name]
+    stmt = insert(ProjectRiskReport).values(
+        project_id=project_id, mode=mode, data_version=version,
+        report=report, generated_at=generated_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ProjectRiskReport.project_id, ProjectRiskReport.mode],
+        set_={"data_version": stmt.excluded.data_version,
+              "report":       stmt.excluded.report,
+              "generated_at": stmt.excluded.generated_at},
+        where=ProjectRiskReport.data_version <= stmt.excluded.data_version,
+    )
+    written = db.execute(stmt).rowcount
+    db.commit()
+    return written > 0
+
+
+def select_candidates(db: Session, policy: BatchPolicy, mode: str, now: datetime,
+                      limit: int, exclude: Collection[int] = ()) -> List[int]:
+    """Project ids needing a (re)built report, most recently active first."""
+    now = now.astimezone(timezone.utc)
+    activity = (
+        select(Task.project_id,
+               func.max(func.coalesce(Task.updated_at, Task.created_at)).label("last"))
+        .group_by(Task.project_id)
+        .subquery()
+    )
+    report = ProjectRiskReport
+    query = (
+        select(Project.id)
+        .join(activity, activity.c.project_id == Project.id)
+        .outerjoin(report, and_(report.project_id == Project.id, report.mode == mode))
+        .where(
+            Project.status != ProjectStatus.DONE,
+            activity.c.last >= now - timedelta(days=policy.active_days),
+            or_(
+                report.project_id.is_(None),
+                report.data_version != Project.data_version,
+                report.generated_at < (now - timedelta(seconds=policy.refresh_after))
+                                      .replace(tzinfo=None),
+            ),
+        )
+        .order_by(activity.c.last.desc(), Project.id)
+        .limit(limit)
+    )
+    if exclude:
+        query = query.where(Project.id.notin_(list(exclude)))
+    return list(db.execute(query).scalars())
+
+
+# -----------------------------------------------------------------------------
+# The run
+# -----------------------------------------------------------------------------
+BuildFn = Callable[[int, RateLimiter], Awaitable[Tuple[int, Any]]]
+
+
+async def run_risk_batch(bind, build: BuildFn, policy: Optional[BatchPolicy] = None,
+                         mode: str = "auto", now: Optional[datetime] = None,
+                         limiter: Optional[RateLimiter] = None) -> dict:
+    """
+    Build stale reports round by round. `build(project_id, limiter)` makes
+    and stores one report (the route's builder – see routers/suggestions.py)
+    and awaits `limiter.acquire()` before any completion.
+    """
+    policy  = policy or BatchPolicy.from_settings()
+    limiter = limiter or RateLimiter(policy.rate_per_minute)
+    gate    = asyncio.Semaphore(policy.workers)
+    seen: set = set()
+    result  = {"built": 0, "failed": 0}
+    started = time.monotonic()
+
+    async def one(project_id: int) -> None:
+        async with gate:
+            try:
+                await build(project_id, limiter)
+            except Exception as e:
+                result["failed"] += 1
+                BATCH_REPORTS.inc(outcome="error")
+                logger.warning("Risk precompute for project %s failed: %s", project_id, e)
+            else:
+                result["built"] += 1
+                BATCH_REPORTS.inc(outcome="ok")
+
+    def pick(limit: int) -> List[int]:
+        with Session(bind=bind) as session:
+            return select_candidates(session, policy, mode, now or datetime.now(timezone.utc),
+                                     limit, exclude=seen)
+
+    while len(seen) < policy.max_projects:
+        ids = await asyncio.to_thread(pick, min(policy.batch_size, policy.max_projects - len(seen)))
+        if not ids:
+            break
+        seen.update(ids)
+        await asyncio.gather(*(one(pid) for pid in ids))
+
+    BATCH_SECONDS.observe(time.monotonic() - started)
+    return result
@@ -0,0 +1,141 @@
+# services/ai_service/risk_cache.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Risk reports cached per (project_id, mode), tagged with the project's
+# data_version (bumped in the same transaction as every task / epic write,
+# see project_service/board_events.py).
+#   • fresh  – same data_version and younger than AI_RISK_CACHE_TTL (overdue
+#              and stale-work metrics also move with the clock) → served as is
+#   • stale  – version moved on or TTL passed, but younger than
+#              AI_RISK_CACHE_MAX_STALE → served immediately while ONE
+#              background refresh per key recomputes it
+#   • miss   – nothing usable → computed inline; concurrent misses for the
+#              same key share that computation
+# In-process LRU, one per worker.
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from common import metrics
+from common.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOOKUPS = metrics.counter(
+    "ai_risk_cache_lookups_total", "Risk report cache lookups", ["state"],
+)
+REFRESHES = metrics.counter(
+    "ai_risk_cache_refreshes_total", "Background risk report refreshes", ["outcome"],
+)
+
+
+@dataclass
+class Entry:
+    version:     int
+    report:      Any
+    computed_at: float
+
+
+class RiskReportCache:
+    def __init__(self, ttl: float = 900.0, max_stale: float = 86_400.0,
+                 max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl         = ttl
+        self.max_stale   = max_stale
+        self.max_entries = max_entries
+        self._clock      = clock
+        self._entries: "OrderedDict[Hashable, Entry]" = OrderedDict()
+        self._refreshing: Set[Hashable] = set()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @classmethod
+    def from_settings(cls) -> "RiskReportCache":
+        return cls(
+            ttl         = settings.AI_RISK_CACHE_TTL,
+            max_stale   = settings.AI_RISK_CACHE_MAX_STALE,
+            max_entries = settings.AI_RISK_CACHE_MAX_ENTRIES,
+        )
+
+    # ───────────── lookup ─────────────
+    def lookup(self, key: Hashable, version: int) -> Tuple[Optional[Entry], str]:
+        """(entry, "fresh" | "stale" | "miss") for the project's current version."""
+        entry = self._entries.get(key)
+        if entry is None:
+            state = "miss"
+        else:
+            age = self._clock() - entry.computed_at
+            if entry.version == version and age < self.ttl:
+                state = "fresh"
+            elif age < self.max_stale:
+                state = "stale"
+            else:
+                state, entry = "miss", None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        LOOKUPS.inc(state=state)
+        return entry, state
+
+    def store(self, key: Hashable, version: int, report: Any, age: float = 0.0) -> None:
+        """`age`: seconds since the report was built (when loaded from storage)."""
+        current = self._entries.get(key)
+        if current is not None and current.version > version:
+            return                          # a newer report landed meanwhile
+        self._entries[key] = Entry(version, report, self._clock() - age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._refreshing.clear()
+
+    # ───────────── computing ─────────────
+    async def compute(self, key: Hashable, fn: Callable[[], Awaitable[Tuple[int, Any]]]) -> Any:
+        """
+        Run `fn()` → (version, report) and store it; callers missing on the
+        same key at the same time await the one computation.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            version, report = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.store(key, version, report)
+            future.set_result(report)
+            return report
+        finally:
+            self._inflight.pop(key, None)
+
+    def claim_refresh(self, key: Hashable) -> bool:
+        """True for exactly one caller until `refresh` for that key finishes."""
+        if key in self._refreshing or key in self._inflight:
+            return False
+        self._refreshing.add(key)
+        return True
+
+    async def refresh(self, key: Hashable, fn: Callable[[], Awaitable[Tuple[int, Any]]]) -> None:
+        """Background recompute after claim_refresh; failures keep the stale entry."""
+        try:
+            await self.compute(key, fn)
+            REFRESHES.inc(outcome="ok")
+        except Exception as e:
+            REFRESHES.inc(outcome="error")
+            logger.warning("Risk report refresh of %r failed: %s", key, e)
+        finally:
+            self._refreshing.discard(key)
@@ -0,0 +1,203 @@
+# services/ai_service/risk_engine.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Deterministic project risk analysis.
+#   • everything countable is computed by the database: one aggregate pass
+#     over the project's open tasks, one GROUP BY for workload per assignee,
+#     and three LIMITed samples for the alert details – a fixed 5 queries
+#     however large the project is, no task rows loaded into Python
+#   • risks: overdue work, overloaded assignees, unassigned high-priority
+#     items, stale "In Progress" tasks, open work without due dates
+#   • alerts and a template summary come out of plain rules, so mode=local
+#     needs no upstream at all; the LLM (if used) only gets the compact
+#     metrics to write a narrative summary (see routers/suggestions.py)
+# ──────────────────────────────────────────────────────────────────────────────
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from common.enums import Priority, TaskStatus
+from common.models.task import Task
+from common.models.user import User
+
+HIGH_PRIORITIES     = (Priority.HIGHEST, Priority.HIGH)
+STALE_AFTER_DAYS    = 7          # "In Progress" without an update for this long
+OVERLOAD_MIN_TASKS  = 6          # never call fewer open tasks than this overload
+OVERLOAD_FACTOR     = 1.5        # … nor less than 1.5× the team's average load
+SAMPLE_SIZE         = 5          # titles listed per alert
+
+
+@dataclass
+class Workload:
+    assignee: str
+    open:     int
+    overdue:  int
+
+
+@dataclass
+class RiskMetrics:
+    open_tasks:          int = 0
+    overdue:             int = 0
+    max_days_overdue:    int = 0
+    unassigned_high:     int = 0
+    highest_unassigned:  int = 0
+    stale_in_progress:   int = 0
+    no_due_date:         int = 0
+    workload:            List[Workload] = field(default_factory=list)
+    overloaded:          List[Workload] = field(default_factory=list)
+    overload_threshold:  int = OVERLOAD_MIN_TASKS
+    samples:             Dict[str, List[str]] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def compute_metrics(db: Session, project_id: int, now: Optional[datetime] = None) -> RiskMetrics:
+    now       = now or datetime.now(timezone.utc)
+    today     = now.replace(tzinfo=None)                  # due_date is naive UTC
+    stale_cut = now - timedelta(days=STALE_AFTER_DAYS)
+
+    is_open     = and_(Task.project_id == project_id, Task.status != TaskStatus.DONE.value)
+    is_overdue  = and_(Task.due_date.isnot(None), Task.due_date < today)
+    is_unassigned_high = and_(Task.assignee_id.is_(None), Task.priority.in_(HIGH_PRIORITIES))
+    last_touch  = func.coalesce(Task.updated_at, Task.created_at)
+    is_stale    = and_(Task.status == TaskStatus.IN_PROGRESS.value, last_touch < stale_cut)
+
+    # 1) one aggregate pass
+    row = db.execute(
+        select(
+            func.count(Task.id),
+            _count(is_overdue),
+            func.min(case((is_overdue, Task.due_date))),
+            _count(is_unassigned_high),
+            _count(and_(Task.assignee_id.is_(None), Task.priority == Priority.HIGHEST)),
+            _count(is_stale),
+            _count(Task.due_date.is_(None)),
+        ).where(is_open)
+    ).one()
+    m = RiskMetrics(
+        open_tasks=row[0], overdue=row[1], unassigned_high=row[3],
+        highest_unassigned=row[4], stale_in_progress=row[5], no_due_date=row[6],
+    )
+    if m.open_tasks == 0:
+        return m
+    if row[2] is not None:
+        oldest = row[2] if isinstance(row[2], datetime) else datetime.fromisoformat(str(row[2]))
+        m.max_days_overdue = max(0, (today - oldest.replace(tzinfo=None)).days)
+
+    # 2) workload per assignee
+    m.workload = [
+        Workload(name, n_open, n_overdue)
+        for name, n_open, n_overdue in db.execute(
+            select(User.username, func.count(Task.id), _count(is_overdue))
+            .join(User, User.id == Task.assignee_id)
+            .where(is_open)
+            .group_by(User.id, User.username)
+            .order_by(func.count(Task.id).desc(), User.username)
+        ).all()
+    ]
+    if m.workload:
+        average = sum(w.open for w in m.workload) / len(m.workload)
+        m.overload_threshold = max(OVERLOAD_MIN_TASKS, int(OVERLOAD_FACTOR * average + 0.999))
+        m.overloaded = [w for w in m.workload if w.open >= m.overload_threshold]
+
+    # 3) a few titles per alert, worst first
+    def sample(condition, *order_by):
+        return list(db.execute(
+            select(Task.title).where(is_open, condition).order_by(*order_by, Task.id)
+            .limit(SAMPLE_SIZE)
+        ).scalars())
+
+    if m.overdue:
+        m.samples["overdue"] = sample(is_overdue, Task.due_date)
+    if m.unassigned_high:
+        m.samples["unassigned_high"] = sample(
+            is_unassigned_high, case((Task.priority == Priority.HIGHEST, 0), else_=1)
+        )
+    if m.stale_in_progress:
+        m.samples["stale_in_progress"] = sample(is_stale, last_touch)
+    return m
+
+
+# -----------------------------------------------------------------------------
+# Rules → alerts (RiskAlert-shaped dicts) and a template summary
+# -----------------------------------------------------------------------------
+def build_alerts(m: RiskMetrics) -> List[dict]:
+    alerts: List[dict] = []
+
+    if m.overdue:
+        share = m.overdue / m.open_tasks
+        severity = ("High" if m.overdue >= 5 or share >= 0.25 or m.max_days_overdue > 14
+                    else "Medium" if m.overdue >= 2 else "Low")
+        alerts.append({
+            "risk_type":   "Overdue Tasks",
+            "severity":    severity,
+            "description": f"{m.overdue} of {m.open_tasks} open tasks are past their due date "
+                           f"(oldest by {m.max_days_overdue} days).",
+            "affected_items":  m.samples.get("overdue", []),
+            "recommendations": [
+                "Review overdue tasks and re-plan realistic due dates",
+                "Unblock or re-assign the oldest overdue items first",
+            ],
+        })
+
+    for w in m.overloaded:
+        alerts.append({
+            "risk_type":   "Resource Overload",
+            "severity":    "High" if w.open >= 2 * m.overload_threshold else "Medium",
+            "description": f"{w.assignee} has {w.open} open tasks ({w.overdue} overdue); "
+                           f"the team threshold is {m.overload_threshold}.",
+            "affected_items":  [w.assignee],
+            "recommendations": [
+                f"Redistribute some of {w.assignee}'s tasks",
+                "Check whether lower-priority work can be deferred",
+            ],
+        })
+
+    if m.unassigned_high:
+        alerts.append({
+            "risk_type":   "Missing Assignments",
+            "severity":    "High" if m.highest_unassigned else "Medium",
+            "description": f"{m.unassigned_high} high-priority open tasks have no assignee.",
+            "affected_items":  m.samples.get("unassigned_high", []),
+            "recommendations": ["Assign an owner to every high-priority task"],
+        })
+
+    if m.stale_in_progress:
+        alerts.append({
+            "risk_type":   "Stalled Work",
+            "severity":    "High" if m.stale_in_progress >= 5 else "Medium",
+            "description": f"{m.stale_in_progress} tasks have been \"In Progress\" without "
+                           f"updates for over {STALE_AFTER_DAYS} days.",
+            "affected_items":  m.samples.get("stale_in_progress", []),
+            "recommendations": [
+                "Check in with the assignees about blockers",
+                "Split long-running tasks into smaller deliverables",
+            ],
+        })
+
+    if m.no_due_date and m.no_due_date * 2 > m.open_tasks:
+        alerts.append({
+            "risk_type":   "Missing Due Dates",
+            "severity":    "Low",
+            "description": f"{m.no_due_date} of {m.open_tasks} open tasks have no due date.",
+            "affected_items":  [],
+            "recommendations": ["Set due dates so slippage becomes visible early"],
+        })
+    return alerts
+
+
+def local_summary(m: RiskMetrics, alerts: List[dict]) -> str:
+    if not alerts:
+        return f"{m.open_tasks} open tasks and no risks detected – the project looks on track."
+    high = [a["risk_type"] for a in alerts if a["severity"] == "High"]
+    head = f"{len(alerts)} risk(s) across {m.open_tasks} open tasks"
+    if high:
+        return f"{head}; needs attention first: {', '.join(dict.fromkeys(high))}."
+    return f"{head}, none of them high severity."
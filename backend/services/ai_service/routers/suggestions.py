@@ -4,22 +4,33 @@ import re
 import json
 import logging
 from datetime import datetime, timezone
-from typing import List, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response, status, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from openai import OpenAI, OpenAIError
+from openai import OpenAIError
 
 # Import database and models - just like analytics service does
+from common.config import settings
 from common.database import get_db
-from common.models.task import Task
 from common.models.big_task import BigTask
 from common.models.project import Project
 from common.models.user import User
 from common.security.dependencies import get_current_user
 from common.enums import TaskStatus
+from services.ai_service.cache import ResponseCache, cache_key, normalize_text
+from services.ai_service.prompt_budget import budget_risk_facts, record_prompt, record_usage
+from services.ai_service.risk_batch import RateLimiter, load_report, save_report
+from services.ai_service.risk_cache import RiskReportCache
+from services.ai_service.risk_engine import RiskMetrics, build_alerts, compute_metrics, local_summary
+from services.ai_service.streaming import JsonListParser, StreamFormatError, sse
+from services.ai_service.upstream import UpstreamBusy, UpstreamDeadline, make_client, upstream
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Configuration & Logger
@@ -32,9 +43,15 @@ OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_KEY:
     raise RuntimeError("Environment variable OPENAI_API_KEY is missing")
 
-client = OpenAI(api_key=OPENAI_KEY)
+client = make_client(OPENAI_KEY)          # AsyncOpenAI – see upstream.py
 router = APIRouter()
 
+SUGGEST_MODEL       = "gpt-3.5-turbo"
+SUGGEST_TEMPERATURE = 0.7
+SUGGEST_PROMPT_V    = 1            # bump when the prompt changes → old entries miss
+
+response_cache = ResponseCache.from_settings()
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Request / Response Models
 # ──────────────────────────────────────────────────────────────────────────────
@@ -46,15 +63,6 @@ class SuggestResponse(BaseModel):
     suggestions: list[str]
 
 # Risk Prediction Models
-class TaskRiskData(BaseModel):
-    task_id: int
-    title: str
-    status: str
-    priority: str
-    due_date: Optional[str]
-    assignee_name: Optional[str]
-    days_overdue: Optional[int]
-
 class RiskAlert(BaseModel):
     risk_type: str
     severity: str  # "High", "Medium", "Low"
@@ -64,38 +72,77 @@ class RiskAlert(BaseModel):
 
 class RiskAnalysisRequest(BaseModel):
     project_id: int
+    mode: Literal["auto", "local"] = "auto"   # "local": no LLM call at all
+    refresh: bool = False                     # skip the report cache
 
 class RiskAnalysisResponse(BaseModel):
     project_title: str
     total_risks: int
     risk_alerts: List[RiskAlert]
     summary: str
+    summary_source: str = "local"             # "llm" when the model wrote it
+    metrics: Optional[dict] = None
+    data_version: Optional[int] = None        # project version the report reflects
+    generated_at: Optional[datetime] = None
+    stale: bool = False                       # true while a newer one is being built
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Route: /ai/suggest_subtasks
 # ──────────────────────────────────────────────────────────────────────────────
-@router.post("/suggest_subtasks", response_model=SuggestResponse)
-def suggest_subtasks(body: SuggestRequest):
+def _upstream_error(e: OpenAIError, where: str) -> HTTPException:
+    if isinstance(e, UpstreamBusy):
+        logger.warning("%s: %s", where, e)
+        return HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "AI service busy, try again shortly")
+    if isinstance(e, UpstreamDeadline):
+        logger.warning("%s: %s", where, e)
+        return HTTPException(status.HTTP_504_GATEWAY_TIMEOUT, "OpenAI did not answer in time")
+    logger.error("OpenAIError in %s: %s", where, e, exc_info=True)
+    return HTTPException(status.HTTP_502_BAD_GATEWAY, f"OpenAI error: {e}")
+
+
+def _suggest_key(body: SuggestRequest) -> str:
+    # identical epics (modulo whitespace / case) share one cached completion
+    return cache_key(
+        "suggest_subtasks", SUGGEST_PROMPT_V, normalize_text(body.description),
+        body.n, SUGGEST_MODEL, SUGGEST_TEMPERATURE,
+    )
+
+
+def _suggest_call(body: SuggestRequest) -> dict:
     prompt = (
         "You are a senior project-management assistant.\n"
         f"Generate {body.n} subtasks for the epic below, "
         "each a short action sentence (max 12 words), and return **only** a JSON list.\n\n"
         f"Epic: \"{body.description.strip()}\""
     )
+    return dict(
+        model=SUGGEST_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=SUGGEST_TEMPERATURE,
+        max_tokens=200,
+    )
 
+
+@router.post("/suggest_subtasks", response_model=SuggestResponse)
+async def suggest_subtasks(body: SuggestRequest):
+    # concurrent identical requests share one upstream call
+    suggestions = await response_cache.get_or_compute(
+        _suggest_key(body), lambda: _generate_subtasks(body)
+    )
+    return SuggestResponse(suggestions=suggestions)
+
+
+async def _generate_subtasks(body: SuggestRequest) -> List[str]:
     # 1) Call OpenAI
     try:
-        completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=200,
-        )
+        call = _suggest_call(body)
+        record_prompt("suggest_subtasks", call["messages"])
+        completion = await upstream.create(client, **call)
+        record_usage("suggest_subtasks", completion)
         raw = completion.choices[0].message.content
         logger.info("OpenAI raw output:\n%s", raw)
     except OpenAIError as e:
-        logger.error("OpenAIError in suggest_subtasks: %s", e, exc_info=True)
-        raise HTTPException(status.HTTP_502_BAD_GATEWAY, f"OpenAI error: {e}")
+        raise _upstream_error(e, "suggest_subtasks")
 
     # 2) Strip Markdown fences
     cleaned = re.sub(r"^```(?:json)?\s*", "", raw.strip(), flags=re.IGNORECASE)
@@ -123,161 +170,232 @@ def suggest_subtasks(body: SuggestRequest):
         raise HTTPException(status.HTTP_502_BAD_GATEWAY, "All subtasks must be strings")
 
     # 6) Trim to requested count
-    suggestions = [s.strip() for s in suggestions][: body.n]
-    return SuggestResponse(suggestions=suggestions)
+    return [s.strip() for s in suggestions][: body.n]
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Route: /ai/suggest_subtasks/stream  (server-sent events)
+#   event: suggestion  data: {"index": 0, "text": "…"}     – one per subtask
+#   event: done        data: {"count": n, "cached": bool}
+#   event: error       data: {"status": 502, "detail": "…"}
+# Errors after the response started can't change the HTTP status, so they
+# arrive as an `error` event instead.
+# ──────────────────────────────────────────────────────────────────────────────
+@router.post("/suggest_subtasks/stream")
+async def suggest_subtasks_stream(body: SuggestRequest):
+    return StreamingResponse(
+        _suggestion_events(body),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _suggestion_events(body: SuggestRequest) -> AsyncIterator[str]:
+    key    = _suggest_key(body)
+    cached = await response_cache.aget(key)
+    if cached is not None:
+        for i, text in enumerate(cached):
+            yield sse("suggestion", {"index": i, "text": text})
+        yield sse("done", {"count": len(cached), "cached": True})
+        return
+
+    parser = JsonListParser(limit=body.n)
+    try:
+        async with aclosing(upstream.stream(client, **_suggest_call(body))) as deltas:
+            async for delta in deltas:
+                for text in parser.feed(delta):
+                    yield sse("suggestion", {"index": len(parser.items) - 1, "text": text})
+                if parser.done:
+                    break                  # closes the upstream stream early
+        parser.finish()
+    except StreamFormatError as e:
+        logger.error("Streamed suggestions unusable: %s", e)
+        yield sse("error", {"status": status.HTTP_502_BAD_GATEWAY, "detail": str(e)})
+        return
+    except OpenAIError as e:
+        err = _upstream_error(e, "suggest_subtasks_stream")
+        yield sse("error", {"status": err.status_code, "detail": err.detail})
+        return
+
+    if parser.done:                        # only a complete list is worth reusing
+        await response_cache.aset(key, parser.items)
+    yield sse("done", {"count": len(parser.items), "cached": False})
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Route: /ai/analyze_risks
+#   Risks are computed locally (risk_engine.py – SQL aggregates, exact).
+#   mode="auto" asks the LLM for a narrative summary of those compact facts
+#   only, falling back to the template summary if it fails; mode="local"
+#   never calls upstream.
+#   Reports are cached per project data_version (risk_cache.py): unchanged
+#   projects answer from memory, changed ones get the previous report at
+#   once (stale=true, X-Risk-Cache: stale) while it is rebuilt after the
+#   response. `refresh=true` always recomputes.
+#   Every report is also persisted (risk_batch.py) and the scheduler keeps
+#   active projects' reports warm, so a cold worker answers from the table
+#   instead of building one inline.
 # ──────────────────────────────────────────────────────────────────────────────
+RISK_MODEL = "gpt-3.5-turbo"
 
+risk_cache = RiskReportCache.from_settings()
 
-@router.post("/analyze_risks", response_model=RiskAnalysisResponse)
-def analyze_project_risks(
-    body: RiskAnalysisRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    # 1) Load project
-    project = db.query(Project).filter(Project.id == body.project_id).first()
+
+def _project_version(db: Session, project_id: int) -> int:
+    row = db.query(Project.data_version).filter(Project.id == project_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return row.data_version
+
+
+def _local_analysis(db: Session, project_id: int):
+    """Blocking DB part of analyze_risks – runs in the threadpool."""
+    project = (
+        db.query(Project.title, Project.data_version)
+          .filter(Project.id == project_id)
+          .first()
+    )
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    return project.title, project.data_version, compute_metrics(db, project_id)
+
 
-    # 2) Load tasks
-    tasks = (
-        db.query(Task)
-          .options(joinedload(Task.assignee), joinedload(Task.reporter))
-          .filter(Task.project_id == body.project_id)
-          .all()
+def _risk_prompt(facts: dict) -> str:
+    return (
+        "You are a senior project management risk analyst. Using only the facts below, "
+        "write a 2-3 sentence overall risk assessment for the project team. "
+        'Return ONLY JSON: {"summary": "..."}\n\n'
+        f"Facts: {json.dumps(facts, separators=(',', ':'), ensure_ascii=False)}"
     )
 
-    current_date = datetime.now(timezone.utc)
-    task_data: List[TaskRiskData] = []
-
-    for task in tasks:
-        # Normalize status to a simple string
-        status_value = str(task.status).strip()
-        logger.info("→ task %r status=%r", task.title, status_value)
-
-        # Skip completed ones
-        if status_value.lower() == "done":
-            logger.info("✔ Skipping completed task %r", task.title)
-            continue
-
-        # Compute days overdue if applicable
-        days_overdue = None
-        if task.due_date:
-            due_dt = task.due_date
-            if due_dt.tzinfo is None or due_dt.tzinfo.utcoffset(due_dt) is None:
-                due_dt = due_dt.replace(tzinfo=timezone.utc)
-            days_overdue = (current_date - due_dt).days
-
-        # Pick an assignee name
-        if task.assignee_id and task.assignee:
-            assignee = task.assignee.username
-        elif task.reporter:
-            assignee = f"{task.reporter.username} (creator)"
-        else:
-            assignee = None
-
-        task_data.append(TaskRiskData(
-            task_id=task.id,
-            title=task.title,
-            status=status_value,
-            priority=str(task.priority),
-            due_date=task.due_date.isoformat() if task.due_date else None,
-            assignee_name=assignee,
-            days_overdue=days_overdue if days_overdue and days_overdue > 0 else None
-        ))
 
-    logger.info("✔ Filtered tasks count: %d", len(task_data))
+async def _narrate(project_title: str, metrics: RiskMetrics, alerts: List[dict]) -> str:
+    # ranked, merged and trimmed to AI_RISK_PROMPT_TOKENS – see prompt_budget.py
+    header = {
+        "project":    project_title,
+        "date":       datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "open_tasks": metrics.open_tasks,
+    }
+    budgeted = budget_risk_facts(header, alerts, settings.AI_RISK_PROMPT_TOKENS, _risk_prompt)
+    messages = [{"role": "user", "content": _risk_prompt(budgeted.facts)}]
+    record_prompt("analyze_risks", messages)
+    completion = await upstream.create(
+        client,
+        model=RISK_MODEL,
+        messages=messages,
+        temperature=0.3,
+        max_tokens=200,
+    )
+    record_usage("analyze_risks", completion)
+    raw = completion.choices[0].message.content or ""
+    cleaned = re.sub(r"^```(?:json)?\s*", "", raw.strip(), flags=re.IGNORECASE)
+    cleaned = re.sub(r"\s*```$", "", cleaned).strip()
+    summary = json.loads(cleaned).get("summary")
+    if not isinstance(summary, str) or not summary.strip():
+        raise ValueError("no summary in model output")
+    return summary.strip()
+
+
+def _stored_report(db: Session, project_id: int, mode: str):
+    """(data_version, report, age in seconds) of the persisted report, if any."""
+    row = load_report(db, project_id, mode)
+    if row is None:
+        return None
+    age = (datetime.now(timezone.utc).replace(tzinfo=None) - row.generated_at).total_seconds()
+    return row.data_version, RiskAnalysisResponse.model_validate(row.report), max(0.0, age)
+
 
-    if not task_data:
-        return RiskAnalysisResponse(
-            project_title=project.title,
+async def build_risk_report(
+    bind, project_id: int, mode: str, throttle: Optional[RateLimiter] = None,
+    must_persist: bool = True,
+) -> Tuple[int, RiskAnalysisResponse]:
+    """
+    (data_version, report), persisted before returning. Uses its own
+    sessions, so it can also run after the response or from the scheduler;
+    `throttle` is awaited before the narrative completion. With
+    must_persist=False a failed write is logged and the report still returned.
+    """
+    def load():
+        with Session(bind=bind) as session:
+            return _local_analysis(session, project_id)
+
+    def persist(version: int, report: RiskAnalysisResponse):
+        try:
+            with Session(bind=bind) as session:
+                save_report(session, project_id, mode, version,
+                            report.model_dump(mode="json"), report.generated_at)
+        except SQLAlchemyError:
+            if must_persist:
+                raise
+            logger.exception("Could not store risk report for project %s", project_id)
+        return version, report
+
+    # 1) Exact metrics (sync SQLAlchemy → off the event loop)
+    project_title, version, metrics = await run_in_threadpool(load)
+    generated_at = datetime.now(timezone.utc)
+
+    if metrics.open_tasks == 0:
+        return await run_in_threadpool(persist, version, RiskAnalysisResponse(
+            project_title=project_title,
             total_risks=0,
             risk_alerts=[],
-            summary="All tasks are complete—no current risks detected."
-        )
-
-
-    # Create AI prompt for risk analysis with clear instructions about completed tasks
-    prompt = f"""
-You are a senior project management risk analyst. Analyze the following project data and identify potential risks.
-
-Project: {project.title}
-Current Date: {current_date.strftime('%Y-%m-%d')}
-
-Tasks Data:
-{json.dumps([task.dict() for task in task_data], indent=2)}
-
-IMPORTANT RULES:
-- NEVER flag tasks with status "Done" as overdue, regardless of their due date
-- Only consider tasks overdue if they have a due date in the past AND status is NOT "Done"
-- Tasks with status "Done" are completed and should not be flagged for any time-related risks
-
-Analyze and return a JSON response with the following structure:
-{{
-    "risk_alerts": [
-        {{
-            "risk_type": "string (e.g., 'Overdue Tasks', 'Resource Overload', 'Missing Assignments')",
-            "severity": "string (High/Medium/Low)",
-            "description": "string (detailed description of the risk)",
-            "affected_items": ["array of affected task titles or team member names"],
-            "recommendations": ["array of specific actionable recommendations"]
-        }}
-    ],
-    "summary": "string (2-3 sentence overall project risk assessment)"
-}}
-
-Focus on these risk categories:
-1. Overdue tasks (tasks past due date AND NOT completed)
-2. High priority tasks without assignees
-3. Team members with too many assigned tasks
-4. Tasks stuck in "In Progress" for too long
-5. Missing or unclear task priorities
-6. Potential bottlenecks and dependencies
-
-Return ONLY the JSON response.
-    """
+            summary="All tasks are complete—no current risks detected.",
+            data_version=version,
+            generated_at=generated_at,
+        ))
 
-    try:
-        completion = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,  # Lower temperature for more consistent analysis
-            max_tokens=1000,
-        )
-        raw_response = completion.choices[0].message.content
-        logger.info("OpenAI risk analysis raw output:\n%s", raw_response)
-    except OpenAIError as e:
-        logger.error("OpenAIError in analyze_risks: %s", e, exc_info=True)
-        raise HTTPException(status.HTTP_502_BAD_GATEWAY, f"OpenAI error: {e}")
+    # 2) Rules → alerts
+    alerts  = build_alerts(metrics)
+    summary = local_summary(metrics, alerts)
+    source  = "local"
+
+    # 3) Optional narrative from the model
+    if mode == "auto" and alerts:
+        try:
+            if throttle is not None:
+                await throttle.acquire()
+            summary = await _narrate(project_title, metrics, alerts)
+            source  = "llm"
+        except (OpenAIError, ValueError, AttributeError) as e:
+            logger.warning("Risk narrative unavailable, using local summary: %s", e)
+
+    return await run_in_threadpool(persist, version, RiskAnalysisResponse(
+        project_title=project_title,
+        total_risks=len(alerts),
+        risk_alerts=[RiskAlert(**a) for a in alerts],
+        summary=summary,
+        summary_source=source,
+        metrics=metrics.as_dict(),
+        data_version=version,
+        generated_at=generated_at,
+    ))
 
-    # Clean and parse JSON response
-    cleaned = re.sub(r"^```(?:json)?\s*", "", raw_response.strip(), flags=re.IGNORECASE)
-    cleaned = re.sub(r"\s*```$", "", cleaned).strip()
 
-    try:
-        parsed_response = json.loads(cleaned)
-    except json.JSONDecodeError as e:
-        logger.error("Failed to parse AI response as JSON: %s", e)
-        raise HTTPException(status.HTTP_502_BAD_GATEWAY, "Invalid JSON response from AI")
-
-    # Validate and structure the response
-    risk_alerts = []
-    for alert_data in parsed_response.get("risk_alerts", []):
-        risk_alert = RiskAlert(
-            risk_type=alert_data.get("risk_type", "Unknown Risk"),
-            severity=alert_data.get("severity", "Medium"),
-            description=alert_data.get("description", "No description provided"),
-            affected_items=alert_data.get("affected_items", []),
-            recommendations=alert_data.get("recommendations", [])
-        )
-        risk_alerts.append(risk_alert)
-
-    return RiskAnalysisResponse(
-        project_title=project.title,
-        total_risks=len(risk_alerts),
-        risk_alerts=risk_alerts,
-        summary=parsed_response.get("summary", "Risk analysis completed.")
-    )
+@router.post("/analyze_risks", response_model=RiskAnalysisResponse)
+async def analyze_project_risks(
+    body: RiskAnalysisRequest,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    version = await run_in_threadpool(_project_version, db, body.project_id)
+    key     = (body.project_id, body.mode)
+    bind    = db.get_bind()
+
+    def compute():
+        # the user gets the report even if storing it fails
+        return build_risk_report(bind, body.project_id, body.mode, must_persist=False)
+
+    entry, state = (None, "miss") if body.refresh else risk_cache.lookup(key, version)
+    if state == "miss" and not body.refresh:
+        # precomputed by the scheduler (or another worker) → seed this one
+        stored = await run_in_threadpool(_stored_report, db, body.project_id, body.mode)
+        if stored is not None:
+            stored_version, report, age = stored
+            risk_cache.store(key, stored_version, report, age=age)
+            entry, state = risk_cache.lookup(key, version)
+    response.headers["X-Risk-Cache"] = state
+    if entry is not None:
+        if state == "stale" and risk_cache.claim_refresh(key):
+            background_tasks.add_task(risk_cache.refresh, key, compute)
+        return entry.report.model_copy(update={"stale": state == "stale"})
+    return await risk_cache.compute(key, compute)
@@ -0,0 +1,80 @@
+# services/ai_service/streaming.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Helpers for streamed completions.
+#   • JsonListParser – incremental parser for a JSON list of strings arriving
+#     in arbitrary token-sized pieces. Every finished string is returned as
+#     soon as its closing quote arrives. Markdown fences, prose before the
+#     list and a {"subtasks": [...]} wrapper are skipped, like the
+#     non-streaming route does.
+#   • sse() – one server-sent event frame
+# ──────────────────────────────────────────────────────────────────────────────
+import json
+from typing import List, Optional
+
+
+class StreamFormatError(ValueError):
+    pass
+
+
+class JsonListParser:
+    def __init__(self, limit: Optional[int] = None):
+        self.limit  = limit          # stop after this many items
+        self.items: List[str] = []
+        self.done   = False
+        self._started = False        # inside the top-level list
+        self._string: Optional[List[str]] = None
+        self._escape  = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume `chunk`; return the strings it completed (in order)."""
+        out: List[str] = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                continue
+
+            if self._string is not None:          # inside "…"
+                self._string.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    raw = '"' + "".join(self._string)
+                    self._string = None
+                    try:
+                        item = json.loads(raw).strip()
+                    except json.JSONDecodeError:
+                        raise StreamFormatError("Invalid JSON from model")
+                    self.items.append(item)
+                    out.append(item)
+                    if self.limit is not None and len(self.items) >= self.limit:
+                        self.done = True
+                continue
+
+            if ch == '"':
+                self._string = []
+            elif ch == "]":
+                self.done = True
+            elif ch in " \t\r\n,":
+                continue
+            else:
+                raise StreamFormatError("All subtasks must be strings")
+        return out
+
+    def finish(self) -> None:
+        """
+        Call at end of stream – raises unless the list closed (or reached
+        `limit`): a truncated completion must not pass for a short list.
+        """
+        if not self._started:
+            raise StreamFormatError("Expected a JSON list or {subtasks: [...] }")
+        if not self.done:
+            raise StreamFormatError("Invalid JSON from model")
+
+
+def sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,111 @@
+# services/ai_service/stub_openai.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Local OpenAI stand-in: a tiny ASGI app speaking POST /v1/chat/completions.
+# The real AsyncOpenAI SDK talks to it, so HTTP status handling, Retry-After,
+# timeouts and retries are exercised end to end.
+#   • tests: stub = StubOpenAI(); stub.reply(status=429, headers={...});
+#            stub.reply('["a"]'); client = stub.client()   # in-process ASGI
+#   • dev:   uvicorn services.ai_service.stub_openai:app --port 8099
+#            OPENAI_BASE_URL=http://localhost:8099/v1
+# Scripted replies are served in order; then `default` is used. With
+# "stream": true the content goes out as chat.completion.chunk SSE frames of
+# `chunk_size` characters.
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from openai import AsyncOpenAI
+
+# parses as subtasks ({"subtasks": [...]}) and as a risk report alike
+DEFAULT_CONTENT = json.dumps({
+    "subtasks":    ["Outline the work", "Implement it", "Test it"],
+    "risk_alerts": [],
+    "summary":     "Stub analysis – no risks.",
+})
+
+
+@dataclass
+class StubReply:
+    content: str = DEFAULT_CONTENT
+    status:  int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    delay:   float = 0.0
+    chunk_size: int = 4
+
+
+class StubOpenAI:
+    def __init__(self, default: Optional[StubReply] = None):
+        self.default = default or StubReply()
+        self.script: Deque[StubReply] = deque()
+        self.requests: List[dict] = []
+        self.app = FastAPI(title="OpenAI stub")
+        self.app.post("/v1/chat/completions")(self._completions)
+
+    def reply(self, content: str = DEFAULT_CONTENT, status: int = 200,
+              headers: Optional[Dict[str, str]] = None, delay: float = 0.0,
+              times: int = 1, chunk_size: int = 4) -> "StubOpenAI":
+        for _ in range(times):
+            self.script.append(StubReply(content, status, dict(headers or {}), delay, chunk_size))
+        return self
+
+    def client(self, **kwargs) -> AsyncOpenAI:
+        """AsyncOpenAI wired straight into this app – no port, no network."""
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.app),
+                                 base_url="http://openai-stub")
+        return AsyncOpenAI(api_key="stub", base_url="http://openai-stub/v1",
+                           http_client=http, max_retries=0, **kwargs)
+
+    async def _completions(self, request: Request):
+        body = await request.json()
+        self.requests.append(body)
+        r = self.script.popleft() if self.script else self.default
+        if r.delay:
+            await asyncio.sleep(r.delay)
+        if r.status != 200:
+            return JSONResponse(
+                {"error": {"message": f"stub error {r.status}", "type": "stub", "code": None}},
+                status_code=r.status, headers=r.headers,
+            )
+        if body.get("stream"):
+            return StreamingResponse(self._chunks(body, r), media_type="text/event-stream",
+                                     headers=r.headers)
+        return JSONResponse({
+            "id":      f"chatcmpl-stub-{len(self.requests)}",
+            "object":  "chat.completion",
+            "created": int(time.time()),
+            "model":   body.get("model", "stub"),
+            "choices": [{
+                "index":         0,
+                "message":       {"role": "assistant", "content": r.content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }, headers=r.headers)
+
+    async def _chunks(self, body: dict, r: StubReply):
+        base = {
+            "id":      f"chatcmpl-stub-{len(self.requests)}",
+            "object":  "chat.completion.chunk",
+            "created": int(time.time()),
+            "model":   body.get("model", "stub"),
+        }
+        pieces = [r.content[i:i + r.chunk_size] for i in range(0, len(r.content), r.chunk_size)]
+        for i, piece in enumerate(pieces):
+            delta = {"content": piece} if i else {"role": "assistant", "content": piece}
+            chunk = {**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(0)
+        done = {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        yield f"data: {json.dumps(done)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+stub = StubOpenAI()
+app  = stub.app
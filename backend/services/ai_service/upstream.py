@@ -0,0 +1,226 @@
+# services/ai_service/upstream.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Guarded calls to the OpenAI API (AsyncOpenAI – no threadpool worker is held
+# while a completion is generated).
+#   • concurrency cap: at most AI_MAX_CONCURRENCY completions in flight per
+#     process; the rest wait up to AI_QUEUE_TIMEOUT, then get UpstreamBusy
+#     (→ 503) instead of piling up
+#   • deadline: one call – every attempt and backoff included – may take at
+#     most AI_CALL_DEADLINE seconds (→ 504)
+#   • retries: 429 / 408 / 409 / 5xx, timeouts and connection errors are
+#     retried up to AI_MAX_RETRIES times with jittered exponential backoff,
+#     honouring Retry-After; the SDK's own retries are switched off so this
+#     is the only loop
+#   • stream() does the same for streamed completions, holding the slot
+#     until the last chunk
+#   • metrics: queue wait, upstream latency by outcome, retries, in-flight
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    OpenAIError,
+)
+
+from common import metrics
+from common.config import settings
+
+QUEUE_WAIT = metrics.histogram(
+    "ai_upstream_queue_seconds", "Time a completion waited for a concurrency slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+LATENCY = metrics.histogram(
+    "ai_upstream_seconds", "OpenAI call duration incl. retries", ["outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60),
+)
+RETRIES = metrics.counter(
+    "ai_upstream_retries_total", "Retried OpenAI attempts", ["reason"],
+)
+REJECTED = metrics.counter(
+    "ai_upstream_rejected_total", "Completions refused after waiting too long for a slot",
+)
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class UpstreamBusy(OpenAIError):
+    """No concurrency slot freed up within the queue timeout."""
+
+
+class UpstreamDeadline(OpenAIError):
+    """The call (all attempts) ran past its deadline."""
+
+
+def make_client(api_key: Optional[str], **kwargs) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=settings.OPENAI_BASE_URL or None,
+        max_retries=0,                         # Upstream.create owns retries
+        **kwargs,
+    )
+
+
+def _retry_reason(e: Exception) -> Optional[str]:
+    if isinstance(e, APITimeoutError):          # before APIConnectionError (subclass)
+        return "timeout"
+    if isinstance(e, APIConnectionError):
+        return "connection"
+    if isinstance(e, APIStatusError):
+        if e.status_code in RETRYABLE_STATUS or e.status_code >= 500:
+            return str(e.status_code)
+    return None
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    response = getattr(e, "response", None)
+    if response is None:
+        return None
+    try:
+        return max(0.0, float(response.headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class Upstream:
+    def __init__(self, max_concurrency: int = 8, queue_timeout: float = 10.0,
+                 deadline: float = 30.0, max_retries: int = 2,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 sleep: Callable = asyncio.sleep, clock: Callable[[], float] = time.monotonic):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout   = queue_timeout
+        self.deadline        = deadline
+        self.max_retries     = max_retries
+        self.backoff_base    = backoff_base
+        self.backoff_max     = backoff_max
+        self._sleep          = sleep
+        self._clock          = clock
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._loop           = None
+        self.waiting         = 0
+        self.active          = 0
+
+    @classmethod
+    def from_settings(cls) -> "Upstream":
+        return cls(
+            max_concurrency = settings.AI_MAX_CONCURRENCY,
+            queue_timeout   = settings.AI_QUEUE_TIMEOUT,
+            deadline        = settings.AI_CALL_DEADLINE,
+            max_retries     = settings.AI_MAX_RETRIES,
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # one per event loop (a worker has exactly one; tests spin up several)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._sem = loop, asyncio.Semaphore(self.max_concurrency)
+        return self._sem
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform(0, min(max, base · 2^attempt))."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    # ───────────── the call ─────────────
+    @asynccontextmanager
+    async def _slot(self):
+        """Hold one concurrency slot; yields the call's deadline (clock time)."""
+        sem    = self._semaphore()
+        queued = self._clock()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(sem.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            REJECTED.inc()
+            raise UpstreamBusy(f"no upstream slot within {self.queue_timeout:g}s")
+        finally:
+            self.waiting -= 1
+        QUEUE_WAIT.observe(self._clock() - queued)
+
+        self.active += 1
+        started = self._clock()
+        outcome = "error"
+        try:
+            yield started + self.deadline
+            outcome = "ok"
+        except UpstreamDeadline:
+            outcome = "deadline"
+            raise
+        except GeneratorExit:
+            outcome = "ok"                     # a stream's reader stopped early
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self.active -= 1
+            sem.release()
+            LATENCY.observe(self._clock() - started, outcome=outcome)
+
+    async def create(self, client: AsyncOpenAI, **kwargs):
+        """`client.chat.completions.create(**kwargs)` under the limits above."""
+        async with self._slot() as deadline_at:
+            return await self._attempts(client, kwargs, deadline_at)
+
+    async def stream(self, client: AsyncOpenAI, **kwargs) -> AsyncIterator[str]:
+        """
+        Streamed completion, yielding content deltas. Opening the stream is
+        retried like create(); once tokens flow, failures propagate (the
+        caller has already forwarded part of the answer). The slot is held
+        and the deadline applies until the last chunk.
+        """
+        async with self._slot() as deadline_at:
+            chunks = await self._attempts(client, {**kwargs, "stream": True}, deadline_at)
+            iterator = chunks.__aiter__()
+            try:
+                while True:
+                    remaining = deadline_at - self._clock()
+                    if remaining <= 0:
+                        raise UpstreamDeadline(f"OpenAI call exceeded {self.deadline:g}s")
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        return
+                    except asyncio.TimeoutError:
+                        raise UpstreamDeadline(f"OpenAI call exceeded {self.deadline:g}s")
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                close = getattr(chunks, "close", None)      # free the HTTP connection
+                if close is not None:
+                    await close()
+
+    async def _attempts(self, client: AsyncOpenAI, kwargs: dict, deadline_at: float):
+        attempt = 0
+        while True:
+            remaining = deadline_at - self._clock()
+            if remaining <= 0:
+                raise UpstreamDeadline(f"OpenAI call exceeded {self.deadline:g}s")
+            try:
+                return await asyncio.wait_for(client.chat.completions.create(**kwargs), remaining)
+            except asyncio.TimeoutError:
+                raise UpstreamDeadline(f"OpenAI call exceeded {self.deadline:g}s")
+            except OpenAIError as e:
+                reason = _retry_reason(e)
+                if reason is None or attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e)
+                delay = self.backoff(attempt) if delay is None else delay
+                if self._clock() + delay >= deadline_at:
+                    raise
+                RETRIES.inc(reason=reason)
+                attempt += 1
+                await self._sleep(delay)
+
+
+upstream = Upstream.from_settings()
+
+metrics.gauge("ai_upstream_in_flight", "OpenAI calls currently running",
+              fn=lambda: upstream.active)
+metrics.gauge("ai_upstream_waiting", "OpenAI calls waiting for a concurrency slot",
+              fn=lambda: upstream.waiting)
@@ -5,6 +5,10 @@ from services.analytics_service.routers.dashboard       import router as dashboa
 from services.analytics_service.routers.project_summary import router as proj_router
 from services.analytics_service.routers import export    # (if you already have this)
 from common.auth0_docs import wire_auth0_docs
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
+from common.config import settings
+from common.query_stats import QueryStatsMiddleware
 
 app = FastAPI(title="Analytics Service")
 wire_auth0_docs(app, port=8003)
@@ -22,12 +26,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware, headers=settings.QUERY_STATS_HEADERS)
+instrument_app(app)
 
 # ─── ROUTERS ───
 # All analytics URLs live under /api/analytics/…
 app.include_router(dashboard_router, prefix="/api/analytics", tags=["dashboard"])
 app.include_router(proj_router,      prefix="/api/analytics", tags=["project_summary"])
 app.include_router(export.router,    prefix="/api/analytics", tags=["export"])
+app.include_router(metrics_router)
 
 @app.get("/healthz")
 def health():
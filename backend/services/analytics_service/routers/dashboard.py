@@ -5,7 +5,7 @@ from sqlalchemy import or_, func
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
-from common.database import get_db
+from common.database import get_read_db
 from common.security.dependencies import get_current_user
 from common.models.user import User
 from common.models.project import Project
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
 def get_summary(
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     # Unpack the single-column query into ints directly
@@ -68,7 +68,7 @@ def get_summary(
 @router.get("/tasks/monthly")
 def tasks_monthly(
         months: int = Query(6, ge=1, le=24),
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     proj_ids = [
@@ -111,7 +111,7 @@ def tasks_monthly(
 @router.get("/projects/cumulative")
 def projects_cumulative(
         months: int = Query(6, ge=1, le=24),
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     proj_ids = [
@@ -10,14 +10,16 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from common.database import get_db
+from common.database import get_read_db
 from common.security.dependencies import get_current_user
 from common.models.user import User
 from common.models.project import Project
 from common.models.project_member import ProjectMember
 
 # reuse the existing summaries instead of re-implementing queries
-from services.analytics_service.routers.project_summary import get_project_summary
+from services.analytics_service.routers.project_summary import (
+    get_project_summary, project_summaries,
+)
 from services.analytics_service.routers.dashboard import get_summary
 
 router = APIRouter(prefix="/export", tags=["export"])
@@ -42,7 +44,7 @@ def export_analytics(
     file_format: Literal["csv", "xlsx", "json"] = Query(
         "csv", description="Export format"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -71,19 +73,18 @@ def export_analytics(
     # 1) Collect the data
     # ------------------------------------------------------------------ #
     if export_type == "dashboard" and by_project:
-        # a) find all project IDs the user owns or is a member of
+        # a) all projects the user owns or is a member of
         owned_q  = db.query(Project.id).filter(Project.owner_id == current_user.id)
         member_q = db.query(ProjectMember.project_id).filter(ProjectMember.user_id == current_user.id)
-        project_ids = [pid for (pid,) in owned_q.union(member_q).all()]
-
-        # b) build one summary row per project
-        rows: list[dict] = []
-        for pid in project_ids:
-            rows.append(
-                get_project_summary(
-                    project_id=pid, db=db, current_user=current_user
-                )
-            )
+        projects = (
+            db.query(Project)
+              .filter(Project.id.in_(owned_q.union(member_q)))
+              .order_by(Project.id)
+              .all()
+        )
+
+        # b) one summary row per project – grouped queries, not one summary each
+        rows = project_summaries(db, projects)
         df = pd.DataFrame(rows)
         filename_base = f"projects-{current_user.id}"
 
@@ -1,12 +1,14 @@
 # services/analytics_service/routers/project_summary.py
+from collections import defaultdict
 from datetime import datetime
+from typing import List
 
 from dateutil.relativedelta import relativedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from common.database import get_db
+from common.database import get_read_db
 from common.models.big_task import BigTask as BigTaskModel
 from common.models.project import Project
 from common.models.project_member import ProjectMember
@@ -50,65 +52,76 @@ def _require_project_access(
 
 
 # ──────────────────────────── summary card data ────────────────────────────
-@router.get("/{project_id}/summary")
-def get_project_summary(
-    project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    project = _require_project_access(project_id, db, current_user)
+def project_summaries(db: Session, projects: List[Project]) -> List[dict]:
+    """
+    Summary rows for many projects with one grouped query per figure –
+    the per-project export uses this instead of one summary per project.
+    """
+    ids = [p.id for p in projects]
+    if not ids:
+        return []
 
     # 1️⃣  TASK COUNTS --------------------------------------------------------
-    status_counts = dict(
-        db.query(Task.status, func.count(Task.id))
-        .filter(Task.project_id == project_id)
-        .group_by(Task.status)
-        .all()
-    )
-    total_tasks = sum(status_counts.values())
-    done_tasks = status_counts.get("Done", 0)
-
-    todo_tasks = status_counts.get("To Do", 0)
-    in_progress_tasks = status_counts.get("In Progress", 0)
-    review_tasks = status_counts.get("Review", 0)
-
-    overdue_tasks = (
-        db.query(func.count(Task.id))
+    status_counts = defaultdict(dict)
+    for pid, task_status, n in (
+        db.query(Task.project_id, Task.status, func.count(Task.id))
+        .filter(Task.project_id.in_(ids))
+        .group_by(Task.project_id, Task.status)
+    ):
+        status_counts[pid][task_status] = n
+
+    overdue = dict(
+        db.query(Task.project_id, func.count(Task.id))
         .filter(
-            Task.project_id == project_id,
+            Task.project_id.in_(ids),
             Task.due_date.isnot(None),
             Task.due_date < datetime.utcnow(),
             Task.status != "Done",
         )
-        .scalar()
+        .group_by(Task.project_id)
+        .all()
     )
 
-    progress_pct = round((done_tasks / total_tasks) * 100, 2) if total_tasks else 0
-
     # 2️⃣  EPIC / BIG-TASK COUNTS -------------------------------------------
-    epic_counts = dict(
-        db.query(BigTaskModel.status, func.count(BigTaskModel.id))
-        .filter(BigTaskModel.project_id == project_id)
-        .group_by(BigTaskModel.status)
-        .all()
-    )
-    total_big_tasks = sum(epic_counts.values())
-    done_big_tasks = epic_counts.get("Done", 0)
+    epic_counts = defaultdict(dict)
+    for pid, epic_status, n in (
+        db.query(BigTaskModel.project_id, BigTaskModel.status, func.count(BigTaskModel.id))
+        .filter(BigTaskModel.project_id.in_(ids))
+        .group_by(BigTaskModel.project_id, BigTaskModel.status)
+    ):
+        epic_counts[pid][epic_status] = n
 
     # 3️⃣  RESPONSE ----------------------------------------------------------
-    return {
-        "project_id": project.id,
-        "project_title": project.title,
-        "total_tasks": total_tasks,
-        "todo_tasks": todo_tasks,
-        "in_progress_tasks": in_progress_tasks,
-        "review_tasks": review_tasks,
-        "done_tasks": done_tasks,
-        "overdue_tasks": overdue_tasks,
-        "progress_percentage": progress_pct,
-        "total_big_tasks": total_big_tasks,
-        "done_big_tasks": done_big_tasks,
-    }
+    rows = []
+    for project in projects:
+        tasks = status_counts[project.id]
+        epics = epic_counts[project.id]
+        total_tasks = sum(tasks.values())
+        done_tasks  = tasks.get("Done", 0)
+        rows.append({
+            "project_id": project.id,
+            "project_title": project.title,
+            "total_tasks": total_tasks,
+            "todo_tasks": tasks.get("To Do", 0),
+            "in_progress_tasks": tasks.get("In Progress", 0),
+            "review_tasks": tasks.get("Review", 0),
+            "done_tasks": done_tasks,
+            "overdue_tasks": overdue.get(project.id, 0),
+            "progress_percentage": round((done_tasks / total_tasks) * 100, 2) if total_tasks else 0,
+            "total_big_tasks": sum(epics.values()),
+            "done_big_tasks": epics.get("Done", 0),
+        })
+    return rows
+
+
+@router.get("/{project_id}/summary")
+def get_project_summary(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    project = _require_project_access(project_id, db, current_user)
+    return project_summaries(db, [project])[0]
 
 
 # ──────────────────────────── monthly chart data ───────────────────────────
@@ -116,7 +129,7 @@ def get_project_summary(
 def project_tasks_monthly(
     project_id: int,
     months: int = Query(6, ge=1, le=24),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -1,23 +1,80 @@
 # notification_service/events.py
+#
+# Notification helpers never commit: they add the Notification row and its
+# realtime push (an outbox event, see common/outbox.py) to the caller's
+# session, and the caller's single commit persists both.
 
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from common.models.notification import Notification
-from common.realtime           import push_message
+from common.outbox             import enqueue_message
 from common.models.user        import User
 
+
+def count_unread(db: Session, user_id: int) -> int:
+    """Unread badge value – served by the partial index on unread rows."""
+    return (
+        db.query(func.count(Notification.id))
+          .filter(Notification.user_id == user_id, Notification.read.is_(False))
+          .scalar()
+    )
+
+
+def push_unread(db: Session, user: User, read_ids: Iterable[int] = ()):
+    """
+    Push the fresh unread count after notifications were marked read, so
+    every open tab updates its bell without polling. Call before committing
+    the update.
+    """
+    enqueue_message(
+        db, user.auth0_id,
+        {"type": "unread", "unread": count_unread(db, user.id), "read_ids": list(read_ids)}
+    )
+
+
 def _notify(db: Session, user: User, message: str):
     """
-    1) Write a Notification row for the given user.
-    2) Push real-time over the gateway.
+    1) Add a Notification row for the given user.
+    2) Queue its real-time push together with the new unread count
+       (clients keep `id` as their `since` cursor for /sync).
+    Both are committed by the caller, in one transaction.
     """
-    notification = Notification(user_id=user.id, message=message)
-    db.add(notification)
-    db.commit()
+    _notify_many(db, [(user, message)])
 
-    push_message(
-        user.auth0_id,
-        {"type": "notification", "message": message}
+def _notify_many(db: Session, notes: List[Tuple[User, str]]):
+    """
+    `_notify` for a batch (fan-outs, bulk writes, scheduler sweeps): one
+    flush for all rows and one grouped unread count instead of a flush and
+    a COUNT per notification.
+    """
+    if not notes:
+        return
+    rows = [Notification(user_id=user.id, message=message) for user, message in notes]
+    db.add_all(rows)
+    db.flush()
+
+    unread = dict(
+        db.query(Notification.user_id, func.count(Notification.id))
+          .filter(Notification.user_id.in_({user.id for user, _ in notes}),
+                  Notification.read.is_(False))
+          .group_by(Notification.user_id)
+          .all()
     )
+    later = Counter(user.id for user, _ in notes)      # this batch's rows still to come
+    for (user, message), row in zip(notes, rows):
+        later[user.id] -= 1
+        enqueue_message(
+            db, user.auth0_id,
+            {
+                "type":    "notification",
+                "id":      row.id,
+                "message": message,
+                "unread":  unread.get(user.id, 0) - later[user.id],
+            }
+        )
 
 def added_to_project(db: Session, project, added_user: User, by_user: User):
     _notify(
@@ -31,32 +88,45 @@ def added_to_big_task(db: Session, big_task, added_user: User):
         f"You were added to big task “{big_task.title}”"
     )
 
+def _assigned_message(task) -> str:
+    return f"You were assigned a new task: “{task.title}”"
+
 def task_assigned(db: Session, task, assignee: User):
-    _notify(
-        db, assignee,
-        f"You were assigned a new task: “{task.title}”"
-    )
+    _notify(db, assignee, _assigned_message(task))
+
+def tasks_assigned(db: Session, assignments: Iterable[Tuple[object, User]]):
+    """task_assigned for many (task, assignee) pairs at once."""
+    _notify_many(db, [(user, _assigned_message(task)) for task, user in assignments])
 
 def comment_added(db: Session, task, commenter: User):
     targets = {task.reporter_id}
     if task.assignee_id:
         targets.add(task.assignee_id)
     targets.discard(commenter.id)
+    if not targets:
+        return
 
-    for uid in targets:
-        user = db.query(User).filter(User.id == uid).one()
-        _notify(
-            db, user,
-            f"New comment on task “{task.title}” by {commenter.username}"
-        )
+    # one IN query instead of one lookup per recipient
+    message = f"New comment on task “{task.title}” by {commenter.username}"
+    _notify_many(db, [(user, message) for user in db.query(User).filter(User.id.in_(targets))])
+
+def _status_text(status) -> str:
+    # before the commit `task.status` may still be the request's TaskStatus
+    # member, whose f-string is "TaskStatus.DONE" on Python 3.11+
+    return getattr(status, "value", status)
+
+def _status_message(task, old_status: str) -> str:
+    return (f"Your task “{task.title}” status changed from "
+            f"{_status_text(old_status)} to {_status_text(task.status)}")
 
 def task_status_changed(db: Session, task, old_status: str):
     if task.assignee_id:
         user = db.query(User).filter(User.id == task.assignee_id).one()
-        _notify(
-            db, user,
-            f"Your task “{task.title}” status changed from {old_status} to {task.status}"
-        )
+        _notify(db, user, _status_message(task, old_status))
+
+def tasks_status_changed(db: Session, changes: Iterable[Tuple[object, str, User]]):
+    """task_status_changed for many (task, old_status, assignee) at once."""
+    _notify_many(db, [(user, _status_message(task, old)) for task, old, user in changes])
 
 def project_due_soon(db: Session, project):
     """
@@ -67,29 +137,33 @@ def project_due_soon(db: Session, project):
     user_ids = {m.user_id for m in project.members}
     user_ids.add(project.owner_id)
 
-    for uid in user_ids:
-        # skip if we've already sent this exact reminder
-        exists = (
-            db.query(Notification)
+    # skip anyone who already got this exact reminder – one query for all
+    already = {
+        uid for (uid,) in (
+            db.query(Notification.user_id)
               .filter(
-                  Notification.user_id == uid,
+                  Notification.user_id.in_(user_ids),
                   Notification.message == message
               )
-              .first()
-        )
-        if exists:
-            continue
-
-        user = db.query(User).filter(User.id == uid).one()
-        _notify(db, user, message)
-
-def task_overdue(db: Session, task):
-    if task.assignee_id:
-        user = db.query(User).filter(User.id == task.assignee_id).one()
-        _notify(
-            db, user,
-            f"Your task “{task.title}” is overdue!"
+              .distinct()
         )
+    }
+    pending = user_ids - already
+    if not pending:
+        return
+
+    _notify_many(db, [(user, message) for user in db.query(User).filter(User.id.in_(pending))])
+
+def _overdue_message(task) -> str:
+    return f"Your task “{task.title}” is overdue!"
+
+def tasks_overdue(db: Session, tasks: Iterable):
+    """Overdue reminders for a whole sweep – assignees in one IN query."""
+    tasks = [t for t in tasks if t.assignee_id]
+    if not tasks:
+        return
+    users = {u.id: u for u in db.query(User).filter(User.id.in_({t.assignee_id for t in tasks}))}
+    _notify_many(db, [(users[t.assignee_id], _overdue_message(t)) for t in tasks])
 
 def promoted_role(db: Session, project, user: User):
     _notify(
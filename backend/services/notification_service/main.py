@@ -1,6 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from common.auth0_docs import wire_auth0_docs
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
+from common.config import settings
+from common.db_routing import LAST_WRITE_HEADER, WriteStampMiddleware
+from common.query_stats import QueryStatsMiddleware
 from services.notification_service.routers.notifications import router as note_router
 
 app = FastAPI(title="Notification Service")
@@ -19,9 +24,14 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # Add both dev and prod
     allow_credentials=True, allow_methods=["*"], allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],    # read-your-writes stamp
 )
+app.add_middleware(QueryStatsMiddleware, headers=settings.QUERY_STATS_HEADERS)
+app.add_middleware(WriteStampMiddleware)
+instrument_app(app)
 
 app.include_router(note_router)
+app.include_router(metrics_router)
 
 @app.get("/healthz")
 def health():
@@ -0,0 +1,178 @@
+# notification_service/retention.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Notification retention.
+#   • read rows older than READ_TTL and any row older than UNREAD_TTL leave
+#     the inbox – moved to notifications_archive (or deleted)
+#   • archive rows older than ARCHIVE_TTL are purged
+#   • work happens in id-ordered batches, one short transaction each, so
+#     row locks are held for milliseconds and inbox writes keep flowing
+#   • when `notifications` is range-partitioned by month (Postgres, see
+#     migration d7a2b9e4f310) future partitions are created ahead of time
+# Run from the scheduler: services/scheduler_service/jobs.py
+# ──────────────────────────────────────────────────────────────────────────────
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, insert, literal, or_, select, text
+from sqlalchemy.orm import Session
+
+from common import metrics
+from common.config import settings
+from common.models.notification import Notification, NotificationArchive
+
+ARCHIVED = metrics.counter(
+    "notifications_archived_total", "Notifications moved to the archive",
+)
+DELETED = metrics.counter(
+    "notifications_deleted_total", "Notification rows deleted by retention",
+    ["table"],
+)
+
+PARTITIONS_AHEAD = 2          # months of partitions kept ready
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    read_ttl_days:    int  = 30
+    unread_ttl_days:  int  = 180
+    archive:          bool = True
+    archive_ttl_days: int  = 365
+    batch_size:       int  = 1000
+    max_batches:      int  = 500      # per run – bounds a single job's runtime
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        return cls(
+            read_ttl_days    = settings.NOTIFICATION_READ_TTL_DAYS,
+            unread_ttl_days  = settings.NOTIFICATION_UNREAD_TTL_DAYS,
+            archive          = settings.NOTIFICATION_ARCHIVE,
+            archive_ttl_days = settings.NOTIFICATION_ARCHIVE_TTL_DAYS,
+            batch_size       = settings.NOTIFICATION_RETENTION_BATCH,
+            max_batches      = settings.NOTIFICATION_RETENTION_MAX_BATCHES,
+        )
+
+
+def _expired(policy: RetentionPolicy, now: datetime):
+    return or_(
+        and_(
+            Notification.read.is_(True),
+            Notification.created_at < now - timedelta(days=policy.read_ttl_days),
+        ),
+        Notification.created_at < now - timedelta(days=policy.unread_ttl_days),
+    )
+
+
+def _expire_batch(db: Session, policy: RetentionPolicy, now: datetime) -> int:
+    ids = db.execute(
+        select(Notification.id)
+        .where(_expired(policy, now))
+        .order_by(Notification.id)
+        .limit(policy.batch_size)
+    ).scalars().all()
+    if not ids:
+        return 0
+
+    if policy.archive:
+        cols = [Notification.id, Notification.user_id, Notification.message,
+                Notification.read, Notification.created_at]
+        db.execute(
+            insert(NotificationArchive).from_select(
+                ["id", "user_id", "message", "read", "created_at", "archived_at"],
+                select(*cols, literal(now, NotificationArchive.archived_at.type))
+                .where(Notification.id.in_(ids)),
+            )
+        )
+    db.execute(
+        delete(Notification)
+        .where(Notification.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return len(ids)
+
+
+def _purge_archive_batch(db: Session, policy: RetentionPolicy, now: datetime) -> int:
+    cutoff = now - timedelta(days=policy.archive_ttl_days)
+    ids = db.execute(
+        select(NotificationArchive.id)
+        .where(NotificationArchive.archived_at < cutoff)
+        .order_by(NotificationArchive.id)
+        .limit(policy.batch_size)
+    ).scalars().all()
+    if not ids:
+        return 0
+    db.execute(
+        delete(NotificationArchive)
+        .where(NotificationArchive.id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return len(ids)
+
+
+def run_retention(db: Session, policy: Optional[RetentionPolicy] = None,
+                  now: Optional[datetime] = None) -> dict:
+    """
+    One retention pass. Returns {"expired": n, "purged": m}.
+    """
+    policy = policy or RetentionPolicy.from_settings()
+    now    = now or datetime.now(timezone.utc)      # created_at is timestamptz
+
+    expired = 0
+    for _ in range(policy.max_batches):
+        n = _expire_batch(db, policy, now)
+        expired += n
+        if n < policy.batch_size:
+            break
+
+    purged = 0
+    if policy.archive:
+        for _ in range(policy.max_batches):
+            n = _purge_archive_batch(db, policy, now)
+            purged += n
+            if n < policy.batch_size:
+                break
+
+    if policy.archive:
+        ARCHIVED.inc(expired)
+    else:
+        DELETED.inc(expired, table="notifications")
+    DELETED.inc(purged, table="notifications_archive")
+    return {"expired": expired, "purged": purged}
+
+
+# -----------------------------------------------------------------------------
+# Monthly partitions (Postgres, only after the partitioning migration ran)
+# -----------------------------------------------------------------------------
+def _month_start(d: datetime, offset: int = 0) -> datetime:
+    month = d.month - 1 + offset
+    return datetime(d.year + month // 12, month % 12 + 1, 1)
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'notifications'"
+    )).first())
+
+
+def ensure_partitions(db: Session, now: Optional[datetime] = None,
+                      months_ahead: int = PARTITIONS_AHEAD) -> list:
+    """Create this month's and the next `months_ahead` partitions if missing."""
+    if not is_partitioned(db):
+        return []
+    now = now or datetime.now(timezone.utc)
+    created = []
+    for offset in range(months_ahead + 1):
+        start, end = _month_start(now, offset), _month_start(now, offset + 1)
+        name = f"notifications_y{start.year}m{start.month:02d}"
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF notifications "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        ))
+        created.append(name)
+    db.commit()
+    return created
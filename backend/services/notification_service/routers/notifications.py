@@ -1,47 +1,132 @@
 # notification_service/routers/notifications.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from common.database import get_db
 from common.security.dependencies import get_current_user
 from common.models.user import User
 from common.models.notification import Notification
+from services.notification_service.events import count_unread, push_unread
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
+INBOX_PAGE_MAX = 200
+SYNC_MAX       = 200
+
+
+def _as_dict(note_id, message, read, created_at) -> dict:
+    return {
+        "id":         note_id,
+        "message":    message,
+        "read":       read,
+        "created_at": created_at,
+    }
+
+
+def _mark_read(db: Session, user_id: int, *criteria, limit: Optional[int] = None):
+    """
+    Flip matching unread rows to read in ONE statement and return the
+    updated (id, message, created_at) rows. With `limit`, only the newest
+    `limit` matches are flipped (a page of the inbox). The caller commits
+    (after queuing the unread push, so both land in one transaction).
+    """
+    match = [Notification.user_id == user_id, Notification.read.is_(False), *criteria]
+    if limit is not None:
+        page = (
+            select(Notification.id)
+            .where(*match)
+            .order_by(Notification.id.desc())
+            .limit(limit)
+        )
+        match = [Notification.id.in_(page)]
+    stmt = (
+        update(Notification)
+        .where(*match)
+        .values(read=True)
+        .returning(Notification.id, Notification.message, Notification.created_at)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).all()
+
 
 @router.get("/", response_model=list[dict])
 def list_notifications(
     unread_only: bool = False,
+    limit: int = Query(50, ge=1, le=INBOX_PAGE_MAX),
+    before_id: Optional[int] = Query(
+        None, description="Cursor: pass the last id of the previous page"
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    List all notifications for the current user.
-    If `unread_only=True`, return only the unread ones,
-    and immediately mark them as read in the database.
+    Newest-first page of the current user's notifications.
+    Page with `before_id=<last id seen>`; ids grow with creation time.
+    If `unread_only=True`, return only the unread ones (same page size and
+    cursor), and immediately mark that page as read in the database.
     """
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
     if unread_only:
-        query = query.filter(Notification.read.is_(False))
+        # one UPDATE … RETURNING instead of load → flip → flush per row
+        cursor = [Notification.id < before_id] if before_id is not None else []
+        rows = _mark_read(db, current_user.id, *cursor, limit=limit)
+        rows = sorted(rows, key=lambda r: r.id, reverse=True)
+        if rows:
+            push_unread(db, current_user, [r.id for r in rows])
+        db.commit()
+        return [_as_dict(r.id, r.message, True, r.created_at) for r in rows]
 
-    notes = query.order_by(Notification.created_at.desc()).all()
+    query = (
+        db.query(Notification.id, Notification.message, Notification.read, Notification.created_at)
+          .filter(Notification.user_id == current_user.id)
+    )
+    if before_id is not None:
+        query = query.filter(Notification.id < before_id)
 
-    if unread_only and notes:
-        for note in notes:
-            note.read = True
-        db.commit()
+    rows = query.order_by(Notification.id.desc()).limit(limit).all()
+    return [_as_dict(*r) for r in rows]
 
-    return [
-        {
-            "id":         n.id,
-            "message":    n.message,
-            "read":       n.read,
-            "created_at": n.created_at,
-        }
-        for n in notes
-    ]
+
+@router.get("/unread_count", response_model=dict)
+def unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Badge counter – served from the partial index on unread rows.
+    """
+    return {"unread": count_unread(db, current_user.id)}
+
+
+@router.get("/sync", response_model=dict)
+def sync_since(
+    since: int = Query(0, ge=0, description="Last notification id the client has seen"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Catch-up for a reconnecting client: notifications newer than `since`
+    (oldest first) plus the current unread count. Repeat with the returned
+    `last_id` while `has_more` is true.
+    """
+    rows = (
+        db.query(Notification.id, Notification.message, Notification.read, Notification.created_at)
+          .filter(Notification.user_id == current_user.id, Notification.id > since)
+          .order_by(Notification.id)
+          .limit(SYNC_MAX + 1)
+          .all()
+    )
+    has_more = len(rows) > SYNC_MAX
+    rows = rows[:SYNC_MAX]
+    return {
+        "items":    [_as_dict(*r) for r in rows],
+        "unread":   count_unread(db, current_user.id),
+        "last_id":  rows[-1].id if rows else since,
+        "has_more": has_more,
+    }
 
 
 @router.post("/{note_id}/read", response_model=dict)
@@ -53,19 +138,22 @@ def mark_read(
     """
     Mark a single notification as read.
     """
-    note = (
-        db.query(Notification)
-        .filter(Notification.id == note_id, Notification.user_id == current_user.id)
-        .first()
+    if _mark_read(db, current_user.id, Notification.id == note_id):
+        push_unread(db, current_user, [note_id])
+        db.commit()
+        return {"detail": "marked as read"}
+
+    # nothing flipped: either already read or not ours
+    exists = (
+        db.query(Notification.id)
+          .filter(Notification.id == note_id, Notification.user_id == current_user.id)
+          .first()
     )
-    if not note:
+    if not exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
-
-    note.read = True
-    db.commit()
     return {"detail": "marked as read"}
 
 
@@ -77,22 +165,16 @@ def mark_all_as_read(
     """
     Mark *all* unread notifications for the current user as read.
     """
-    # fetch only unread
-    unread_notes = (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id, Notification.read.is_(False))
-        .all()
-    )
+    rows = _mark_read(db, current_user.id)
 
     # nothing to do
-    if not unread_notes:
-        return {"detail": "no unread notifications"}
+    if not rows:
+        db.rollback()
+        return {"detail": "no unread notifications", "ids": []}
 
-    # mark them
-    for note in unread_notes:
-        note.read = True
+    push_unread(db, current_user, [r.id for r in rows])
     db.commit()
-
     return {
-        "detail": f"marked {len(unread_notes)} notification(s) as read"
+        "detail": f"marked {len(rows)} notification(s) as read",
+        "ids":    [r.id for r in rows],
     }
@@ -0,0 +1,110 @@
+# services/project_service/board_events.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Board change feed. Writes to tasks / big tasks record a compact event
+#     {"type": "change", "entity": "task", "op": "update", "id": 42,
+#      "project_id": 7, "version": 19, "fields": {"status": "Done"}}
+# that clients apply to their local copy instead of reloading the board.
+#   • `version` is projects.data_version, bumped in the SAME transaction as
+#     the write – a client that sees a gap on the project channel knows it
+#     missed something and reloads once
+#   • events go to the transactional outbox (common/outbox.py) – they are
+#     delivered only if the write commits, one per channel: project:<id>
+#     and big_task:<id> (both old and new when a task moves)
+# ──────────────────────────────────────────────────────────────────────────────
+import enum
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from common.models.project import Project
+from common.models.user import User
+from common.outbox import enqueue_channel
+from common.realtime import big_task_channel, project_channel
+
+# columns a board needs to render / patch a card
+TASK_FIELDS = (
+    "title", "description", "status", "issue_type", "priority", "due_date",
+    "reporter_id", "assignee_id", "project_id", "big_task_id", "created_at",
+)
+BIG_TASK_FIELDS = (
+    "title", "description", "status", "priority", "due_date", "project_id", "created_at",
+)
+
+
+def _json_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def snapshot(obj, fields: Iterable[str]) -> dict:
+    """Current values of `fields` on `obj`, JSON-ready."""
+    return {name: _json_value(getattr(obj, name)) for name in fields}
+
+
+def diff(before: dict, after: dict) -> dict:
+    """Fields whose value changed between two snapshots."""
+    return {name: value for name, value in after.items() if before.get(name) != value}
+
+
+def task_fields(db: Session, task, before: Optional[dict] = None) -> dict:
+    """
+    Full card for a new task, or only what changed since `before` – plus
+    the display names a card shows when the people on it change.
+    """
+    after  = snapshot(task, TASK_FIELDS)
+    fields = after if before is None else diff(before, after)
+    if before is None:
+        reporter = db.get(User, task.reporter_id)
+        fields["creator_name"] = reporter.username if reporter else ""
+    if "assignee_id" in fields:
+        assignee = db.get(User, task.assignee_id) if task.assignee_id else None
+        fields["assignee_name"] = assignee.username if assignee else None
+    return fields
+
+
+def record_change(db: Session, entity: str, op: str, obj_id: int, project_id: int,
+                  fields: Optional[dict] = None,
+                  big_task_ids: Iterable[Optional[int]] = ()) -> int:
+    """
+    Bump the project's data_version and queue the event in the outbox.
+    Call after the write is flushed, before `db.commit()`.
+    Returns the new version.
+    """
+    return record_changes(db, entity, project_id, [(op, obj_id, fields, big_task_ids)])
+
+
+def record_changes(db: Session, entity: str, project_id: int,
+                   changes: List[Tuple[str, int, Optional[dict], Iterable[Optional[int]]]]) -> int:
+    """
+    `record_change` for several writes to one project – (op, id, fields,
+    big_task_ids) each. One data_version bump by len(changes); the events
+    carry consecutive versions, so clients see no gap. Returns the last one.
+    """
+    last = db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(data_version=Project.data_version + len(changes))
+        .returning(Project.data_version)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+
+    for version, (op, obj_id, fields, big_task_ids) in enumerate(changes, last - len(changes) + 1):
+        payload = {
+            "type":       "change",
+            "entity":     entity,
+            "op":         op,
+            "id":         obj_id,
+            "project_id": project_id,
+            "version":    version,
+            "fields":     fields or {},
+        }
+        channels = [project_channel(project_id)]
+        channels += [big_task_channel(bt_id) for bt_id in dict.fromkeys(big_task_ids) if bt_id]
+        for channel in channels:
+            enqueue_channel(db, channel, payload)
+    return last
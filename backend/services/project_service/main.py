@@ -2,6 +2,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from common.auth0_docs import wire_auth0_docs
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
+from common.config import settings
+from common.db_routing import LAST_WRITE_HEADER, WriteStampMiddleware
+from common.query_stats import QueryStatsMiddleware
 
 from services.project_service.routers import (
     projects,
@@ -11,6 +16,8 @@ from services.project_service.routers import (
     tasks,
     task_comments,
     admin,             # ← NEW
+    channels,
+    search,
 )
 
 app = FastAPI(title="Project Service")
@@ -30,17 +37,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Data-Version",     # board change-feed baseline
+                    LAST_WRITE_HEADER],   # read-your-writes stamp
 )
+app.add_middleware(QueryStatsMiddleware, headers=settings.QUERY_STATS_HEADERS)
+app.add_middleware(WriteStampMiddleware)
+instrument_app(app)
 
 # ─────────────── Routers ─────────────
+# search first: /api/projects/search must not be taken for a project id
+app.include_router(search.router,            prefix="/api/projects/search",    tags=["search"])
 app.include_router(projects.router,          prefix="/api/projects",           tags=["projects"])
 app.include_router(project_members.router,   prefix="/api/projects/members",   tags=["project_members"])
 app.include_router(big_tasks.router,         prefix="/api/projects/big_tasks", tags=["Big Tasks"])
 app.include_router(big_task_members.router,  prefix="/api/projects/big_task_members", tags=["big_task_members"])
 app.include_router(tasks.router,             prefix="/api/projects/tasks",     tags=["tasks"])
 app.include_router(task_comments.router,     prefix="/api/projects/task_comments", tags=["task_comments"])
+app.include_router(channels.router,          prefix="/api/projects",           tags=["channels"])
 app.include_router(admin.router,             prefix="/api",                    tags=["Admin"])
 app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+app.include_router(metrics_router)
 
 @app.get("/healthz")
 def health():
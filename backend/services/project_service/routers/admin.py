@@ -1,17 +1,27 @@
 # service/project_service/routers/admin.py
 # services/project_service/routers/admin.py
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from common.database import get_db
+from common.database import get_read_db
+from common.enums import ProjectStatus, TaskStatus
+from common.schemas.admin_schema    import (
+    AdminProjectRow, AdminProjectPage,
+    AdminBigTaskRow, AdminBigTaskPage,
+    AdminTaskRow,    AdminTaskPage,
+)
 from common.schemas.project_schema  import Project
 from common.schemas.big_task_schema import BigTask
 from common.schemas.task_schema     import Task
 from common.models.project          import Project as ProjectDB
 from common.models.big_task         import BigTask as BigTaskDB
-from common.models.task             import Task as TaskDB
+from common.models.task             import Task as TaskDB, task_read_options
+from common.models.project_member   import ProjectMember
+from common.models.big_task_member  import BigTaskMember
+from common.models.user             import User
 from common.security.dependencies  import get_current_user
 
 router = APIRouter(
@@ -35,9 +45,16 @@ def require_admin(request: Request):
     response_model=List[Project],
     dependencies=[Depends(require_admin)],  # <-- enforce admin
 )
-def list_all_projects(db: Session = Depends(get_db)):
+def list_all_projects(db: Session = Depends(get_read_db)):
     """Return EVERY project in the system (admin-only)."""
-    return db.query(ProjectDB).all()
+    return (
+        db.query(ProjectDB)
+          .options(
+            joinedload(ProjectDB.owner),
+            selectinload(ProjectDB.members).joinedload(ProjectMember.user),
+          )
+          .all()
+    )
 
 
 @router.get(
@@ -45,8 +62,15 @@ def list_all_projects(db: Session = Depends(get_db)):
     response_model=List[BigTask],
     dependencies=[Depends(require_admin)],
 )
-def list_all_big_tasks(db: Session = Depends(get_db)):
-    return db.query(BigTaskDB).all()
+def list_all_big_tasks(db: Session = Depends(get_read_db)):
+    return (
+        db.query(BigTaskDB)
+          .options(
+            *task_read_options(selectinload(BigTaskDB.tasks)),
+            selectinload(BigTaskDB.members).joinedload(BigTaskMember.user),
+          )
+          .all()
+    )
 
 
 @router.get(
@@ -54,5 +78,186 @@ def list_all_big_tasks(db: Session = Depends(get_db)):
     response_model=List[Task],
     dependencies=[Depends(require_admin)],
 )
-def list_all_tasks(db: Session = Depends(get_db)):
-    return db.query(TaskDB).all()
+def list_all_tasks(db: Session = Depends(get_read_db)):
+    return db.query(TaskDB).options(*task_read_options()).all()
+
+
+# ---------------------------------------------------------------------------
+# Paginated + streaming listings (slim rows, keyset on id)
+#
+#   GET …/page   → {"items": [...], "next_after_id": 123 | null}
+#   GET …/stream → NDJSON, one row per line, fetched STREAM_CHUNK rows at a
+#                  time so memory stays flat however big the table is
+# ---------------------------------------------------------------------------
+PAGE_LIMIT_MAX = 1000
+STREAM_CHUNK   = 1000
+
+
+def _keyset_page(query, id_col, after_id: int, limit: int) -> dict:
+    rows = query.filter(id_col > after_id).order_by(id_col).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items":         [row._asdict() for row in rows],
+        "next_after_id": rows[-1].id if more and rows else None,
+    }
+
+
+def _ndjson_stream(db: Session, query, id_col, row_model) -> StreamingResponse:
+    """
+    Walk the table in keyset chunks. The request's session has already been
+    handed back by the time Starlette iterates the body, so each chunk runs
+    as its own short query and the generator closes the session at the end.
+    """
+    def rows():
+        after_id = 0
+        try:
+            while True:
+                chunk = (
+                    query.filter(id_col > after_id)
+                         .order_by(id_col)
+                         .limit(STREAM_CHUNK)
+                         .all()
+                )
+                if not chunk:
+                    return
+                yield "".join(
+                    row_model.model_validate(row._asdict()).model_dump_json() + "\n"
+                    for row in chunk
+                )
+                if len(chunk) < STREAM_CHUNK:
+                    return
+                after_id = chunk[-1].id
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+# ───────────── projects ─────────────
+def _project_rows(db: Session, status, owner_id, q):
+    query = (
+        db.query(
+            ProjectDB.id, ProjectDB.title, ProjectDB.status, ProjectDB.due_date,
+            ProjectDB.owner_id, User.username.label("owner_username"),
+        )
+        .outerjoin(User, User.id == ProjectDB.owner_id)
+    )
+    if status is not None:
+        query = query.filter(ProjectDB.status == status)
+    if owner_id is not None:
+        query = query.filter(ProjectDB.owner_id == owner_id)
+    if q:
+        query = query.filter(ProjectDB.title.ilike(f"%{q}%"))
+    return query
+
+
+@router.get(
+    "/projects/page",
+    response_model=AdminProjectPage,
+    dependencies=[Depends(require_admin)],
+)
+def page_projects(
+    after_id: int                     = Query(0, ge=0),
+    limit:    int                     = Query(100, ge=1, le=PAGE_LIMIT_MAX),
+    status:   Optional[ProjectStatus] = None,
+    owner_id: Optional[int]           = None,
+    q:        Optional[str]           = Query(None, description="Title contains"),
+    db: Session = Depends(get_read_db),
+):
+    return _keyset_page(_project_rows(db, status, owner_id, q), ProjectDB.id, after_id, limit)
+
+
+@router.get("/projects/stream", dependencies=[Depends(require_admin)])
+def stream_projects(
+    status:   Optional[ProjectStatus] = None,
+    owner_id: Optional[int]           = None,
+    q:        Optional[str]           = Query(None, description="Title contains"),
+    db: Session = Depends(get_read_db),
+):
+    return _ndjson_stream(db, _project_rows(db, status, owner_id, q), ProjectDB.id, AdminProjectRow)
+
+
+# ───────────── big tasks ─────────────
+def _big_task_rows(db: Session, project_id, status):
+    query = db.query(
+        BigTaskDB.id, BigTaskDB.title, BigTaskDB.status, BigTaskDB.priority,
+        BigTaskDB.due_date, BigTaskDB.project_id, BigTaskDB.created_at,
+    )
+    if project_id is not None:
+        query = query.filter(BigTaskDB.project_id == project_id)
+    if status is not None:
+        query = query.filter(BigTaskDB.status == status)
+    return query
+
+
+@router.get(
+    "/big-tasks/page",
+    response_model=AdminBigTaskPage,
+    dependencies=[Depends(require_admin)],
+)
+def page_big_tasks(
+    after_id:   int                  = Query(0, ge=0),
+    limit:      int                  = Query(100, ge=1, le=PAGE_LIMIT_MAX),
+    project_id: Optional[int]        = None,
+    status:     Optional[TaskStatus] = None,
+    db: Session = Depends(get_read_db),
+):
+    return _keyset_page(_big_task_rows(db, project_id, status), BigTaskDB.id, after_id, limit)
+
+
+@router.get("/big-tasks/stream", dependencies=[Depends(require_admin)])
+def stream_big_tasks(
+    project_id: Optional[int]        = None,
+    status:     Optional[TaskStatus] = None,
+    db: Session = Depends(get_read_db),
+):
+    return _ndjson_stream(db, _big_task_rows(db, project_id, status), BigTaskDB.id, AdminBigTaskRow)
+
+
+# ───────────── tasks ─────────────
+def _task_rows(db: Session, project_id, big_task_id, status, assignee_id):
+    query = db.query(
+        TaskDB.id, TaskDB.title, TaskDB.status, TaskDB.priority, TaskDB.due_date,
+        TaskDB.project_id, TaskDB.big_task_id, TaskDB.reporter_id,
+        TaskDB.assignee_id, TaskDB.created_at,
+    )
+    if project_id is not None:
+        query = query.filter(TaskDB.project_id == project_id)
+    if big_task_id is not None:
+        query = query.filter(TaskDB.big_task_id == big_task_id)
+    if status is not None:
+        query = query.filter(TaskDB.status == status.value)
+    if assignee_id is not None:
+        query = query.filter(TaskDB.assignee_id == assignee_id)
+    return query
+
+
+@router.get(
+    "/tasks/page",
+    response_model=AdminTaskPage,
+    dependencies=[Depends(require_admin)],
+)
+def page_tasks(
+    after_id:    int                  = Query(0, ge=0),
+    limit:       int                  = Query(100, ge=1, le=PAGE_LIMIT_MAX),
+    project_id:  Optional[int]        = None,
+    big_task_id: Optional[int]        = None,
+    status:      Optional[TaskStatus] = None,
+    assignee_id: Optional[int]        = None,
+    db: Session = Depends(get_read_db),
+):
+    query = _task_rows(db, project_id, big_task_id, status, assignee_id)
+    return _keyset_page(query, TaskDB.id, after_id, limit)
+
+
+@router.get("/tasks/stream", dependencies=[Depends(require_admin)])
+def stream_tasks(
+    project_id:  Optional[int]        = None,
+    big_task_id: Optional[int]        = None,
+    status:      Optional[TaskStatus] = None,
+    assignee_id: Optional[int]        = None,
+    db: Session = Depends(get_read_db),
+):
+    query = _task_rows(db, project_id, big_task_id, status, assignee_id)
+    return _ndjson_stream(db, query, TaskDB.id, AdminTaskRow)
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from common.database import get_db
+from common.database import get_db, get_read_db
 from common.security.dependencies import get_current_user
 from common.models.user import User
 from common.models.big_task_member import BigTaskMember
@@ -84,18 +84,17 @@ def add_member(
         role       =member_in.role,
     )
     db.add(bm)
+    added_to_big_task(db, big_task, user_to_add)
     db.commit()
     db.refresh(bm)
 
-    added_to_big_task(db, big_task, user_to_add)
-
     return bm
 
 
 @router.get("/{big_task_id}/members", response_model=List[BigTaskMemberSchema])
 def list_members(
     big_task_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     bt = db.query(BigTask).filter(BigTask.id == big_task_id).first()
@@ -141,7 +140,7 @@ def remove_member(
         raise HTTPException(status_code=404, detail="Member not found")
 
     db.delete(member)
-    db.commit()
     removed_from_big_task(db, bt, user_obj)
+    db.commit()
 
     return {"detail": "Member removed"}
@@ -3,7 +3,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
 
-from common.database import get_db
+from common.database import get_db, get_read_db
 from common.schemas.big_task_schema      import BigTask, BigTaskCreate
 from common.models.big_task              import BigTask as BigTaskModel
 from common.models.big_task_member       import BigTaskMember
@@ -12,7 +12,8 @@ from common.models.project_member        import ProjectMember
 from common.models.user                  import User
 from common.security.dependencies        import get_current_user
 from services.notification_service.events import added_to_big_task
-from common.models.task import Task                 # ← new import
+from services.project_service.board_events import BIG_TASK_FIELDS, diff, record_change, snapshot
+from common.models.task import Task, task_read_options  # ← new import
 
 router = APIRouter(prefix="/big_tasks", tags=["Big Tasks"])
 
@@ -29,6 +30,15 @@ def _assert_can_delete(task_count: int) -> None:
                    "Delete or move them first.",
         )
 
+
+def _big_task_read_options():
+    """Eager-load tasks (+ their names/project) and members → user in bulk."""
+    return [
+        joinedload(BigTaskModel.tasks),
+        *task_read_options(joinedload(BigTaskModel.tasks)),
+        joinedload(BigTaskModel.members).joinedload(BigTaskMember.user),
+    ]
+
 # ---------------------------------------------------------------------------
 # CREATE  (now always inserts the creator as a member and refreshes `members`)
 # ---------------------------------------------------------------------------
@@ -53,10 +63,12 @@ def create_big_task(
     # 2) create the epic
     bt = BigTaskModel(**big_task_in.dict())
     db.add(bt)
-    db.commit()
-    db.refresh(bt)
+    db.flush()
+    record_change(db, "big_task", "create", bt.id, bt.project_id,
+                  snapshot(bt, BIG_TASK_FIELDS), [bt.id])
 
-    # 3) add the creator as an **owner** member
+    # 3) add the creator as an **owner** member – epic, membership and the
+    #    notification go out in one commit
     db.add(
         BigTaskMember(
             big_task_id = bt.id,
@@ -64,13 +76,13 @@ def create_big_task(
             role        = "owner",
         )
     )
+    added_to_big_task(db, bt, current_user)   # notify
     db.commit()
+    db.refresh(bt)
 
     # 4) reload the relationship so the response includes it
     db.refresh(bt, attribute_names=["members"])
 
-    added_to_big_task(db, bt, current_user)   # notify
-
     return bt
 
 
@@ -85,7 +97,7 @@ def list_big_tasks(
         False,
         description="If true, return only the big tasks the current user is a member of"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     # — Per-project branch
@@ -110,8 +122,7 @@ def list_big_tasks(
         query = (
             db.query(BigTaskModel)
               .options(
-                joinedload(BigTaskModel.tasks),
-                joinedload(BigTaskModel.members)
+                *_big_task_read_options()
               )
               .filter(BigTaskModel.project_id == project_id)
         )
@@ -139,8 +150,7 @@ def list_big_tasks(
     query = (
         db.query(BigTaskModel)
           .options(
-            joinedload(BigTaskModel.tasks),
-            joinedload(BigTaskModel.members)
+            *_big_task_read_options()
           )
           .filter(BigTaskModel.project_id.in_(accessible))
     )
@@ -163,13 +173,12 @@ def list_big_tasks(
 @router.get("/{big_task_id}", response_model=BigTask)
 def get_big_task(
     big_task_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     bt = (
         db.query(BigTaskModel)
-          .options(joinedload(BigTaskModel.tasks),
-                   joinedload(BigTaskModel.members))
+          .options(*_big_task_read_options())
           .filter(BigTaskModel.id == big_task_id)
           .first()
     )
@@ -238,12 +247,16 @@ def update_big_task(
             raise HTTPException(status_code=403, detail="Not a member of this big task")
 
     # apply updates
+    before         = snapshot(bt, BIG_TASK_FIELDS)
     bt.title       = big_task_in.title
     bt.description = big_task_in.description
     bt.status      = big_task_in.status
     bt.priority    = big_task_in.priority
     bt.due_date    = big_task_in.due_date
 
+    fields = diff(before, snapshot(bt, BIG_TASK_FIELDS))
+    if fields:
+        record_change(db, "big_task", "update", bt.id, bt.project_id, fields, [bt.id])
     db.commit()
     db.refresh(bt)
     return bt
@@ -295,5 +308,7 @@ def delete_big_task(
     # ────────────────────────────────────────────────
 
     db.delete(bt)
+    db.flush()
+    record_change(db, "big_task", "delete", bt.id, bt.project_id, big_task_ids=[bt.id])
     db.commit()
     return {"detail": "BigTask deleted successfully"}
\ No newline at end of file
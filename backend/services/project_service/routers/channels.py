@@ -0,0 +1,76 @@
+# services/project_service/routers/channels.py
+# Access check for realtime channels. The gateway has no database; before it
+# lets a socket join "project:<id>" / "big_task:<id>" it calls this endpoint
+# with the client's own token, so the same membership rules as the REST
+# routes decide who may watch a board.
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from common.database import get_read_db
+from common.models.big_task import BigTask
+from common.models.big_task_member import BigTaskMember
+from common.models.project import Project
+from common.models.project_member import ProjectMember
+from common.models.user import User
+from common.realtime import parse_channel
+from common.security.dependencies import get_current_user
+
+router = APIRouter(prefix="/channels", tags=["channels"])
+
+
+def _is_project_member(db: Session, project_id: int, user_id: int):
+    return (
+        db.query(ProjectMember.user_id)
+          .filter(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+          .exists()
+    )
+
+
+def _can_watch_project(db: Session, project_id: int, user_id: int) -> bool:
+    owner_id = db.query(Project.owner_id).filter(Project.id == project_id).scalar()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return owner_id == user_id or db.query(_is_project_member(db, project_id, user_id)).scalar()
+
+
+def _can_watch_big_task(db: Session, big_task_id: int, user_id: int) -> bool:
+    # same rule as GET /big_tasks/{id}: project owner, or project member
+    # who is also on the big task
+    row = (
+        db.query(BigTask.project_id, Project.owner_id)
+          .join(Project, Project.id == BigTask.project_id)
+          .filter(BigTask.id == big_task_id)
+          .first()
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="BigTask not found")
+    if row.owner_id == user_id:
+        return True
+    on_big_task = (
+        db.query(BigTaskMember.user_id)
+          .filter(BigTaskMember.big_task_id == big_task_id, BigTaskMember.user_id == user_id)
+          .exists()
+    )
+    return bool(db.query(_is_project_member(db, row.project_id, user_id)).scalar()
+                and db.query(on_big_task).scalar())
+
+
+@router.get("/{channel}/access", response_model=dict)
+def channel_access(
+    channel:      str,
+    db:           Session = Depends(get_read_db),
+    current_user: User    = Depends(get_current_user),
+):
+    """
+    200 if the current user may subscribe to `channel`, 403/404 otherwise.
+    """
+    try:
+        kind, object_id = parse_channel(channel)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    check = _can_watch_project if kind == "project" else _can_watch_big_task
+    if not check(db, object_id, current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                            detail="Not authorized to watch this channel")
+    return {"channel": channel, "allowed": True}
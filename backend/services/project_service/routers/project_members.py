@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from common.database import get_db
+from common.database import get_db, get_read_db
 from common.security.dependencies import get_current_user
 from common.models.user import User
 from common.models.project_member import ProjectMember
@@ -55,17 +55,16 @@ async def add_member_to_project(
         role=member_in.role  # Role from the schema; if not provided, default is used
     )
     db.add(new_member)
+    added_to_project(db, project, member_user, current_user)
     db.commit()
     db.refresh(new_member)
 
-    added_to_project(db, project, member_user, current_user)
-
     return new_member
 
 @router.get("/{project_id}/members", response_model=List[ProjectMemberSchema])
 def list_project_members(
         project_id: int,
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     # Verify that the project exists
@@ -145,8 +144,8 @@ def remove_member(
         )
 
     db.delete(member)
-    db.commit()
     removed_from_project(db, project, member_user)
+    db.commit()
 
     return {"detail": "Member removed"}
 
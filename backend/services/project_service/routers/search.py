@@ -0,0 +1,32 @@
+# services/project_service/routers/search.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+
+from common.database import get_read_db
+from common.models.user import User
+from common.schemas.search_schema import SearchPage
+from common.security.dependencies import get_current_user
+from services.project_service.search import search
+
+router = APIRouter()
+
+MAX_OFFSET = 1000        # deeper than this → refine the query instead
+
+
+# ---------------------------------------------------------------------------
+#   GET /api/projects/search/?q=login bug&kind=all&project_id=&limit=&offset=
+#   → {"items": [...ranked hits...], "next_offset": 20 | null}
+# ---------------------------------------------------------------------------
+@router.get("/", response_model=SearchPage)
+def search_tasks_and_comments(
+    q:          str                                   = Query(..., min_length=2, max_length=200),
+    kind:       Literal["all", "tasks", "comments"]   = "all",
+    project_id: Optional[int]                         = None,
+    limit:      int                                   = Query(20, ge=1, le=100),
+    offset:     int                                   = Query(0, ge=0, le=MAX_OFFSET),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    items, more = search(db, current_user.id, q, kind, project_id, limit, offset)
+    return {"items": items, "next_offset": offset + limit if more else None}
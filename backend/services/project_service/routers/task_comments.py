@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
 from typing import List
-from common.database import get_db
+from common.database import get_db, get_read_db
 from common.schemas.task_comment_schema import TaskCommentCreate, TaskComment, TaskCommentUpdate
 from common.models.task_comment import TaskComment as TaskCommentModel
 from common.models.task import Task
@@ -29,18 +29,17 @@ def create_comment(
         content=comment_in.content
     )
     db.add(new_comment)
+    comment_added(db, task, current_user)      # same transaction as the comment
     db.commit()
     db.refresh(new_comment)
 
-    comment_added(db, task, current_user)
-
     return new_comment
 
 
 @router.get("/task/{task_id}", response_model=List[TaskComment])
 def list_comments(
         task_id: int,
-        db: Session = Depends(get_db),
+        db: Session = Depends(get_read_db),
         current_user: User = Depends(get_current_user)
 ):
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -1,11 +1,11 @@
 # services/project_service/routers/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from common.database import get_db
-from common.schemas.task_schema import TaskCreate, Task
-from common.models.task import Task as TaskModel
+from common.database import get_db, get_read_db
+from common.schemas.task_schema import TaskCreate, Task, BulkTaskRequest, BulkTaskResponse
+from common.models.task import Task as TaskModel, task_read_options
 from common.models.project import Project as ProjectModel
 from common.models.big_task import BigTask as BigTaskModel
 from common.models.project_member import ProjectMember
@@ -16,6 +16,8 @@ from services.notification_service.events import (
     task_assigned,
     task_status_changed,
 )
+from services.project_service.board_events import TASK_FIELDS, record_change, snapshot, task_fields
+from services.project_service.task_bulk import apply_bulk
 
 router = APIRouter()
 
@@ -126,29 +128,43 @@ def create_task(
         big_task_id  = task_in.big_task_id,
     )
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
-
+    db.flush()
+    record_change(db, "task", "create", new_task.id, new_task.project_id,
+                  task_fields(db, new_task), [new_task.big_task_id])
     if new_task.assignee_id:
-        task_assigned(db, new_task, new_task.assignee)
+        task_assigned(db, new_task, db.get(User, new_task.assignee_id))
+    db.commit()                     # task + notification + realtime events
+    db.refresh(new_task)
 
     return new_task
 
 
+@router.post("/bulk", response_model=BulkTaskResponse)
+def bulk_tasks(
+    body: BulkTaskRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create / update / move up to BULK_MAX_ITEMS tasks in one request and one
+    transaction. Each item gets the status the single-task endpoint would
+    have answered; failed items are skipped unless `atomic` is set, in which
+    case any failure rejects the whole request with a 400.
+    """
+    return apply_bulk(db, body.items, current_user, atomic=body.atomic)
+
+
 @router.get("/", response_model=List[Task])
 def list_tasks(
+    response: Response,
     project_id: Optional[int] = None,
     big_task_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     q = (
         db.query(TaskModel)
-          .options(
-            joinedload(TaskModel.project)
-              .joinedload(ProjectModel.owner),
-            joinedload(TaskModel.big_task),
-          )
+          .options(*task_read_options())
     )
 
     # Filter by epic
@@ -181,6 +197,8 @@ def list_tasks(
             if not epic_mem:
                 raise HTTPException(status_code=403, detail="Not a member of this big task")
 
+        # board baseline for the change feed (see board_events.py)
+        response.headers["X-Data-Version"] = str(project.data_version)
         return q.filter(TaskModel.big_task_id == big_task_id).all()
 
     # Filter by project
@@ -201,6 +219,7 @@ def list_tasks(
             if not proj_mem:
                 raise HTTPException(status_code=403, detail="Not authorized")
 
+        response.headers["X-Data-Version"] = str(project.data_version)
         return q.filter(TaskModel.project_id == project_id).all()
 
     # All accessible
@@ -214,12 +233,12 @@ def list_tasks(
 @router.get("/{task_id}", response_model=Task)
 def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     task = (
         db.query(TaskModel)
-          .options(joinedload(TaskModel.project).joinedload(ProjectModel.owner))
+          .options(*task_read_options())
           .filter(TaskModel.id == task_id)
           .first()
     )
@@ -277,7 +296,9 @@ def update_task(
         if not proj_mem:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-    old_status = task.status
+    old_status      = task.status
+    old_big_task_id = task.big_task_id
+    before          = snapshot(task, TASK_FIELDS)
 
     task.title        = task_in.title
     task.description  = task_in.description
@@ -288,11 +309,14 @@ def update_task(
     task.assignee_id  = task_in.assignee_id
     task.big_task_id  = task_in.big_task_id
 
+    fields = task_fields(db, task, before)
+    if fields:
+        record_change(db, "task", "update", task.id, task.project_id, fields,
+                      [old_big_task_id, task.big_task_id])
+    task_status_changed(db, task, old_status)
     db.commit()
     db.refresh(task)
 
-    task_status_changed(db, task, old_status)
-
     return task
 
 
@@ -331,5 +355,8 @@ def delete_task(
                 raise HTTPException(status_code=403, detail="Not a member of this big task")
 
     db.delete(task)
+    db.flush()
+    record_change(db, "task", "delete", task.id, task.project_id,
+                  {"big_task_id": task.big_task_id}, [task.big_task_id])
     db.commit()
     return {"detail": "Task deleted successfully"}
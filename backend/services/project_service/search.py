@@ -0,0 +1,84 @@
+# services/project_service/search.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Task & comment search.
+#   • one ranked query: tasks (title / description) UNION ALL comments,
+#     ordered by full-text score – tsvector + GIN on Postgres, FTS5 on
+#     SQLite (see common/fulltext.py)
+#   • access is part of the SQL: only projects the caller owns or is a
+#     member of (the same rule as listing all tasks), so nothing is fetched
+#     to be filtered out in Python and pages are exact
+#   • offset pagination; one extra row tells whether there is a next page
+# ──────────────────────────────────────────────────────────────────────────────
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from common import fulltext
+from common.models.project import Project
+from common.models.project_member import ProjectMember
+from common.models.task import Task
+from common.models.task_comment import TaskComment
+
+EXCERPT_CHARS = 200
+
+
+def _accessible(user_id: int):
+    owned  = select(Project.id).where(Project.owner_id == user_id)
+    member = select(ProjectMember.project_id).where(ProjectMember.user_id == user_id)
+    return owned.union(member)
+
+
+def search(db: Session, user_id: int, q: str, kind: str = "all",
+           project_id: Optional[int] = None, limit: int = 20,
+           offset: int = 0) -> Tuple[List[dict], bool]:
+    """(hits, more) – hits are SearchHit-shaped dicts, best first."""
+    words = fulltext.terms(q)
+    if not words:
+        return [], False
+    dialect = db.get_bind().dialect.name
+
+    scope = [Task.project_id.in_(_accessible(user_id))]
+    if project_id is not None:
+        scope.append(Task.project_id == project_id)
+
+    parts = []
+    if kind in ("all", "tasks"):
+        source, matches, score = fulltext.match(Task.__table__, dialect, words)
+        parts.append(
+            select(
+                literal("task").label("kind"),
+                Task.id.label("task_id"),
+                null().label("comment_id"),
+                Task.project_id.label("project_id"),
+                Task.title.label("title"),
+                func.substr(Task.description, 1, EXCERPT_CHARS).label("excerpt"),
+                score.label("score"),
+            )
+            .select_from(source)
+            .where(matches, *scope)
+        )
+    if kind in ("all", "comments"):
+        source, matches, score = fulltext.match(TaskComment.__table__, dialect, words)
+        parts.append(
+            select(
+                literal("comment").label("kind"),
+                TaskComment.task_id.label("task_id"),
+                TaskComment.id.label("comment_id"),
+                Task.project_id.label("project_id"),
+                Task.title.label("title"),
+                func.substr(TaskComment.content, 1, EXCERPT_CHARS).label("excerpt"),
+                score.label("score"),
+            )
+            .select_from(source.join(Task, Task.id == TaskComment.task_id))
+            .where(matches, *scope)
+        )
+
+    hits = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    rows = db.execute(
+        select(hits)
+        .order_by(hits.c.score.desc(), hits.c.task_id.desc(), hits.c.comment_id)
+        .limit(limit + 1)
+        .offset(offset)
+    ).mappings().all()
+    return [dict(r) for r in rows[:limit]], len(rows) > limit
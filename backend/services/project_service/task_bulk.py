@@ -0,0 +1,240 @@
+# services/project_service/task_bulk.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Bulk task writes – POST /api/projects/tasks/bulk (imports, multi-card moves).
+#   • everything the items reference is loaded up front with a handful of
+#     IN queries (tasks, projects, epics, project / epic memberships) and
+#     every item is checked against those sets with the rules of the
+#     single-task endpoints – no per-item lookups
+#   • valid items are written in one flush (batched INSERT … RETURNING /
+#     executemany UPDATE); board events go out with one data_version bump
+#     per project (board_events.record_changes), notifications as one batch,
+#     and a single commit covers all of it
+#   • invalid items are reported per index and skipped; atomic=true turns
+#     any invalid item into a 400 for the whole request
+# ──────────────────────────────────────────────────────────────────────────────
+import enum
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from common.models.big_task import BigTask as BigTaskModel
+from common.models.big_task_member import BigTaskMember
+from common.models.project import Project as ProjectModel
+from common.models.project_member import ProjectMember
+from common.models.task import Task as TaskModel
+from common.models.user import User
+from common.schemas.task_schema import BulkTaskCreate, BulkTaskItem
+from services.notification_service.events import tasks_assigned, tasks_status_changed
+from services.project_service.board_events import (
+    TASK_FIELDS, record_changes, snapshot, task_fields,
+)
+
+NOT_NULL = ("title", "status", "issue_type", "priority")
+
+
+class ItemError(Exception):
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+@dataclass
+class _Refs:
+    """Everything the items point at, loaded set-wise."""
+    tasks:           Dict[int, TaskModel]           = field(default_factory=dict)
+    projects:        Dict[int, ProjectModel]        = field(default_factory=dict)
+    epics:           Dict[int, int]                 = field(default_factory=dict)   # id → project_id
+    project_members: Set[Tuple[int, int]]           = field(default_factory=set)    # (project, user)
+    epic_members:    Set[Tuple[int, int]]           = field(default_factory=set)    # (epic, user)
+
+    def on_project(self, project: ProjectModel, user_id: int) -> bool:
+        return project.owner_id == user_id or (project.id, user_id) in self.project_members
+
+    def on_epic(self, project: ProjectModel, epic_id: int, user_id: int) -> bool:
+        return project.owner_id == user_id or (epic_id, user_id) in self.epic_members
+
+
+def _load(db: Session, items: List[BulkTaskItem], user: User) -> _Refs:
+    refs = _Refs()
+    task_ids = {i.id for i in items if not isinstance(i, BulkTaskCreate)}
+    if task_ids:
+        refs.tasks = {t.id: t for t in db.query(TaskModel).filter(TaskModel.id.in_(task_ids))}
+
+    project_ids = {i.project_id for i in items if isinstance(i, BulkTaskCreate)}
+    project_ids |= {t.project_id for t in refs.tasks.values()}
+    epic_ids = {i.big_task_id for i in items if i.big_task_id is not None}
+    epic_ids |= {t.big_task_id for t in refs.tasks.values() if t.big_task_id}
+    user_ids = {user.id} | {i.assignee_id for i in items if getattr(i, "assignee_id", None)}
+    user_ids |= {t.assignee_id for t in refs.tasks.values() if t.assignee_id}
+
+    if project_ids:
+        refs.projects = {
+            p.id: p for p in db.query(ProjectModel).filter(ProjectModel.id.in_(project_ids))
+        }
+        refs.project_members = set(
+            db.query(ProjectMember.project_id, ProjectMember.user_id)
+              .filter(ProjectMember.project_id.in_(project_ids),
+                      ProjectMember.user_id.in_(user_ids))
+              .all()
+        )
+    if epic_ids:
+        refs.epics = dict(
+            db.query(BigTaskModel.id, BigTaskModel.project_id)
+              .filter(BigTaskModel.id.in_(epic_ids))
+              .all()
+        )
+        refs.epic_members = set(
+            db.query(BigTaskMember.big_task_id, BigTaskMember.user_id)
+              .filter(BigTaskMember.big_task_id.in_(epic_ids),
+                      BigTaskMember.user_id.in_(user_ids))
+              .all()
+        )
+    return refs
+
+
+# -----------------------------------------------------------------------------
+# Per-item rules (same outcomes as create_task / update_task)
+# -----------------------------------------------------------------------------
+def _check_assignee(refs: _Refs, project: ProjectModel, epic_id: Optional[int], assignee_id: int):
+    if assignee_id == project.owner_id:
+        return
+    if epic_id is not None and (epic_id, assignee_id) not in refs.epic_members:
+        raise ItemError(400, "Assignee is not a member of this big task")
+    if (project.id, assignee_id) not in refs.project_members:
+        raise ItemError(400, "Assignee is not a member of this project")
+
+
+def _check_epic(refs: _Refs, project: ProjectModel, epic_id: int, user: User):
+    if refs.epics.get(epic_id) != project.id:
+        raise ItemError(400, "big_task_id is invalid for this project")
+    if not refs.on_epic(project, epic_id, user.id):
+        raise ItemError(403, "Not a member of this big task")
+
+
+def _check_create(refs: _Refs, item: BulkTaskCreate, user: User) -> dict:
+    project = refs.projects.get(item.project_id)
+    if project is None:
+        raise ItemError(404, "Project not found")
+    assignee_id = item.assignee_id or user.id
+    if item.big_task_id is not None:
+        _check_epic(refs, project, item.big_task_id, user)
+    elif not refs.on_project(project, user.id):
+        raise ItemError(403, "Not authorized to create tasks in this project")
+    _check_assignee(refs, project, item.big_task_id, assignee_id)
+
+    values = item.model_dump(exclude={"op"})
+    values.update(assignee_id=assignee_id, reporter_id=user.id)
+    return values
+
+
+def _check_update(refs: _Refs, item, user: User) -> Tuple[TaskModel, dict]:
+    task = refs.tasks.get(item.id)
+    if task is None:
+        raise ItemError(404, "Task not found")
+    project = refs.projects[task.project_id]
+    if not refs.on_project(project, user.id):
+        raise ItemError(403, "Not authorized")
+
+    changes = {name: getattr(item, name) for name in item.model_fields_set - {"op", "id"}}
+    for name in NOT_NULL:
+        if name in changes and changes[name] is None:
+            if item.op == "move":
+                del changes[name]                   # move: omitted/null status = keep column
+            else:
+                raise ItemError(422, f"{name} cannot be null")
+
+    epic_id     = changes.get("big_task_id", task.big_task_id)
+    assignee_id = changes.get("assignee_id", task.assignee_id)
+    epic_moved  = epic_id != task.big_task_id
+    if epic_moved and epic_id is not None:
+        _check_epic(refs, project, epic_id, user)
+    if assignee_id and assignee_id != task.assignee_id:     # a kept assignee rides along
+        _check_assignee(refs, project, epic_id, assignee_id)
+    return task, changes
+
+
+def _column_value(value):
+    return value.value if isinstance(value, enum.Enum) and isinstance(value, str) else value
+
+
+# -----------------------------------------------------------------------------
+# The request
+# -----------------------------------------------------------------------------
+def apply_bulk(db: Session, items: List[BulkTaskItem], user: User, atomic: bool = False) -> dict:
+    refs = _load(db, items, user)
+
+    results: List[dict] = []
+    creates: List[Tuple[int, dict]] = []
+    updates: List[Tuple[int, TaskModel, dict]] = []
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, BulkTaskCreate):
+                creates.append((index, _check_create(refs, item, user)))
+            else:
+                task, changes = _check_update(refs, item, user)
+                updates.append((index, task, changes))
+        except ItemError as e:
+            results.append({"index": index, "ok": False, "status": e.status, "detail": e.detail})
+
+    if atomic and results:
+        raise HTTPException(status_code=400, detail={
+            "message": "No changes were made – fix the failed items and retry",
+            "errors":  results,
+        })
+
+    # 1) write – one flush for every row
+    new_tasks = [(index, TaskModel(**{k: _column_value(v) for k, v in values.items()}))
+                 for index, values in creates]
+    db.add_all([task for _, task in new_tasks])
+
+    edits = []          # (index, task, before snapshot, old status, old epic)
+    for index, task, changes in updates:
+        before = snapshot(task, TASK_FIELDS)
+        edits.append((index, task, before, task.status, task.big_task_id))
+        for name, value in changes.items():
+            setattr(task, name, _column_value(value))
+    db.flush()
+
+    # 2) board events – one users query puts every name task_fields needs in
+    #    the identity map, so its db.get() calls don't hit the database
+    people = {uid for _, t in new_tasks for uid in (t.reporter_id, t.assignee_id)}
+    people |= {t.assignee_id for _, t, *_ in edits}
+    people.discard(None)
+    users = {u.id: u for u in db.query(User).filter(User.id.in_(people))} if people else {}
+
+    per_project = defaultdict(list)
+    for _, task in new_tasks:
+        per_project[task.project_id].append(
+            ("create", task.id, task_fields(db, task), [task.big_task_id])
+        )
+    for _, task, before, _, old_epic in edits:
+        fields = task_fields(db, task, before)
+        if fields:
+            per_project[task.project_id].append(
+                ("update", task.id, fields, [old_epic, task.big_task_id])
+            )
+    for project_id, changes in per_project.items():
+        record_changes(db, "task", project_id, changes)
+
+    # 3) notifications – one batch each
+    tasks_assigned(db, [(t, users[t.assignee_id]) for _, t in new_tasks if t.assignee_id])
+    tasks_status_changed(db, [
+        (t, old_status, users[t.assignee_id])
+        for _, t, _, old_status, _ in edits
+        if t.assignee_id and t.status != old_status
+    ])
+    results += [{"index": i, "ok": True, "status": 201, "id": t.id} for i, t in new_tasks]
+    results += [{"index": i, "ok": True, "status": 200, "id": t.id} for i, t, *_ in edits]
+    db.commit()                     # tasks + events + notifications
+
+    results.sort(key=lambda r: r["index"])
+    return {
+        "created": len(new_tasks),
+        "updated": len(edits),
+        "failed":  len(results) - len(new_tasks) - len(edits),
+        "results": results,
+    }
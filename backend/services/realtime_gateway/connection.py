@@ -0,0 +1,158 @@
+# realtime_gateway/connection.py
+# ──────────────────────────────────────────────────────────────────────────────
+# One open WebSocket with its own bounded outbound queue.
+#   • publishers only call offer() – never await a client – so a stalled
+#     phone can't pile up pending sends inside the gateway
+#   • a single writer task per socket drains the queue (with a send timeout)
+#   • when a client lags: messages with the same coalesce key replace the
+#     queued one (e.g. only the latest unread count matters); if the queue is
+#     still full the overflow policy applies:
+#       "disconnect"  – close the socket; the client reconnects with ?since=
+#                       and the replay buffer fills the gap losslessly
+#       "drop_oldest" – discard the oldest queued message
+#   • heartbeat: {"type":"ping"} every ping_interval; a client that sends
+#     nothing (no "pong") for idle_timeout is closed
+#   • client frames other than "pong" go to `on_message` (channel
+#     subscribe / unsubscribe, see main.py)
+# ──────────────────────────────────────────────────────────────────────────────
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Set, Tuple
+
+import anyio
+
+from common import metrics
+
+DISCONNECTS = metrics.counter(
+    "gateway_disconnects_total", "Closed sockets by reason", ["reason"],
+)
+DROPPED = metrics.counter(
+    "gateway_messages_dropped_total", "Queued messages dropped for lagging clients",
+)
+COALESCED = metrics.counter(
+    "gateway_messages_coalesced_total", "Queued messages replaced by a newer one",
+)
+
+# close codes sent to the client
+CLOSE_CODES = {
+    "slow_consumer": 4408,
+    "send_timeout":  4408,
+    "idle":          4000,
+    "send_error":    1011,
+}
+
+PING = json.dumps({"type": "ping"})
+
+
+class Connection:
+    def __init__(self, ws, user_id: str, max_queue: int = 256, policy: str = "disconnect",
+                 send_timeout: float = 10.0, ping_interval: float = 25.0,
+                 idle_timeout: float = 60.0,
+                 on_message: Optional[Callable[["Connection", str], Awaitable[None]]] = None):
+        self.ws            = ws
+        self.user_id       = user_id
+        self.max_queue     = max_queue
+        self.policy        = policy
+        self.send_timeout  = send_timeout
+        self.ping_interval = ping_interval
+        self.idle_timeout  = idle_timeout
+        self.on_message    = on_message
+        self.channels: Set[str] = set()
+
+        # (coalesce key | None, text)
+        self.queue: Deque[Tuple[Optional[str], str]] = deque()
+        self._wakeup = asyncio.Event()
+        self.done    = asyncio.Event()
+        self.reason: Optional[str] = None
+        self.last_seen = time.monotonic()
+
+    @property
+    def depth(self) -> int:
+        return len(self.queue)
+
+    # ───────────── producer side (never blocks) ─────────────
+    def offer(self, text: str, coalesce_key: Optional[str] = None) -> bool:
+        if self.done.is_set():
+            return False
+        if coalesce_key is not None:
+            for i, (key, _) in enumerate(self.queue):
+                if key == coalesce_key:
+                    del self.queue[i]
+                    COALESCED.inc()
+                    break
+        if len(self.queue) >= self.max_queue:
+            if self.policy == "drop_oldest":
+                self.queue.popleft()
+                DROPPED.inc()
+            else:
+                self.finish("slow_consumer")
+                return False
+        self.queue.append((coalesce_key, text))
+        self._wakeup.set()
+        return True
+
+    def finish(self, reason: str) -> None:
+        """First reason wins; wakes the endpoint so it can tear down."""
+        if not self.done.is_set():
+            self.reason = reason
+            self.done.set()
+            self._wakeup.set()
+
+    # ───────────── tasks ─────────────
+    async def writer(self) -> None:
+        try:
+            while not self.done.is_set():
+                if not self.queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _, text = self.queue.popleft()
+                await asyncio.wait_for(self.ws.send_text(text), self.send_timeout)
+        except asyncio.TimeoutError:
+            self.finish("send_timeout")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.finish("send_error")
+
+    async def heartbeat(self) -> None:
+        while not self.done.is_set():
+            await asyncio.sleep(self.ping_interval)
+            if time.monotonic() - self.last_seen > self.idle_timeout:
+                self.finish("idle")
+                return
+            self.offer(PING, coalesce_key="ping")
+
+    async def reader(self) -> None:
+        """Anything from the client ("pong" included) proves it's alive."""
+        try:
+            while True:
+                text = await self.ws.receive_text()
+                self.last_seen = time.monotonic()
+                if text != "pong" and self.on_message is not None:
+                    await self.on_message(self, text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # WebSocketDisconnect, or the socket was closed under us
+            self.finish("client_closed")
+
+    async def serve(self) -> str:
+        """Run reader / writer / heartbeat until one of them ends the socket."""
+        # anyio task group (what Starlette runs on) so a cancelled endpoint
+        # – server shutdown, client gone – tears the three tasks down cleanly
+        async with anyio.create_task_group() as tg:
+            for task in (self.reader, self.writer, self.heartbeat):
+                tg.start_soon(task)
+            await self.done.wait()
+            tg.cancel_scope.cancel()
+
+        if self.reason in CLOSE_CODES:
+            try:
+                await self.ws.close(code=CLOSE_CODES[self.reason], reason=self.reason)
+            except Exception:
+                pass
+        DISCONNECTS.inc(reason=self.reason)
+        return self.reason
@@ -0,0 +1,24 @@
+# realtime_gateway/idempotency.py
+# Keys of recently published outbox events. The outbox relay delivers
+# at-least-once (a batch is re-sent when the response was lost), so the
+# gateway remembers the last `max_keys` keys and drops repeats.
+from collections import OrderedDict
+
+
+class RecentKeys:
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def seen(self, key: str) -> bool:
+        """True if `key` was already recorded; records it otherwise."""
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+        self._keys[key] = None
+        if len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        return False
@@ -1,18 +1,31 @@
 #realtime_gateway/main.py
 import os
 import json
-import asyncio
-from typing import Dict, Set, Optional
+from typing import Dict, List, Literal, Set, Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
+import httpx
+from fastapi import FastAPI, WebSocket, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
 from jose import jwt
+from pydantic import BaseModel
+
+from common import metrics
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
+from common.realtime import parse_channel
+from services.realtime_gateway.connection import Connection
+from services.realtime_gateway.idempotency import RecentKeys
+from services.realtime_gateway.replay import ReplayBuffer
 
 # Auth0 and internal secret settings
 AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN", "dev-example.us.auth0.com")
 AUTH0_AUDIENCE = os.getenv("AUTH0_AUDIENCE", "https://api.example.com")
 INTERNAL_SECRET = os.getenv("GATEWAY_INTERNAL_SECRET", "dev-secret")
 
+# Channel access is decided by the project service (the gateway has no DB)
+PROJECT_SERVICE_URL = os.getenv("PROJECT_SERVICE_URL", "http://localhost:8002")
+MAX_CHANNELS_PER_SOCKET = int(os.getenv("GATEWAY_MAX_CHANNELS", "50"))
+
 app = FastAPI(title="Real-Time Gateway")
 
 origins = [
@@ -31,9 +44,66 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+instrument_app(app)
+app.include_router(metrics_router)
+
+# Map from Auth0 subject → set of open connections (socket + send queue)
+connections: Dict[str, Set[Connection]] = {}
+
+# Map from channel ("project:12", "big_task:7") → subscribed connections
+channels: Dict[str, Set[Connection]] = {}
+
+# Per-socket send queue / heartbeat settings (see connection.py)
+CONNECTION_OPTIONS = dict(
+    max_queue     = int(os.getenv("GATEWAY_SEND_QUEUE", "256")),
+    policy        = os.getenv("GATEWAY_OVERFLOW_POLICY", "disconnect"),   # or drop_oldest
+    send_timeout  = float(os.getenv("GATEWAY_SEND_TIMEOUT", "10")),
+    ping_interval = float(os.getenv("GATEWAY_PING_INTERVAL", "25")),
+    idle_timeout  = float(os.getenv("GATEWAY_IDLE_TIMEOUT", "60")),
+)
+
+# payload types where only the latest queued one matters
+COALESCE_TYPES = {"unread"}
+
+# Recent messages per user, replayed to clients reconnecting with ?since=<seq>
+replay_buffer = ReplayBuffer(
+    per_user     = int(os.getenv("GATEWAY_REPLAY_PER_USER", "100")),
+    max_messages = int(os.getenv("GATEWAY_REPLAY_MAX_MESSAGES", "50000")),
+    max_bytes    = int(os.getenv("GATEWAY_REPLAY_MAX_BYTES", str(32 * 1024 * 1024))),
+    ttl          = float(os.getenv("GATEWAY_REPLAY_TTL", "600")),
+)
+
+# Outbox event keys already published (relay delivers at-least-once)
+recent_keys = RecentKeys(int(os.getenv("GATEWAY_IDEMPOTENCY_KEYS", "100000")))
+DUPLICATES = metrics.counter(
+    "gateway_duplicate_events_total", "Outbox events dropped as already published",
+)
+
+metrics.gauge("gateway_replay_messages", "Messages held in the replay buffer",
+              fn=lambda: replay_buffer.total)
+metrics.gauge("gateway_replay_bytes", "Bytes held in the replay buffer",
+              fn=lambda: replay_buffer.bytes)
+metrics.gauge("gateway_replay_evicted", "Messages evicted from the replay buffer so far",
+              fn=lambda: replay_buffer.evicted)
+metrics.gauge("gateway_sockets", "Open WebSockets",
+              fn=lambda: sum(len(c) for c in connections.values()))
+metrics.gauge("gateway_send_queue_depth", "Messages waiting in all per-socket send queues",
+              fn=lambda: sum(conn.depth for c in connections.values() for conn in c))
+metrics.gauge("gateway_channels", "Channels with at least one subscriber",
+              fn=lambda: len(channels))
+metrics.gauge("gateway_channel_subscriptions", "Socket-channel subscriptions",
+              fn=lambda: sum(len(c) for c in channels.values()))
+metrics.gauge("gateway_send_queue_max_depth", "Deepest single per-socket send queue",
+              fn=lambda: max((conn.depth for c in connections.values() for conn in c), default=0))
+
+_http: Optional[httpx.AsyncClient] = None
 
-# Map from Auth0 subject → set of WebSockets
-connections: Dict[str, Set[WebSocket]] = {}
+@app.on_event("shutdown")
+async def _close_http():
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
 
 def extract_token(ws: WebSocket) -> Optional[str]:
     """
@@ -62,39 +132,119 @@ async def websocket_endpoint(ws: WebSocket):
         await ws.close(code=4401, reason="Invalid token")
         return
 
-    # 3) Accept and register
+    try:
+        since = int(ws.query_params["since"]) if "since" in ws.query_params else None
+    except ValueError:
+        since = None
+
+    # 3) Accept, replay what was missed, then register
     await ws.accept()
-    connections.setdefault(user_id, set()).add(ws)
+    missed, complete = replay_buffer.replay(user_id, since)
+    if not complete:
+        # the gap can't be filled from memory – client refetches over REST
+        await ws.send_text(json.dumps({"type": "resync", "seq": replay_buffer.last_seq}))
+    while missed:
+        for seq, text in missed:
+            await ws.send_text(text)
+            since = seq
+        # messages published while we were sending: no await between this
+        # check and registration, so nothing can slip in between
+        missed, _ = replay_buffer.replay(user_id, since)
+    async def on_message(conn: Connection, text: str):
+        await _handle_client_message(conn, token, text)
+
+    conn = Connection(ws, user_id, on_message=on_message, **CONNECTION_OPTIONS)
+    connections.setdefault(user_id, set()).add(conn)
     print(f"WebSocket connected for {user_id} (now {len(connections[user_id])} open sockets)")
 
-    # 4) Wait for any incoming text so that close() triggers a disconnect
+    # 4) Reader / writer / heartbeat until the client leaves, goes idle,
+    #    or falls too far behind
     try:
-        while True:
-            # we don't actually use client messages, but receive_text()
-            # will raise WebSocketDisconnect when the socket is closed
-            _ = await ws.receive_text()
-    except WebSocketDisconnect:
-        pass
+        reason = await conn.serve()
     finally:
-        connections[user_id].discard(ws)
-        if not connections[user_id]:
-            del connections[user_id]
-        print(f"WebSocket disconnected for {user_id}")
+        live = connections.get(user_id)
+        if live is not None:
+            live.discard(conn)
+            if not live:
+                del connections[user_id]
+        for channel in list(conn.channels):
+            _leave_channel(conn, channel)
+    print(f"WebSocket disconnected for {user_id} ({reason})")
+
+# ─────────────────────────── channel subscriptions ───────────────────────────
+async def check_channel_access(token: str, channel: str) -> bool:
+    """
+    Ask the project service whether the token's user may watch `channel`
+    (same membership rules as the REST routes). Fails closed.
+    """
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(timeout=5.0)
+    try:
+        r = await _http.get(
+            f"{PROJECT_SERVICE_URL}/api/projects/channels/{channel}/access",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    except httpx.HTTPError as e:
+        print(f"Channel access check failed for {channel}: {e!r}")
+        return False
+    return r.status_code == 200
+
+def _leave_channel(conn: Connection, channel: str):
+    conn.channels.discard(channel)
+    members = channels.get(channel)
+    if members is not None:
+        members.discard(conn)
+        if not members:
+            del channels[channel]
 
-async def _broadcast(user_id: str, payload: dict):
+async def _handle_client_message(conn: Connection, token: str, text: str):
     """
-    Send JSON payload to every open socket for this user.
+    {"type":"subscribe","channel":"project:12"} / {"type":"unsubscribe",...}.
+    Anything else from the client is ignored.
     """
-    sockets = connections.get(user_id, set())
-    if not sockets:
+    try:
+        msg = json.loads(text)
+    except ValueError:
         return
+    if not isinstance(msg, dict) or msg.get("type") not in ("subscribe", "unsubscribe"):
+        return
+
+    channel = msg.get("channel")
+    def reply(kind: str, **extra):
+        conn.offer(json.dumps({"type": kind, "channel": channel, **extra}))
 
-    text = json.dumps(payload)
-    # return_exceptions=True ensures one bad socket doesn’t cancel the rest
-    await asyncio.gather(
-        *(ws.send_text(text) for ws in sockets),
-        return_exceptions=True
-    )
+    try:
+        parse_channel(str(channel))
+    except ValueError:
+        return reply("subscribe_error", detail="unknown channel")
+
+    if msg["type"] == "unsubscribe":
+        _leave_channel(conn, channel)
+        return reply("unsubscribed")
+    if channel in conn.channels:
+        return reply("subscribed")
+    if len(conn.channels) >= MAX_CHANNELS_PER_SOCKET:
+        return reply("subscribe_error", detail="too many channels")
+    if not await check_channel_access(token, channel):
+        return reply("subscribe_error", detail="forbidden")
+    if conn.done.is_set():
+        return                      # socket went away during the check
+    conn.channels.add(channel)
+    channels.setdefault(channel, set()).add(conn)
+    reply("subscribed")
+
+def _broadcast(user_id: str, payload: dict):
+    """
+    Stamp the payload with a sequence number, keep it for replay and queue
+    it on every open socket for this user. Never waits on a client: slow
+    sockets are handled by their own writer (see connection.py).
+    """
+    _, text = replay_buffer.append(user_id, lambda seq: json.dumps({**payload, "seq": seq}))
+
+    key = payload.get("type") if payload.get("type") in COALESCE_TYPES else None
+    for conn in list(connections.get(user_id, ())):
+        conn.offer(text, coalesce_key=key)
 
 @app.post("/publish")
 async def publish(
@@ -109,6 +259,73 @@ async def publish(
     if secret != INTERNAL_SECRET:
         raise HTTPException(status_code=403, detail="Bad secret")
 
-    # Fire-and-forget
-    asyncio.create_task(_broadcast(uid, msg))
+    # Only enqueues – returns before any socket is written
+    _broadcast(uid, msg)
     return {"detail": "queued"}
+
+@app.post("/publish/channel")
+async def publish_channel(
+    channel: str,
+    msg: dict,
+    secret: Optional[str] = Header(None),
+):
+    """
+    Internal endpoint: push a message to every socket subscribed to
+    `channel`. One call per event, however many people watch the board.
+    Channel messages are live-only (no seq / replay) – a reconnecting
+    client resubscribes and refetches the board.
+    """
+    if secret != INTERNAL_SECRET:
+        raise HTTPException(status_code=403, detail="Bad secret")
+    try:
+        parse_channel(channel)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"detail": "queued", "sockets": _fanout(channel, msg)}
+
+def _fanout(channel: str, payload: dict) -> int:
+    text = json.dumps({**payload, "channel": channel})
+    subscribers = list(channels.get(channel, ()))
+    for conn in subscribers:
+        conn.offer(text)
+    return len(subscribers)
+
+class OutboxItem(BaseModel):
+    key:    str
+    kind:   Literal["user", "channel"]
+    target: str
+    msg:    dict
+
+class PublishBatch(BaseModel):
+    items: List[OutboxItem]
+
+@app.post("/publish/batch")
+async def publish_batch(
+    batch: PublishBatch,
+    secret: Optional[str] = Header(None),
+):
+    """
+    Internal endpoint for the outbox relay (common/outbox.py): many user /
+    channel messages in one request, in order. Items whose `key` was
+    already published are skipped, so a retried batch is harmless.
+    """
+    if secret != INTERNAL_SECRET:
+        raise HTTPException(status_code=403, detail="Bad secret")
+
+    published = duplicates = 0
+    for item in batch.items:
+        if recent_keys.seen(item.key):
+            duplicates += 1
+            continue
+        if item.kind == "user":
+            _broadcast(item.target, item.msg)
+        else:
+            try:
+                parse_channel(item.target)
+            except ValueError:
+                continue
+            _fanout(item.target, item.msg)
+        published += 1
+    DUPLICATES.inc(duplicates)
+    return {"published": published, "duplicates": duplicates}
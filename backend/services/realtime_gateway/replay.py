@@ -0,0 +1,124 @@
+# realtime_gateway/replay.py
+# ──────────────────────────────────────────────────────────────────────────────
+# Missed-message replay for the realtime gateway.
+#   • every published message gets a sequence number from one gateway-wide,
+#     monotonically increasing counter (so per-user seqs increase too).
+#     The counter starts at the boot time in microseconds, so every seq of
+#     this run is above every seq an earlier run handed out (unless that run
+#     averaged over a million messages a second) and a cursor from before a
+#     restart is recognised as such – not mistaken for one of ours once our
+#     counter has caught up with it
+#   • each user keeps a small ring of recent messages; a client that
+#     reconnects with ?since=<last seq> is replayed the gap
+#   • memory is bounded three ways: per-user ring size, message age, and a
+#     global cap on messages + bytes enforced by evicting from the least
+#     recently active users first (LRU)
+#   • when the gap can't be proven complete (evicted, or the gateway
+#     restarted) replay() says so and the client resyncs over REST
+# Single event loop → no locking.
+# ──────────────────────────────────────────────────────────────────────────────
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
+
+
+class _UserLog:
+    __slots__ = ("messages", "floor")
+
+    def __init__(self, floor: int):
+        # (seq, monotonic timestamp, serialized message)
+        self.messages: Deque[Tuple[int, float, str]] = deque()
+        # highest seq that may have existed for this user but is no longer
+        # kept – replaying from below it can't be complete
+        self.floor = floor
+
+
+class ReplayBuffer:
+    def __init__(self, per_user: int = 100, max_messages: int = 50_000,
+                 max_bytes: int = 32 * 1024 * 1024, ttl: float = 600.0, clock=time.monotonic,
+                 wall_clock=time.time):
+        self.per_user     = per_user
+        self.max_messages = max_messages
+        self.max_bytes    = max_bytes
+        self.ttl          = ttl
+        self._clock       = clock
+        self._logs: "OrderedDict[str, _UserLog]" = OrderedDict()   # LRU order
+        self.first_seq    = int(wall_clock() * 1_000_000)   # this run's epoch
+        self._seq         = self.first_seq
+        self.total        = 0
+        self.bytes        = 0
+        self.evicted      = 0
+        self._evicted_seq = self.first_seq   # highest seq evicted from any user
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    # ───────────── write ─────────────
+    def append(self, user_id: str, text_for_seq) -> Tuple[int, str]:
+        """
+        Store a message for `user_id`. `text_for_seq(seq)` renders the
+        message (the seq is embedded in it). Returns (seq, text).
+        """
+        self._seq += 1
+        seq  = self._seq
+        text = text_for_seq(seq)
+
+        log = self._logs.get(user_id)
+        if log is None:
+            # anything of theirs evicted earlier is at most _evicted_seq
+            log = self._logs[user_id] = _UserLog(floor=self._evicted_seq)
+        self._logs.move_to_end(user_id)
+
+        log.messages.append((seq, self._clock(), text))
+        self.total += 1
+        self.bytes += len(text)
+
+        if len(log.messages) > self.per_user:
+            self._drop_oldest(user_id, log)
+        self._expire(log, user_id)
+        self._enforce_global_cap()
+        return seq, text
+
+    # ───────────── read ─────────────
+    def replay(self, user_id: str, since: Optional[int]) -> Tuple[List[Tuple[int, str]], bool]:
+        """
+        Messages for `user_id` with seq > since, oldest first, and whether
+        that is provably everything the client missed.
+        """
+        if since is None:
+            return [], True
+        if not self.first_seq <= since <= self._seq:
+            return [], False                      # seq from another gateway run
+
+        log = self._logs.get(user_id)
+        if log is not None:
+            self._expire(log, user_id)
+            log = self._logs.get(user_id)
+        if log is None:
+            # nothing kept for this user: complete unless something newer
+            # than `since` was evicted (it might have been theirs)
+            return [], since >= self._evicted_seq
+        missed = [(seq, text) for seq, _, text in log.messages if seq > since]
+        return missed, since >= log.floor
+
+    # ───────────── eviction ─────────────
+    def _drop_oldest(self, user_id: str, log: _UserLog) -> None:
+        seq, _, text = log.messages.popleft()
+        log.floor   = seq
+        self._evicted_seq = max(self._evicted_seq, seq)
+        self.total -= 1
+        self.bytes -= len(text)
+        self.evicted += 1
+        if not log.messages:
+            del self._logs[user_id]
+
+    def _expire(self, log: _UserLog, user_id: str) -> None:
+        cutoff = self._clock() - self.ttl
+        while log.messages and log.messages[0][1] < cutoff:
+            self._drop_oldest(user_id, log)
+
+    def _enforce_global_cap(self) -> None:
+        while self._logs and (self.total > self.max_messages or self.bytes > self.max_bytes):
+            user_id, log = next(iter(self._logs.items()))     # least recently active
+            self._drop_oldest(user_id, log)
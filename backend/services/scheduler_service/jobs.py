@@ -1,15 +1,17 @@
 # scheduler_service/jobs.py
 
 from datetime       import datetime, timedelta
-from common.database import SessionLocal
+from common.database import SessionLocal, engine
+from common.outbox   import relay
 from common.models.task    import Task
 from common.models.project import Project
-from services.notification_service.events import task_overdue, project_due_soon
+from services.notification_service.events import tasks_overdue, project_due_soon
+from services.notification_service.retention import ensure_partitions, run_retention
 
 def overdue_task_check() -> None:
     """
     Find all non-Done tasks whose due_date is in the past,
-    and fire off an overdue notification for each.
+    and fire off an overdue notification for each (one batch).
     """
     with SessionLocal() as db:
         now = datetime.utcnow()
@@ -22,8 +24,8 @@ def overdue_task_check() -> None:
               )
               .all()
         )
-        for t in overdue_tasks:
-            task_overdue(db, t)
+        tasks_overdue(db, overdue_tasks)
+        db.commit()
 
 def project_due_soon_check() -> None:
     """
@@ -45,3 +47,42 @@ def project_due_soon_check() -> None:
         )
         for p in upcoming:
             project_due_soon(db, p)
+        db.commit()
+
+def notification_retention() -> None:
+    """
+    Archive / delete expired notifications in small batches and keep
+    next months' partitions ready (when the table is partitioned).
+    """
+    with SessionLocal() as db:
+        ensure_partitions(db)
+        result = run_retention(db)
+        if result["expired"] or result["purged"]:
+            print(f"[retention] {result['expired']} expired, {result['purged']} purged from archive")
+
+def outbox_sweep() -> None:
+    """
+    Deliver outbox events the writing process didn't (crashed, gateway
+    down, inline relay disabled). Safe to overlap – see common/outbox.py.
+    """
+    with SessionLocal() as db:
+        n = relay(db)
+        if n:
+            print(f"[outbox] swept {n} event(s)")
+
+async def risk_precompute() -> None:
+    """
+    Build risk reports for recently active projects ahead of time so
+    analyze_risks answers from project_risk_reports – see
+    ai_service/risk_batch.py. Bounded per run; never overlaps itself.
+    """
+    # imported here: the AI router needs OPENAI_API_KEY, the other jobs don't
+    from services.ai_service.risk_batch import run_risk_batch
+    from services.ai_service.routers.suggestions import build_risk_report
+
+    async def build(project_id, limiter):
+        return await build_risk_report(engine, project_id, "auto", throttle=limiter)
+
+    result = await run_risk_batch(engine, build)
+    if result["built"] or result["failed"]:
+        print(f"[risk-batch] built {result['built']}, failed {result['failed']}")
@@ -2,15 +2,27 @@
 
 from fastapi                     import FastAPI
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from services.scheduler_service.jobs import overdue_task_check, project_due_soon_check
+from services.scheduler_service.jobs import (
+    overdue_task_check, project_due_soon_check, notification_retention, outbox_sweep,
+    risk_precompute,
+)
+from common.config import settings
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
 
 app = FastAPI(title="Scheduler Service")
+instrument_app(app)
+app.include_router(metrics_router)
 
 @app.on_event("startup")
 async def _init():
     sched = AsyncIOScheduler()
     sched.add_job(overdue_task_check,     "interval", minutes=30)
     sched.add_job(project_due_soon_check, "interval", seconds=30)
+    sched.add_job(notification_retention, "interval", hours=1)
+    sched.add_job(outbox_sweep,           "interval", seconds=5, max_instances=1)
+    sched.add_job(risk_precompute,        "interval", seconds=settings.AI_RISK_BATCH_INTERVAL,
+                  max_instances=1, coalesce=True)
     sched.start()
 
 @app.get("/healthz")
@@ -2,6 +2,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from common.auth0_docs import wire_auth0_docs      # ← add
+from common.metrics import metrics_router
+from common.http_metrics import instrument_app
+from common.config import settings
+from common.db_routing import LAST_WRITE_HEADER, WriteStampMiddleware
+from common.query_stats import QueryStatsMiddleware
 from services.user_service.routers import profile, users
 
 app = FastAPI(title="User Service")
@@ -22,11 +27,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],    # read-your-writes stamp
 )
+app.add_middleware(QueryStatsMiddleware, headers=settings.QUERY_STATS_HEADERS)
+app.add_middleware(WriteStampMiddleware)
+instrument_app(app)
 
 # mount routers
 app.include_router(profile.router, prefix="/api/users", tags=["profile"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
+app.include_router(metrics_router)
 
 @app.get("/healthz")
 def health():
@@ -1,15 +1,18 @@
 # services/user_service/users.py
 import requests
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from pydantic import HttpUrl
 
 from common.config import settings
-from common.database import get_db
+from common.database import get_db, get_read_db
 from common.models.user import User
 from common.schemas.user_schema import User as UserSchema
-from common.schemas.user_schema import UserUpdate
+from common.schemas.user_schema import UserSearchHit, UserUpdate
 from common.security.dependencies import get_current_user
+from services.user_service.search import search_users
 
 router = APIRouter()
 
@@ -62,6 +65,20 @@ def update_my_profile(
     db.refresh(current_user)
     return current_user
 
+# ────────────────────────────────────────────────────────────
+# Typeahead for member-invite dialogs
+# ────────────────────────────────────────────────────────────
+@router.get("/search", response_model=List[UserSearchHit])
+def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=64),
+    limit: int = Query(10, ge=1, le=25),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    response.headers["Cache-Control"] = f"private, max-age={int(settings.USER_SEARCH_CACHE_TTL)}"
+    return search_users(db, q, limit)
+
 # ────────────────────────────────────────────────────────────
 # Password‑change ticket
 # ────────────────────────────────────────────────────────────
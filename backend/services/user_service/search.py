@@ -0,0 +1,100 @@
+# services/user_service/search.py
+# ──────────────────────────────────────────────────────────────────────────────
+# User typeahead for member invites.
+#   • prefix matches on username / display name come first, then fuzzy
+#     (trigram) matches by similarity – pg_trgm GIN indexes plus a
+#     text_pattern_ops index for the prefix part (migration d3a7e2b6f158)
+#   • SQLite (dev / tests) has no trigrams: prefix first, then substring
+#   • only the top `limit` rows, and identical queries within
+#     USER_SEARCH_CACHE_TTL are answered from an in-process cache – a
+#     dialog fires one request per keystroke
+# ──────────────────────────────────────────────────────────────────────────────
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional
+
+from sqlalchemy import case, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from common import metrics
+from common.config import settings
+from common.models.user import User
+
+MIN_TRIGRAM_CHARS = 3            # shorter queries only match as prefixes
+LOOKUPS = metrics.counter(
+    "user_search_cache_lookups_total", "User typeahead cache lookups", ["result"],
+)
+
+
+class TTLCache:
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl         = ttl
+        self.max_entries = max_entries
+        self._clock      = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[list]:
+        hit = self._entries.get(key)
+        if hit is None or self._clock() - hit[0] >= self.ttl:
+            self._entries.pop(key, None)
+            LOOKUPS.inc(result="miss")
+            return None
+        self._entries.move_to_end(key)
+        LOOKUPS.inc(result="hit")
+        return hit[1]
+
+    def set(self, key: Hashable, value: list) -> None:
+        self._entries[key] = (self._clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+search_cache = TTLCache(settings.USER_SEARCH_CACHE_TTL, settings.USER_SEARCH_CACHE_MAX_ENTRIES)
+
+
+def _like_prefix(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def search_users(db: Session, q: str, limit: int = 10) -> List[dict]:
+    term = " ".join(q.lower().split())
+    if not term:
+        return []
+    key = (term, limit)
+    cached = search_cache.get(key)
+    if cached is not None:
+        return cached
+
+    username = func.lower(User.username)
+    display  = func.lower(func.coalesce(User.display_name, ""))
+    pattern  = _like_prefix(term)
+    is_prefix = or_(username.like(pattern, escape="\\"), display.like(pattern, escape="\\"))
+
+    if db.get_bind().dialect.name == "postgresql":
+        similar = literal(0.0)
+        matches = is_prefix
+        if len(term) >= MIN_TRIGRAM_CHARS:
+            # `%` = similarity above pg_trgm.similarity_threshold, GIN-indexed
+            similar = func.greatest(func.similarity(username, term), func.similarity(display, term))
+            matches = or_(is_prefix, username.op("%")(term), display.op("%")(term))
+        order = (case((is_prefix, 0), else_=1), similar.desc())
+    else:
+        contains = or_(func.instr(username, term) > 0, func.instr(display, term) > 0)
+        matches  = or_(is_prefix, contains) if len(term) >= MIN_TRIGRAM_CHARS else is_prefix
+        order    = (case((is_prefix, 0), else_=1),)
+
+    rows = db.execute(
+        select(User.id, User.username, User.display_name, User.avatar_url)
+        .where(matches)
+        .order_by(*order, func.length(User.username), User.username)
+        .limit(limit)
+    ).mappings().all()
+    result = [dict(r) for r in rows]
+    search_cache.set(key, result)
+    return result
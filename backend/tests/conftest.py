@@ -2,6 +2,7 @@
 import os
 import sys
 import pytest
+from contextlib import contextmanager
 
 from fastapi import Depends
 from fastapi.testclient import TestClient
@@ -15,10 +16,15 @@ from sqlalchemy.pool import StaticPool
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 sys.path.insert(0, ROOT)
 
+# no background outbox relay threads – tests drive common.outbox.relay directly
+os.environ.setdefault("OUTBOX_RELAY_INLINE", "false")
+# AI response cache stays in memory and is emptied per test (see below)
+os.environ.setdefault("AI_CACHE_PATH", "")
+
 # ──────────────────────────────────────────────────────────────────────────────
 # 2) Pull in the shared DB & auth‐deps
 # ──────────────────────────────────────────────────────────────────────────────
-from common.database import Base, get_db
+from common.database import Base, get_db, get_read_db
 from common.security.dependencies import get_current_user
 from common.models.user import User
 
@@ -28,7 +34,13 @@ from common.models.user import User
 from services.project_service.main   import app as project_app
 from services.analytics_service.main import app as analytics_app
 from services.user_service.main      import app as user_app
+from services.notification_service.main import app as notification_app
 from services.ai_service.main        import app as ai_app, auth0_scheme
+from services.ai_service.routers.suggestions import (
+    response_cache as ai_response_cache,
+    risk_cache     as ai_risk_cache,
+)
+from services.user_service.search import search_cache as user_search_cache
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 4) Set up a single in-memory SQLite for everything
@@ -48,13 +60,14 @@ def init_db():
     import common.models.task
     import common.models.big_task
     import common.models.task_comment
+    import common.models.notification
 
     Base.metadata.create_all(ENGINE)
     yield
     Base.metadata.drop_all(ENGINE)
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 5) Override get_db for all three data services
+# 5) Override get_db / get_read_db for all data services
 # ──────────────────────────────────────────────────────────────────────────────
 def override_get_db():
     db = TestingSessionLocal()
@@ -82,10 +95,11 @@ def fake_current_user(
     return user
 
 # ──────────────────────────────────────────────────────────────────────────────
-# 7) Apply overrides to the three stateful services
+# 7) Apply overrides to the stateful services
 # ──────────────────────────────────────────────────────────────────────────────
-for _app in (project_app, analytics_app, user_app):
+for _app in (project_app, analytics_app, user_app, notification_app, ai_app):
     _app.dependency_overrides[get_db] = override_get_db
+    _app.dependency_overrides[get_read_db] = override_get_db
     _app.dependency_overrides[get_current_user] = fake_current_user
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -98,6 +112,15 @@ for route in ai_app.routes:
     if hasattr(route, "dependencies"):
         route.dependencies = []
 
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    # tests stub the OpenAI client per test – never serve a previous test's reply
+    # (SQLite also reuses project ids once the tables are cleared)
+    ai_response_cache.clear()
+    ai_risk_cache.clear()
+    user_search_cache.clear()
+    yield
+
 # ──────────────────────────────────────────────────────────────────────────────
 # 9) TestClient fixtures
 # ──────────────────────────────────────────────────────────────────────────────
@@ -113,6 +136,10 @@ def analytics_client():
 def user_client():
     return TestClient(user_app)
 
+@pytest.fixture
+def notification_client():
+    return TestClient(notification_app)
+
 @pytest.fixture
 def ai_client():
     return TestClient(ai_app)
@@ -124,3 +151,20 @@ def db():
         yield db
     finally:
         db.close()
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 10) Query budget – fail when a block runs more SQL than allowed
+#     with query_budget(4): client.get(...)
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def query_budget():
+    from common.query_stats import capture
+
+    @contextmanager
+    def _budget(max_queries: int):
+        with capture() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"query budget {max_queries} exceeded:\n{stats.report()}"
+        )
+    return _budget
@@ -5,6 +5,27 @@ from common.models.project import Project
 from common.enums import TaskStatus, Priority
 from common.models.big_task import BigTask as BigTaskModel
 from common.models.task     import Task    as TaskModel
+from common.models.user     import User
+
+
+def make_user(db, username: str, **kwargs):
+    """
+    Get-or-create a User (the users table survives between tests).
+    """
+    user = db.query(User).filter_by(username=username).first()
+    if user:
+        return user
+    params = {
+        "auth0_id": f"auth0|{username}",
+        "username": username,
+        "email":    f"{username}@example.com",
+    }
+    params.update(kwargs)
+    user = User(**params)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
 
 def make_project(db, owner_id: int, **kwargs):
     """
@@ -0,0 +1,152 @@
+# tests/index_advisor.py
+"""
+Index advisor – a pytest plugin that runs every SELECT the test-suite issues
+through EXPLAIN and reports full-table scans per endpoint.
+
+Usage (from backend/):
+    python -m pytest -p tests.index_advisor
+
+Works on SQLite (EXPLAIN QUERY PLAN → "SCAN <table>") and Postgres
+(EXPLAIN (FORMAT JSON) → "Seq Scan" nodes). Note that Postgres happily
+seq-scans tiny test tables, so SQLite gives the more useful signal here.
+"""
+import contextvars
+import json
+import re
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# (endpoint, table) → {"count": n, "sql": first statement seen}
+_findings = defaultdict(lambda: {"count": 0, "sql": ""})
+_request = contextvars.ContextVar("index_advisor_request", default=None)
+_current_test = {"nodeid": None}
+_in_explain = {"flag": False}
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+# ──────────────────────────── EXPLAIN parsing ────────────────────────────
+def _sqlite_seq_scans(cursor, statement, parameters):
+    cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+    tables = []
+    for row in cursor.fetchall():
+        m = _SQLITE_SCAN.match(row[-1].strip())
+        # anon_N are SQLAlchemy's derived tables (subqueries), not real tables
+        if m and not m.group(1).startswith("anon_"):
+            tables.append(m.group(1))
+    return tables
+
+
+def _pg_walk(node, out):
+    if node.get("Node Type") == "Seq Scan":
+        out.append(node.get("Relation Name", "?"))
+    for child in node.get("Plans", []):
+        _pg_walk(child, out)
+
+
+def _pg_seq_scans(cursor, statement, parameters):
+    cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    tables = []
+    _pg_walk(plan[0]["Plan"], tables)
+    return tables
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _explain(conn, cursor, statement, parameters, context, executemany):
+    if executemany or _in_explain["flag"]:
+        return
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return
+
+    explainer = {"sqlite": _sqlite_seq_scans, "postgresql": _pg_seq_scans}.get(conn.dialect.name)
+    if explainer is None:
+        return
+
+    _in_explain["flag"] = True
+    try:
+        raw = conn.connection.dbapi_connection.cursor()
+        try:
+            tables = explainer(raw, statement, parameters)
+        finally:
+            raw.close()
+    except Exception:
+        return
+    finally:
+        _in_explain["flag"] = False
+
+    if not tables:
+        return
+    req = _request.get()
+    if req is not None:
+        req["scans"].extend((t, statement) for t in tables)
+    else:
+        for t in tables:
+            _record(f"(test) {_current_test['nodeid']}", t, statement)
+
+
+def _record(endpoint, table, statement):
+    entry = _findings[(endpoint, table)]
+    entry["count"] += 1
+    if not entry["sql"]:
+        entry["sql"] = " ".join(statement.split())
+
+
+# ──────────────────────────── endpoint tagging ───────────────────────────
+class _EndpointTag:
+    """ASGI middleware: attributes scans to METHOD + route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        req = {"scans": []}
+        token = _request.set(req)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", scope["path"])
+            for table, statement in req["scans"]:
+                _record(f"{scope['method']} {path}", table, statement)
+
+
+def pytest_collection_finish(session):
+    # conftest has imported the apps by now; their middleware stacks are
+    # built lazily on the first request, so it's not too late to add one.
+    import sys
+    from fastapi import FastAPI
+
+    for name, module in list(sys.modules.items()):
+        if name.startswith("services.") and name.endswith(".main"):
+            app = getattr(module, "app", None)
+            if isinstance(app, FastAPI) and app.middleware_stack is None:
+                app.add_middleware(_EndpointTag)
+
+
+def pytest_runtest_setup(item):
+    _current_test["nodeid"] = item.nodeid
+
+
+# ──────────────────────────── report ─────────────────────────────────────
+def pytest_terminal_summary(terminalreporter):
+    tr = terminalreporter
+    tr.section("index advisor: full-table scans")
+    if not _findings:
+        tr.write_line("no sequential scans captured")
+        return
+    by_endpoint = defaultdict(list)
+    for (endpoint, table), entry in _findings.items():
+        by_endpoint[endpoint].append((table, entry))
+    for endpoint in sorted(by_endpoint):
+        tr.write_line(endpoint)
+        for table, entry in sorted(by_endpoint[endpoint], key=lambda x: -x[1]["count"]):
+            sql = entry["sql"]
+            tr.write_line(f"    {table:<20} x{entry['count']:<4} {sql[:140]}")
@@ -3,6 +3,7 @@
 import pytest
 from common.database import Base
 from sqlalchemy.orm import Session
+from tests.factories import make_user
 
 @pytest.fixture(autouse=True)
 def clear_database(db: Session):
@@ -17,3 +18,9 @@ def clear_database(db: Session):
             continue
         db.execute(table.delete())
     db.commit()
+
+
+@pytest.fixture
+def tester(db: Session):
+    """The user fake_current_user authenticates as – create it first so it keeps id=1."""
+    return make_user(db, "tester", auth0_id="auth0|test")
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from services.project_service.main import app as project_app
+from services.project_service.routers import admin
+from services.project_service.routers.admin import require_admin
+from common.enums import TaskStatus
+from tests.factories import make_big_task, make_project, make_task
+
+BASE = "/api/admin"
+
+
+@pytest.fixture
+def as_admin():
+    project_app.dependency_overrides[require_admin] = lambda: None
+    yield
+    project_app.dependency_overrides.pop(require_admin, None)
+
+
+def test_admin_listings_require_admin(client):
+    assert client.get(f"{BASE}/tasks/page").status_code == 403
+    assert client.get(f"{BASE}/tasks/stream").status_code == 403
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# keyset pages
+# ─────────────────────────────────────────────────────────────────────────────
+@pytest.mark.usefixtures("db", "as_admin")
+def test_task_pages_walk_the_whole_table(client, db):
+    proj = make_project(db, owner_id=1)
+    ids = [
+        make_task(db, project_id=proj.id, big_task_id=None,
+                  reporter_id=1, assignee_id=1, title=f"t{i}").id
+        for i in range(7)
+    ]
+
+    seen, after_id = [], 0
+    while True:
+        r = client.get(f"{BASE}/tasks/page", params={
+            "project_id": proj.id, "limit": 3, "after_id": after_id,
+        })
+        assert r.status_code == 200
+        page = r.json()
+        seen += [t["id"] for t in page["items"]]
+        if page["next_after_id"] is None:
+            break
+        after_id = page["next_after_id"]
+
+    assert seen == ids
+    # slim rows only – nothing nested
+    assert "project" not in page["items"][0]
+
+
+@pytest.mark.usefixtures("db", "as_admin")
+def test_task_page_filters(client, db):
+    proj = make_project(db, owner_id=1)
+    make_task(db, project_id=proj.id, big_task_id=None, reporter_id=1, assignee_id=1)
+    done = make_task(db, project_id=proj.id, big_task_id=None, reporter_id=1,
+                     assignee_id=1, status=TaskStatus.DONE)
+
+    r = client.get(f"{BASE}/tasks/page", params={"project_id": proj.id, "status": "Done"})
+    assert [t["id"] for t in r.json()["items"]] == [done.id]
+
+
+@pytest.mark.usefixtures("db", "as_admin")
+def test_project_page_includes_owner_name(client, db):
+    proj = make_project(db, owner_id=1, title="Needle in haystack")
+    client.get("/api/projects/")   # make sure the fake user exists
+
+    r = client.get(f"{BASE}/projects/page", params={"q": "needle"})
+    assert r.status_code == 200
+    rows = [p for p in r.json()["items"] if p["id"] == proj.id]
+    assert rows and rows[0]["owner_username"] == "tester"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# NDJSON streams
+# ─────────────────────────────────────────────────────────────────────────────
+@pytest.mark.usefixtures("db", "as_admin")
+def test_big_task_stream_is_ndjson(client, db, monkeypatch):
+    monkeypatch.setattr(admin, "STREAM_CHUNK", 3)   # force several chunks
+    proj = make_project(db, owner_id=1)
+    ids = [make_big_task(db, project_id=proj.id, title=f"e{i}").id for i in range(4)]
+
+    r = client.get(f"{BASE}/big-tasks/stream", params={"project_id": proj.id})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["id"] for row in rows] == ids
+    assert "tasks" not in rows[0]
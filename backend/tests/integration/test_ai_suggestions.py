@@ -1,4 +1,6 @@
 # tests/integration/test_ai_suggestions.py
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from openai import OpenAIError
@@ -17,7 +19,7 @@ def test_suggest_subtasks_success(monkeypatch, ai_client: TestClient):
     class FakeCompletion:
         def __init__(self, choices): self.choices = choices
 
-    def fake_create(model, messages, temperature, max_tokens):
+    async def fake_create(model, messages, temperature, max_tokens):
         raw = '["Design login UI", "Implement backend auth", "Write tests"]'
         return FakeCompletion([FakeChoice(FakeMessage(raw))])
 
@@ -41,10 +43,13 @@ def test_suggest_subtasks_success(monkeypatch, ai_client: TestClient):
 @pytest.mark.usefixtures("db")
 def test_suggest_subtasks_openai_error(monkeypatch, ai_client: TestClient):
     # simulate an OpenAIError
+    async def fake_error(*args, **kwargs):
+        raise OpenAIError("something went wrong")
+
     monkeypatch.setattr(
         sug_mod.client.chat.completions,
         "create",
-        lambda *args, **kwargs: (_ for _ in ()).throw(OpenAIError("something went wrong"))
+        fake_error
     )
 
     payload = {"description": "Anything valid", "n": 2}
@@ -63,7 +68,7 @@ def test_suggest_subtasks_invalid_json(monkeypatch, ai_client: TestClient):
     class FakeCompletion:
         def __init__(self, choices): self.choices = choices
 
-    def fake_create(*args, **kwargs):
+    async def fake_create(*args, **kwargs):
         return FakeCompletion([FakeChoice(FakeMessage("not a json"))])
 
     monkeypatch.setattr(
@@ -77,3 +82,108 @@ def test_suggest_subtasks_invalid_json(monkeypatch, ai_client: TestClient):
     r = ai_client.post(f"{BASE}/suggest_subtasks", json=payload, headers=headers)
     assert r.status_code == 502
     assert r.json()["detail"] == "Invalid JSON from model"
+
+@pytest.mark.usefixtures("db")
+def test_suggest_subtasks_against_stub_server(monkeypatch, ai_client: TestClient):
+    # real AsyncOpenAI over HTTP: a 429 is retried, then the reply is served
+    from services.ai_service.stub_openai import StubOpenAI
+    from services.ai_service.upstream import Upstream
+
+    async def no_sleep(_):
+        pass
+
+    stub = StubOpenAI().reply(status=429, headers={"retry-after": "0"}).reply('["Plan", "Build"]')
+    monkeypatch.setattr(sug_mod, "client", stub.client())
+    monkeypatch.setattr(sug_mod, "upstream", Upstream(sleep=no_sleep))
+
+    payload = {"description": "Launch the mobile app", "n": 2}
+    r = ai_client.post(f"{BASE}/suggest_subtasks", json=payload)
+    assert r.status_code == 200
+    assert r.json()["suggestions"] == ["Plan", "Build"]
+    assert len(stub.requests) == 2
+
+
+@pytest.mark.usefixtures("db")
+def test_suggest_subtasks_maps_limits_to_status(monkeypatch, ai_client: TestClient):
+    from services.ai_service.upstream import UpstreamBusy, UpstreamDeadline
+
+    class Refusing:
+        def __init__(self, exc): self.exc = exc
+        async def create(self, client, **kwargs): raise self.exc
+
+    payload = {"description": "Launch the mobile app", "n": 2}
+    monkeypatch.setattr(sug_mod, "upstream", Refusing(UpstreamBusy("full")))
+    assert ai_client.post(f"{BASE}/suggest_subtasks", json=payload).status_code == 503
+    monkeypatch.setattr(sug_mod, "upstream", Refusing(UpstreamDeadline("slow")))
+    assert ai_client.post(f"{BASE}/suggest_subtasks", json=payload).status_code == 504
+
+
+def _events(body: str):
+    out = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+@pytest.mark.usefixtures("db")
+def test_suggest_subtasks_stream_emits_each_item(monkeypatch, ai_client: TestClient):
+    from services.ai_service.stub_openai import StubOpenAI
+
+    stub = StubOpenAI().reply('```json\n["Plan", "Build", "Ship", "Extra"]\n```', chunk_size=3)
+    monkeypatch.setattr(sug_mod, "client", stub.client())
+
+    payload = {"description": "Launch the mobile app", "n": 3}
+    r = ai_client.post(f"{BASE}/suggest_subtasks/stream", json=payload)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert _events(r.text) == [
+        ("suggestion", {"index": 0, "text": "Plan"}),
+        ("suggestion", {"index": 1, "text": "Build"}),
+        ("suggestion", {"index": 2, "text": "Ship"}),
+        ("done",       {"count": 3, "cached": False}),
+    ]
+    assert stub.requests[0]["stream"] is True
+
+    # the streamed result fills the cache for both endpoints
+    r = ai_client.post(f"{BASE}/suggest_subtasks/stream", json=payload)
+    assert _events(r.text)[-1] == ("done", {"count": 3, "cached": True})
+    assert ai_client.post(f"{BASE}/suggest_subtasks", json=payload).json()["suggestions"] == [
+        "Plan", "Build", "Ship",
+    ]
+    assert len(stub.requests) == 1
+
+
+@pytest.mark.usefixtures("db")
+def test_suggest_subtasks_stream_reports_errors_as_events(monkeypatch, ai_client: TestClient):
+    from services.ai_service.stub_openai import StubOpenAI
+
+    stub = StubOpenAI().reply('["Plan", 42]')
+    monkeypatch.setattr(sug_mod, "client", stub.client())
+
+    payload = {"description": "Launch the mobile app", "n": 3}
+    events = _events(ai_client.post(f"{BASE}/suggest_subtasks/stream", json=payload).text)
+    assert events[0] == ("suggestion", {"index": 0, "text": "Plan"})
+    assert events[-1] == ("error", {"status": 502, "detail": "All subtasks must be strings"})
+
+    # nothing cached – the next request goes upstream again
+    stub.reply('["Plan"]')
+    events = _events(ai_client.post(f"{BASE}/suggest_subtasks/stream", json=payload).text)
+    assert events[-1] == ("done", {"count": 1, "cached": False})
+
+
+@pytest.mark.usefixtures("db")
+def test_truncated_stream_is_an_error_and_not_cached(monkeypatch, ai_client: TestClient):
+    from services.ai_service.stub_openai import StubOpenAI
+
+    stub = StubOpenAI().reply('["Plan", "Build", "Shi', times=2)   # cut off by max_tokens
+    monkeypatch.setattr(sug_mod, "client", stub.client())
+
+    payload = {"description": "Launch the mobile app", "n": 3}
+    events = _events(ai_client.post(f"{BASE}/suggest_subtasks/stream", json=payload).text)
+    assert events[-1] == ("error", {"status": 502, "detail": "Invalid JSON from model"})
+
+    # the JSON endpoint goes upstream itself instead of serving the partial list
+    r = ai_client.post(f"{BASE}/suggest_subtasks", json=payload)
+    assert r.status_code == 502
+    assert len(stub.requests) == 2
@@ -0,0 +1,69 @@
+import pytest
+
+from common.models.outbox import OutboxEvent
+from services.project_service import board_events
+from tests.factories import make_big_task, make_project, make_task
+
+TASKS = "/api/projects/tasks"
+
+
+@pytest.fixture
+def published(monkeypatch):
+    sent = []
+    monkeypatch.setattr(board_events, "enqueue_channel",
+                        lambda db, ch, payload: sent.append((ch, payload)))
+    return sent
+
+
+def _task_payload(project_id, **kw):
+    return {"title": "Card", "status": "To Do", "issue_type": "Task",
+            "priority": "Medium", "project_id": project_id, **kw}
+
+
+def test_task_writes_emit_versioned_changes(client, db, tester, published):
+    proj = make_project(db, owner_id=tester.id)
+
+    r = client.post(f"{TASKS}/", json=_task_payload(proj.id))
+    task_id = r.json()["id"]
+    (channel, created), = published
+    assert channel == f"project:{proj.id}"
+    assert created["op"] == "create" and created["id"] == task_id and created["version"] == 1
+    assert created["fields"]["title"] == "Card" and created["fields"]["creator_name"] == "tester"
+
+    published.clear()
+    client.put(f"{TASKS}/{task_id}", json=_task_payload(proj.id, status="Done", assignee_id=tester.id))
+    (_, updated), = published
+    assert updated["version"] == 2
+    # only what changed (assignee is unchanged: it defaulted to the creator)
+    assert updated["fields"] == {"status": "Done"}
+
+    published.clear()
+    client.delete(f"{TASKS}/{task_id}")
+    (_, deleted), = published
+    assert deleted["op"] == "delete" and deleted["version"] == 3
+
+    r = client.get(f"{TASKS}/", params={"project_id": proj.id})
+    assert r.headers["X-Data-Version"] == "3"
+
+
+def test_moving_a_task_notifies_both_big_task_boards(client, db, tester, published):
+    proj = make_project(db, owner_id=tester.id)
+    a, b = make_big_task(db, proj.id), make_big_task(db, proj.id)
+    t = make_task(db, proj.id, a.id, reporter_id=tester.id, assignee_id=tester.id)
+
+    client.put(f"{TASKS}/{t.id}", json=_task_payload(proj.id, title=t.title, big_task_id=b.id,
+                                                     assignee_id=tester.id))
+    channels = sorted(ch for ch, _ in published)
+    assert channels == sorted([f"project:{proj.id}", f"big_task:{a.id}", f"big_task:{b.id}"])
+    assert published[0][1]["fields"]["big_task_id"] == b.id
+    assert "title" not in published[0][1]["fields"]
+
+
+def test_rolled_back_changes_leave_no_outbox_events(db, tester):
+    proj = make_project(db, owner_id=tester.id)
+    board_events.record_change(db, "task", "update", 1, proj.id, {"status": "Done"},
+                               big_task_ids=[None])
+    db.flush()
+    assert db.query(OutboxEvent).count() == 1
+    db.rollback()
+    assert db.query(OutboxEvent).count() == 0
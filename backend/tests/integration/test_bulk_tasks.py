@@ -0,0 +1,135 @@
+# tests/integration/test_bulk_tasks.py
+import pytest
+
+from common.models.notification import Notification
+from common.models.project import Project
+from common.models.project_member import ProjectMember
+from common.models.task import Task
+from services.project_service import board_events
+from tests.factories import make_big_task, make_project, make_task, make_user
+
+BULK = "/api/projects/tasks/bulk"
+
+
+@pytest.fixture
+def published(monkeypatch):
+    sent = []
+    monkeypatch.setattr(board_events, "enqueue_channel",
+                        lambda db, ch, payload: sent.append((ch, payload)))
+    return sent
+
+
+def _create(project_id, title="Card", **kw):
+    return {"op": "create", "title": title, "status": "To Do", "issue_type": "Task",
+            "priority": "Medium", "project_id": project_id, **kw}
+
+
+def test_creates_in_one_transaction_with_one_version_bump(client, db, tester, published):
+    proj = make_project(db, owner_id=tester.id)
+
+    r = client.post(BULK, json={"items": [_create(proj.id, f"c{i}") for i in range(5)]})
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["created"], body["updated"], body["failed"]) == (5, 0, 0)
+    assert [x["status"] for x in body["results"]] == [201] * 5
+    ids = [x["id"] for x in body["results"]]
+    assert [db.get(Task, i).title for i in ids] == [f"c{i}" for i in range(5)]
+
+    db.expire_all()
+    assert db.get(Project, proj.id).data_version == 5
+    assert [p["version"] for _, p in published] == [1, 2, 3, 4, 5]
+    assert published[0][1]["fields"]["creator_name"] == "tester"
+    # tasks default to the caller – one "assigned" notification each
+    assert db.query(Notification).filter_by(user_id=tester.id).count() == 5
+
+
+def test_query_count_does_not_grow_with_items(client, db, tester, query_budget):
+    proj  = make_project(db, owner_id=tester.id)
+    epic  = make_big_task(db, proj.id)
+    tasks = [make_task(db, proj.id, None, reporter_id=tester.id, assignee_id=tester.id)
+             for _ in range(4)]
+
+    def run(n):
+        items  = [_create(proj.id, f"n{i}", big_task_id=epic.id) for i in range(n)]
+        items += [{"op": "move", "id": t.id, "big_task_id": epic.id, "status": "Done"}
+                  for t in tasks[: n // 10]]
+        with query_budget(1000) as stats:
+            r = client.post(BULK, json={"items": items})
+        assert r.json()["failed"] == 0
+        # SQLite can't batch INSERT … RETURNING (no insert sentinel), so the
+        # ORM inserts row by row here – Postgres sends them as one statement.
+        # Every lookup and update must stay constant.
+        return sum(n for shape, n in stats.shapes.items() if not shape.startswith("INSERT"))
+
+    assert run(10) == run(40)
+
+
+def test_invalid_items_are_reported_and_skipped(client, db, tester):
+    outsider = make_user(db, "bulk_outsider")
+    member   = make_user(db, "bulk_member")
+    proj     = make_project(db, owner_id=tester.id)
+    foreign  = make_project(db, owner_id=outsider.id)
+    db.add(ProjectMember(project_id=proj.id, user_id=member.id))
+    db.commit()
+    other_epic = make_big_task(db, foreign.id)
+    theirs     = make_task(db, foreign.id, None, reporter_id=outsider.id)
+    mine       = make_task(db, proj.id, None, reporter_id=tester.id, title="Keep")
+
+    items = [
+        _create(proj.id, assignee_id=member.id),                 # ok
+        _create(999_999),                                         # no project
+        _create(foreign.id),                                      # not a member
+        _create(proj.id, big_task_id=other_epic.id),              # epic of another project
+        _create(proj.id, assignee_id=outsider.id),                # assignee not on project
+        {"op": "update", "id": theirs.id, "title": "x"},          # not authorised
+        {"op": "update", "id": 999_999, "title": "x"},            # no task
+        {"op": "update", "id": mine.id, "title": None},           # required column
+        {"op": "update", "id": mine.id, "priority": "High"},      # ok
+    ]
+    body = client.post(BULK, json={"items": items}).json()
+    assert (body["created"], body["updated"], body["failed"]) == (1, 1, 7)
+    assert [(x["index"], x["status"]) for x in body["results"]] == [
+        (0, 201), (1, 404), (2, 403), (3, 400), (4, 400), (5, 403), (6, 404), (7, 422), (8, 200),
+    ]
+    assert body["results"][4]["detail"] == "Assignee is not a member of this project"
+
+    db.expire_all()
+    assert db.get(Task, theirs.id).title != "x"
+    kept = db.get(Task, mine.id)
+    assert (kept.title, kept.priority) == ("Keep", "High")
+
+
+def test_atomic_rejects_everything(client, db, tester):
+    proj = make_project(db, owner_id=tester.id)
+
+    r = client.post(BULK, json={"atomic": True,
+                                "items": [_create(proj.id), _create(999_999)]})
+    assert r.status_code == 400
+    assert r.json()["detail"]["errors"] == [
+        {"index": 1, "ok": False, "status": 404, "detail": "Project not found"},
+    ]
+    assert db.query(Task).filter_by(project_id=proj.id).count() == 0
+
+
+def test_move_between_epics_notifies_both_boards(client, db, tester, published):
+    assignee = make_user(db, "bulk_mover")
+    proj = make_project(db, owner_id=tester.id)
+    a, b = make_big_task(db, proj.id), make_big_task(db, proj.id)
+    t = make_task(db, proj.id, a.id, reporter_id=tester.id, assignee_id=assignee.id)
+
+    r = client.post(BULK, json={"items": [{"op": "move", "id": t.id, "big_task_id": b.id,
+                                           "status": "In Progress"}]})
+    assert r.json()["results"][0]["status"] == 200
+    # the untouched assignee isn't re-checked against the new epic
+    channels = sorted(ch for ch, _ in published)
+    assert channels == sorted([f"project:{proj.id}", f"big_task:{a.id}", f"big_task:{b.id}"])
+    assert published[0][1]["fields"] == {"big_task_id": b.id, "status": "In Progress"}
+
+    note, = db.query(Notification).filter_by(user_id=assignee.id).all()
+    assert "from To Do to In Progress" in note.message
+
+
+def test_request_validation(client, tester):
+    assert client.post(BULK, json={"items": []}).status_code == 422
+    assert client.post(BULK, json={"items": [{"op": "delete", "id": 1}]}).status_code == 422
+    assert client.post(BULK, json={"items": [{"op": "move", "id": 1}]}).status_code == 422
@@ -0,0 +1,37 @@
+from common.models.big_task_member import BigTaskMember
+from common.models.project_member import ProjectMember
+from tests.factories import make_big_task, make_project, make_user
+
+BASE = "/api/projects/channels"
+
+
+def test_owner_and_members_may_watch_a_project(client, db, tester):
+    other = make_user(db, "channel-owner")
+    mine   = make_project(db, owner_id=tester.id)
+    theirs = make_project(db, owner_id=other.id)
+
+    assert client.get(f"{BASE}/project:{mine.id}/access").status_code == 200
+    assert client.get(f"{BASE}/project:{theirs.id}/access").status_code == 403
+
+    db.add(ProjectMember(project_id=theirs.id, user_id=tester.id))
+    db.commit()
+    assert client.get(f"{BASE}/project:{theirs.id}/access").status_code == 200
+
+
+def test_big_task_needs_big_task_membership(client, db, tester):
+    other = make_user(db, "channel-owner")
+    proj  = make_project(db, owner_id=other.id)
+    bt    = make_big_task(db, project_id=proj.id)
+    db.add(ProjectMember(project_id=proj.id, user_id=tester.id))
+    db.commit()
+
+    assert client.get(f"{BASE}/big_task:{bt.id}/access").status_code == 403
+
+    db.add(BigTaskMember(big_task_id=bt.id, user_id=tester.id))
+    db.commit()
+    assert client.get(f"{BASE}/big_task:{bt.id}/access").status_code == 200
+
+
+def test_unknown_channels(client, db, tester):
+    assert client.get(f"{BASE}/project:999999/access").status_code == 404
+    assert client.get(f"{BASE}/users:1/access").status_code == 400
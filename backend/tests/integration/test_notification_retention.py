@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from common.config import settings
+from common.models.notification import Notification, NotificationArchive
+from services.notification_service.retention import RetentionPolicy, run_retention
+from tests.factories import make_user
+
+NOW = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _note(db, user, days_old, read):
+    note = Notification(user_id=user.id, message=f"{days_old}d read={read}", read=read,
+                        created_at=NOW - timedelta(days=days_old))
+    db.add(note)
+    db.commit()
+    return note.id
+
+
+@pytest.mark.usefixtures("db")
+def test_retention_archives_by_age_and_read_state_in_batches(db):
+    user = make_user(db, "retention_user")
+    fresh_read     = _note(db, user, 5, True)
+    old_read       = [_note(db, user, 40, True) for _ in range(5)]
+    old_unread     = _note(db, user, 40, False)
+    ancient_unread = _note(db, user, 400, False)
+
+    policy = RetentionPolicy(read_ttl_days=30, unread_ttl_days=180, batch_size=2)
+    result = run_retention(db, policy, now=NOW)
+
+    expired = set(old_read) | {ancient_unread}
+    assert result["expired"] == len(expired)
+    remaining = {n.id for n in db.query(Notification).filter_by(user_id=user.id)}
+    assert remaining == {fresh_read, old_unread}
+
+    archived = db.query(NotificationArchive).filter(NotificationArchive.id.in_(expired)).all()
+    assert {a.id for a in archived} == expired
+    assert all(a.user_id == user.id for a in archived)
+
+
+@pytest.mark.usefixtures("db")
+def test_archive_is_purged_and_delete_mode_skips_it(db):
+    user = make_user(db, "retention_user2")
+    note_id = _note(db, user, 100, True)
+
+    run_retention(db, RetentionPolicy(archive=False), now=NOW)
+    assert db.get(Notification, note_id) is None
+    assert db.get(NotificationArchive, note_id) is None
+
+    db.add(NotificationArchive(id=10_000_001, user_id=user.id, message="x", read=True,
+                               archived_at=NOW - timedelta(days=400)))
+    db.commit()
+    result = run_retention(db, RetentionPolicy(archive_ttl_days=365), now=NOW)
+    assert result["purged"] >= 1
+    assert db.get(NotificationArchive, 10_000_001) is None
+
+
+def test_policy_reads_the_batch_cap_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_RETENTION_MAX_BATCHES", 7)
+    assert RetentionPolicy.from_settings().max_batches == 7
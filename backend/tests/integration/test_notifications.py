@@ -0,0 +1,168 @@
+import pytest
+from common.models.notification import Notification
+
+BASE = "/api/notifications"
+
+
+def _seed(client, db, n, read=False):
+    client.get(f"{BASE}/unread_count")        # make sure the fake user exists
+    notes = [Notification(user_id=1, message=f"note {i}", read=read) for i in range(n)]
+    db.add_all(notes)
+    db.commit()
+    return [note.id for note in notes]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CURSOR PAGINATION
+# ─────────────────────────────────────────────────────────────────────────────
+@pytest.mark.usefixtures("db")
+def test_inbox_pages_newest_first(notification_client, db):
+    ids = _seed(notification_client, db, 5)
+
+    r = notification_client.get(f"{BASE}/", params={"limit": 3})
+    first = [n["id"] for n in r.json()]
+    assert first == sorted(ids, reverse=True)[:3]
+
+    r = notification_client.get(f"{BASE}/", params={"limit": 3, "before_id": first[-1]})
+    second = [n["id"] for n in r.json()]
+    assert second[:2] == sorted(ids, reverse=True)[3:]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# UNREAD COUNT / BULK MARK-READ
+# ─────────────────────────────────────────────────────────────────────────────
+@pytest.mark.usefixtures("db")
+def test_unread_count_and_read_all(notification_client, db):
+    notification_client.post(f"{BASE}/read_all")
+    ids = _seed(notification_client, db, 3)
+
+    assert notification_client.get(f"{BASE}/unread_count").json() == {"unread": 3}
+
+    r = notification_client.post(f"{BASE}/{ids[0]}/read")
+    assert r.status_code == 200
+    assert notification_client.get(f"{BASE}/unread_count").json() == {"unread": 2}
+
+    r = notification_client.post(f"{BASE}/read_all")
+    assert sorted(r.json()["ids"]) == ids[1:]
+    assert notification_client.get(f"{BASE}/unread_count").json() == {"unread": 0}
+
+    r = notification_client.post(f"{BASE}/read_all")
+    assert r.json()["detail"] == "no unread notifications"
+
+
+@pytest.mark.usefixtures("db")
+def test_unread_only_returns_and_marks_in_one_go(notification_client, db, query_budget):
+    notification_client.post(f"{BASE}/read_all")
+    ids = _seed(notification_client, db, 4)
+
+    with query_budget(4):
+        r = notification_client.get(f"{BASE}/", params={"unread_only": True})
+    body = r.json()
+    assert [n["id"] for n in body] == sorted(ids, reverse=True)
+    assert all(n["read"] for n in body)
+    assert notification_client.get(f"{BASE}/unread_count").json() == {"unread": 0}
+
+
+@pytest.mark.usefixtures("db")
+def test_unread_only_marks_one_page_at_a_time(notification_client, db):
+    notification_client.post(f"{BASE}/read_all")
+    ids = sorted(_seed(notification_client, db, 5), reverse=True)
+
+    r = notification_client.get(f"{BASE}/", params={"unread_only": True, "limit": 2})
+    assert [n["id"] for n in r.json()] == ids[:2]
+    assert notification_client.get(f"{BASE}/unread_count").json() == {"unread": 3}
+
+    r = notification_client.get(f"{BASE}/", params={"unread_only": True, "limit": 2,
+                                                     "before_id": ids[3]})
+    assert [n["id"] for n in r.json()] == ids[4:]
+    assert notification_client.get(f"{BASE}/unread_count").json() == {"unread": 2}
+
+
+@pytest.mark.usefixtures("db")
+def test_mark_read_unknown_or_already_read(notification_client, db):
+    (note_id,) = _seed(notification_client, db, 1, read=True)
+    assert notification_client.post(f"{BASE}/{note_id}/read").status_code == 200
+    assert notification_client.post(f"{BASE}/999999/read").status_code == 404
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# REALTIME UNREAD DELTAS / SYNC
+# ─────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def pushed(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        "services.notification_service.events.enqueue_message",
+        lambda db, uid, payload: sent.append(payload),
+    )
+    return sent
+
+
+@pytest.mark.usefixtures("db")
+def test_notify_pushes_id_and_unread_count(db, pushed):
+    from services.notification_service.events import _notify
+    from tests.factories import make_user
+
+    user = make_user(db, "push_target")
+    _notify(db, user, "first")
+    _notify(db, user, "second")
+
+    assert [p["unread"] for p in pushed] == [1, 2]
+    assert pushed[1]["type"] == "notification" and pushed[1]["id"] > pushed[0]["id"]
+
+
+@pytest.mark.usefixtures("db")
+def test_overdue_sweep_notifies_in_one_batch(db, pushed, query_budget):
+    from common.models.task import Task
+    from services.notification_service.events import tasks_overdue
+    from tests.factories import make_project, make_task, make_user
+
+    ann, ben = make_user(db, "overdue_ann"), make_user(db, "overdue_ben")
+    proj = make_project(db, owner_id=ann.id)
+
+    def sweep(n):
+        ids = [make_task(db, proj.id, None, reporter_id=ann.id,
+                         assignee_id=(ann if i % 2 else ben).id, title=f"late {i}").id
+               for i in range(n)]
+        tasks = db.query(Task).filter(Task.id.in_(ids)).order_by(Task.id).all()
+        pushed.clear()
+        with query_budget(50) as stats:
+            tasks_overdue(db, tasks)
+            db.flush()
+        db.commit()
+        return sum(n for shape, n in stats.shapes.items() if not shape.startswith("INSERT"))
+
+    assert sweep(2) == sweep(8)                  # users + one grouped unread count
+    ann_unread = [p["unread"] for p, t in zip(pushed, range(8)) if t % 2]
+    assert ann_unread == sorted(ann_unread) and len(set(ann_unread)) == 4
+
+
+@pytest.mark.usefixtures("db")
+def test_mark_read_pushes_unread_delta(notification_client, db, pushed):
+    notification_client.post(f"{BASE}/read_all")
+    ids = _seed(notification_client, db, 2)
+    pushed.clear()
+
+    notification_client.post(f"{BASE}/{ids[0]}/read")
+    notification_client.post(f"{BASE}/read_all")
+    notification_client.post(f"{BASE}/read_all")     # nothing left → no push
+
+    assert pushed == [
+        {"type": "unread", "unread": 1, "read_ids": [ids[0]]},
+        {"type": "unread", "unread": 0, "read_ids": [ids[1]]},
+    ]
+
+
+@pytest.mark.usefixtures("db")
+def test_sync_returns_only_missed_notifications(notification_client, db):
+    ids = _seed(notification_client, db, 3)
+
+    r = notification_client.get(f"{BASE}/sync", params={"since": ids[0]})
+    body = r.json()
+    assert [n["id"] for n in body["items"]] == ids[1:]
+    assert body["last_id"] == ids[-1]
+    assert body["has_more"] is False
+    assert body["unread"] >= 2
+
+    r = notification_client.get(f"{BASE}/sync", params={"since": ids[-1]})
+    assert r.json()["items"] == [] and r.json()["last_id"] == ids[-1]
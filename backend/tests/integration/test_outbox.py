@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from common import outbox
+from common.models.notification import Notification
+from common.models.outbox import OutboxEvent
+from services.notification_service.events import _notify
+from tests.factories import make_project
+
+TASKS = "/api/projects/tasks"
+
+
+def test_notification_and_push_commit_together(db, tester):
+    _notify(db, tester, "kept")
+    db.commit()
+    _notify(db, tester, "rolled back")
+    db.rollback()
+
+    assert [n.message for n in db.query(Notification)] == ["kept"]
+    (event,) = db.query(OutboxEvent).all()
+    assert event.target == "auth0|test" and event.payload["message"] == "kept"
+
+
+def test_create_task_writes_task_notification_and_events_at_once(client, db, tester):
+    proj = make_project(db, owner_id=tester.id)
+    r = client.post(f"{TASKS}/", json={
+        "title": "T", "issue_type": "Task", "priority": "Medium", "project_id": proj.id,
+    })
+    assert r.status_code == 201
+
+    kinds = sorted((e.target_kind, e.payload["type"]) for e in db.query(OutboxEvent))
+    assert kinds == [("channel", "change"), ("user", "notification")]
+
+
+def test_relay_delivers_in_order_and_deletes(db, tester):
+    for i in range(3):
+        outbox.enqueue_channel(db, "project:1", {"n": i})
+    db.commit()
+
+    batches = []
+    assert outbox.relay(db, batch_size=2, send=batches.append) == 3
+
+    assert [[item["msg"]["n"] for item in b] for b in batches] == [[0, 1], [2]]
+    assert all(item["key"] and item["kind"] == "channel" for b in batches for item in b)
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_failed_delivery_backs_off_then_gives_up(db, tester, monkeypatch):
+    monkeypatch.setattr(outbox.settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    outbox.enqueue_message(db, "auth0|test", {"type": "unread", "unread": 0})
+    db.commit()
+
+    def down(items):
+        raise RuntimeError("gateway down")
+
+    now = datetime.utcnow()
+    assert outbox.relay_batch(db, send=down, now=now) == 0
+    (event,) = db.query(OutboxEvent).all()
+    assert event.attempts == 1 and event.available_at > now
+
+    # not due yet → untouched
+    assert outbox.relay_batch(db, send=down, now=now) == 0
+    assert db.query(OutboxEvent).one().attempts == 1
+
+    assert outbox.relay_batch(db, send=down, now=now + timedelta(hours=1)) == 1
+    assert db.query(OutboxEvent).count() == 0
+
+
+def test_backing_off_row_holds_back_newer_rows_for_its_target(db, tester):
+    outbox.enqueue_message(db, "auth0|test", {"type": "unread", "unread": 1})
+    db.commit()
+
+    def down(items):
+        raise RuntimeError("gateway down")
+
+    now = datetime.utcnow()
+    outbox.relay_batch(db, send=down, now=now)             # first row backs off
+
+    outbox.enqueue_message(db, "auth0|test", {"type": "unread", "unread": 2})
+    outbox.enqueue_channel(db, "project:1", {"n": 0})
+    db.commit()
+
+    sent = []                                  # 1s later: new rows due, first row still waiting
+    assert outbox.relay_batch(db, send=sent.extend, now=now + timedelta(seconds=1)) == 1
+    assert [item["target"] for item in sent] == ["project:1"]  # other targets flow
+
+    sent.clear()
+    outbox.relay(db, send=sent.extend, now=now + timedelta(hours=1))
+    assert [item["msg"]["unread"] for item in sent] == [1, 2]  # still in order
+
+
+def test_rows_in_flight_hold_back_a_concurrent_relay(db, tester):
+    outbox.enqueue_message(db, "auth0|test", {"type": "unread", "unread": 1})
+    db.commit()
+
+    other = sessionmaker(bind=db.get_bind())()
+    now = datetime.utcnow()
+    order, second = [], []
+
+    def send_first(items):
+        # relay B runs while A's request is still out, after a newer row came in
+        outbox.enqueue_message(other, "auth0|test", {"type": "unread", "unread": 2})
+        outbox.enqueue_channel(other, "project:1", {"n": 0})
+        other.commit()
+        later = now + timedelta(seconds=1)             # new rows due, A's lease still held
+        assert outbox.relay_batch(other, send=second.extend, now=later) == 1
+        raise RuntimeError("gateway down")
+
+    try:
+        assert outbox.relay_batch(db, send=send_first, now=now) == 0
+        assert [item["target"] for item in second] == ["project:1"]   # other targets flow
+
+        # A's row backs off and is still first in line for its target
+        assert outbox.relay(other, send=order.extend, now=now + timedelta(seconds=1)) == 0
+        outbox.relay(other, send=order.extend, now=now + timedelta(hours=1))
+        assert [item["msg"]["unread"] for item in order] == [1, 2]
+    finally:
+        other.close()
+
+
+def test_expired_lease_is_picked_up_again(db, tester):
+    outbox.enqueue_message(db, "auth0|test", {"type": "unread", "unread": 1})
+    db.commit()
+    now = datetime.utcnow()
+
+    # a relay that leased the row and died never reports back
+    assert outbox._claim(db, 10, now)
+    assert outbox.relay_batch(db, send=list, now=now) == 0
+
+    lease = timedelta(seconds=outbox.settings.OUTBOX_LEASE_SECONDS)
+    assert outbox.relay_batch(db, send=list, now=now + lease) == 1
+    assert db.query(OutboxEvent).count() == 0
@@ -0,0 +1,124 @@
+# tests/integration/test_query_budgets.py
+"""
+Query budgets per endpoint – a new N+1 shows up here as a failed budget.
+Budgets include the fake-auth user lookup.
+"""
+import pytest
+from common.models.project_member import ProjectMember
+from tests.factories import make_big_task, make_project, make_task, make_user
+
+TASKS = "/api/projects/tasks"
+BIG_TASKS = "/api/projects/big_tasks/big_tasks"
+COMMENTS = "/api/projects/task_comments"
+PROJECTS = "/api/projects"
+EXPORT = "/api/analytics/export"
+
+
+@pytest.mark.usefixtures("db")
+def test_comment_notifications_budget(client, db, tester, query_budget):
+    reporter = make_user(db, "budget_reporter")
+    assignee = make_user(db, "budget_assignee")
+    proj = make_project(db, owner_id=tester.id)
+    task = make_task(
+        db, project_id=proj.id, big_task_id=None,
+        reporter_id=reporter.id, assignee_id=assignee.id,
+    )
+
+    # recipients are loaded with one IN query and their notifications share
+    # one flush and one grouped unread count
+    with query_budget(11):
+        r = client.post(f"{COMMENTS}/", json={"task_id": task.id, "content": "hi"})
+    assert r.status_code == 200
+
+
+def _tasks_with_distinct_people(db, project_id, n, big_task_id=None):
+    for i in range(n):
+        reporter = make_user(db, f"budget_rep_{i}")
+        assignee = make_user(db, f"budget_asg_{i}")
+        make_task(db, project_id=project_id, big_task_id=big_task_id,
+                  reporter_id=reporter.id, assignee_id=assignee.id, title=f"t{i}")
+
+
+@pytest.mark.usefixtures("db")
+def test_list_tasks_loads_people_in_bulk(client, db, tester, query_budget):
+    proj = make_project(db, owner_id=tester.id)
+    _tasks_with_distinct_people(db, proj.id, 15)
+
+    with query_budget(8) as stats:
+        r = client.get(f"{TASKS}/?project_id={proj.id}")
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body) == 15
+    assert {t["creator_name"] for t in body} == {f"budget_rep_{i}" for i in range(15)}
+    assert {t["assignee_name"] for t in body} == {f"budget_asg_{i}" for i in range(15)}
+    assert stats.max_repeat() < 5
+
+
+@pytest.mark.usefixtures("db")
+def test_list_big_tasks_loads_tasks_in_bulk(client, db, tester, query_budget):
+    proj = make_project(db, owner_id=tester.id)
+    for _ in range(3):
+        bt = make_big_task(db, project_id=proj.id)
+        _tasks_with_distinct_people(db, proj.id, 5, big_task_id=bt.id)
+
+    with query_budget(10) as stats:
+        r = client.get(f"{BIG_TASKS}/?project_id={proj.id}")
+    assert r.status_code == 200
+    assert sum(len(bt["tasks"]) for bt in r.json()) == 15
+    assert stats.max_repeat() < 5
+
+
+
+@pytest.mark.usefixtures("db")
+def test_task_detail_budget(client, db, tester, query_budget):
+    proj = make_project(db, owner_id=tester.id)
+    reporter = make_user(db, "budget_detail_rep")
+    task = make_task(db, project_id=proj.id, big_task_id=None,
+                     reporter_id=reporter.id, assignee_id=tester.id)
+
+    with query_budget(7):
+        r = client.get(f"{TASKS}/{task.id}")
+    assert r.status_code == 200
+
+
+@pytest.mark.usefixtures("db")
+def test_list_projects_loads_members_in_bulk(client, db, tester, query_budget):
+    other = make_user(db, "budget_proj_owner")
+    for i in range(3):
+        make_project(db, owner_id=tester.id, title=f"own {i}")
+        shared = make_project(db, owner_id=other.id, title=f"shared {i}")
+        db.add(ProjectMember(project_id=shared.id, user_id=tester.id))
+    db.commit()
+
+    with query_budget(3):
+        r = client.get(f"{PROJECTS}/")
+    assert r.status_code == 200 and len(r.json()) == 6
+
+    with query_budget(7):
+        r = client.get(f"{PROJECTS}/{shared.id}")
+    assert r.status_code == 200
+
+
+@pytest.mark.usefixtures("db")
+def test_big_task_detail_budget(client, db, tester, query_budget):
+    proj = make_project(db, owner_id=tester.id)
+    bt = make_big_task(db, project_id=proj.id)
+    _tasks_with_distinct_people(db, proj.id, 5, big_task_id=bt.id)
+
+    with query_budget(8) as stats:
+        r = client.get(f"{BIG_TASKS}/{bt.id}")
+    assert r.status_code == 200 and len(r.json()["tasks"]) == 5
+    assert stats.max_repeat() < 5
+
+
+@pytest.mark.usefixtures("db")
+def test_export_by_project_does_not_grow_with_projects(analytics_client, db, tester, query_budget):
+    url = f"{EXPORT}?export_type=dashboard&by_project=true&file_format=json"
+    for total in (2, 10):
+        while len(analytics_client.get(url).json()) < total:
+            p = make_project(db, owner_id=tester.id, title="export")
+            make_big_task(db, project_id=p.id)
+            make_task(db, project_id=p.id, big_task_id=None, reporter_id=tester.id)
+        with query_budget(5):
+            r = analytics_client.get(url)
+        assert r.status_code == 200 and len(r.json()) == total
@@ -0,0 +1,127 @@
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from services.realtime_gateway import main as gateway
+from services.realtime_gateway.idempotency import RecentKeys
+from services.realtime_gateway.replay import ReplayBuffer
+
+SECRET = {"secret": "dev-secret"}
+
+
+@pytest.fixture
+def gw(monkeypatch):
+    monkeypatch.setattr(gateway, "replay_buffer", ReplayBuffer())
+    monkeypatch.setattr(gateway, "INTERNAL_SECRET", "dev-secret")
+    with TestClient(gateway.app) as client:
+        yield client
+
+
+def _token(sub):
+    return jwt.encode({"sub": sub}, "unused", algorithm="HS256")
+
+
+def _publish(gw, uid, msg):
+    r = gw.post("/publish", params={"uid": uid}, json=msg, headers=SECRET)
+    assert r.status_code == 200
+
+
+def test_live_messages_carry_seq(gw):
+    with gw.websocket_connect(f"/ws?token={_token('u1')}") as ws:
+        _publish(gw, "u1", {"type": "notification", "message": "hi"})
+        msg = ws.receive_json()
+    assert msg["message"] == "hi" and msg["seq"] >= 1
+
+
+def test_reconnect_with_since_replays_missed_messages(gw):
+    with gw.websocket_connect(f"/ws?token={_token('u2')}") as ws:
+        _publish(gw, "u2", {"type": "notification", "message": "one"})
+        last = ws.receive_json()["seq"]
+
+    # offline: nothing is dropped, it waits in the buffer
+    _publish(gw, "u2", {"type": "notification", "message": "two"})
+    _publish(gw, "u2", {"type": "notification", "message": "three"})
+    _publish(gw, "u2", {"type": "notification", "message": "done"})   # sentinel
+
+    with gw.websocket_connect(f"/ws?token={_token('u2')}&since={last}") as ws:
+        got = [ws.receive_json()["message"] for _ in range(3)]
+    assert got == ["two", "three", "done"]
+
+
+def test_unknown_history_asks_client_to_resync(gw):
+    with gw.websocket_connect(f"/ws?token={_token('u3')}&since=999") as ws:
+        assert ws.receive_json()["type"] == "resync"
+
+
+# ───────────── channel subscriptions ─────────────
+@pytest.fixture
+def access(monkeypatch):
+    """Channels the fake project service lets anyone watch."""
+    allowed = {"project:1"}
+
+    async def check(token, channel):
+        return channel in allowed
+
+    monkeypatch.setattr(gateway, "check_channel_access", check)
+    return allowed
+
+
+def _publish_channel(gw, channel, msg, headers=SECRET):
+    return gw.post("/publish/channel", params={"channel": channel}, json=msg, headers=headers)
+
+
+def test_subscribed_sockets_get_channel_messages(gw, access):
+    with gw.websocket_connect(f"/ws?token={_token('c1')}") as a, \
+         gw.websocket_connect(f"/ws?token={_token('c2')}") as b:
+        for ws in (a, b):
+            ws.send_json({"type": "subscribe", "channel": "project:1"})
+            assert ws.receive_json() == {"type": "subscribed", "channel": "project:1"}
+
+        r = _publish_channel(gw, "project:1", {"type": "task", "task_id": 5})
+        assert r.json()["sockets"] == 2
+        for ws in (a, b):
+            assert ws.receive_json() == {"type": "task", "task_id": 5, "channel": "project:1"}
+
+        a.send_json({"type": "unsubscribe", "channel": "project:1"})
+        assert a.receive_json()["type"] == "unsubscribed"
+        assert _publish_channel(gw, "project:1", {"type": "task"}).json()["sockets"] == 1
+
+    assert gateway.channels == {}
+
+
+def test_subscribe_without_access_is_refused(gw, access):
+    with gw.websocket_connect(f"/ws?token={_token('c3')}") as ws:
+        ws.send_json({"type": "subscribe", "channel": "project:2"})
+        assert ws.receive_json()["type"] == "subscribe_error"
+        ws.send_json({"type": "subscribe", "channel": "users:1"})
+        assert ws.receive_json() == {
+            "type": "subscribe_error", "channel": "users:1", "detail": "unknown channel",
+        }
+    assert _publish_channel(gw, "project:2", {"type": "task"}).json()["sockets"] == 0
+
+
+def test_channel_publish_needs_the_internal_secret(gw):
+    assert _publish_channel(gw, "project:1", {}, headers={"secret": "nope"}).status_code == 403
+    assert _publish_channel(gw, "nope", {}).status_code == 400
+
+
+# ───────────── outbox batches ─────────────
+def test_batch_publish_skips_already_seen_keys(gw, access, monkeypatch):
+    monkeypatch.setattr(gateway, "recent_keys", RecentKeys())
+    batch = {"items": [
+        {"key": "k1", "kind": "user", "target": "b1", "msg": {"type": "notification", "message": "x"}},
+        {"key": "k2", "kind": "channel", "target": "project:1", "msg": {"type": "change"}},
+    ]}
+    with gw.websocket_connect(f"/ws?token={_token('b1')}") as ws:
+        ws.send_json({"type": "subscribe", "channel": "project:1"})
+        assert ws.receive_json()["type"] == "subscribed"
+
+        r = gw.post("/publish/batch", json=batch, headers=SECRET)
+        assert r.json() == {"published": 2, "duplicates": 0}
+        # relay retried the same batch (lost response): nothing goes out twice
+        r = gw.post("/publish/batch", json=batch, headers=SECRET)
+        assert r.json() == {"published": 0, "duplicates": 2}
+        _publish(gw, "b1", {"type": "notification", "message": "sentinel"})
+
+        got = [ws.receive_json() for _ in range(3)]
+    assert [m.get("message") or m["type"] for m in got] == ["x", "change", "sentinel"]
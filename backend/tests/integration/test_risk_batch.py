@@ -0,0 +1,167 @@
+# tests/integration/test_risk_batch.py
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+import services.ai_service.routers.suggestions as sug_mod
+from common.models.project import Project
+from common.models.risk_report import ProjectRiskReport
+from services.ai_service.fake_openai import FakeOpenAI
+from services.ai_service.risk_batch import (
+    BatchPolicy, RateLimiter, run_risk_batch, save_report, select_candidates,
+)
+from tests.factories import make_project, make_task
+
+BASE = "/api/ai"
+NOW  = datetime.now(timezone.utc)
+
+
+def _project(db, title, touched_days_ago, **kw):
+    p = make_project(db, owner_id=1, title=title, **kw)
+    make_task(db, project_id=p.id, big_task_id=None, reporter_id=1, title=f"{title} task",
+              due_date=datetime(2000, 1, 1), updated_at=NOW - timedelta(days=touched_days_ago))
+    return p.id
+
+
+def test_candidates_are_active_outdated_projects_most_recent_first(db):
+    old_busy  = _project(db, "old", 5)
+    recent    = _project(db, "recent", 1)
+    _project(db, "finished", 1, status="DONE")
+    _project(db, "dormant", 60)
+    reported  = _project(db, "reported", 0)
+    save_report(db, reported, "auto", 0, {"project_title": "reported"}, NOW)
+
+    policy = BatchPolicy(active_days=14)
+    assert select_candidates(db, policy, "auto", NOW, limit=10) == [recent, old_busy]
+    assert select_candidates(db, policy, "auto", NOW, limit=1) == [recent]
+    assert select_candidates(db, policy, "auto", NOW, limit=10, exclude=[recent]) == [old_busy]
+
+    # the stored report goes out of date with the project …
+    db.query(Project).filter(Project.id == reported).update({Project.data_version: 1})
+    db.commit()
+    assert select_candidates(db, policy, "auto", NOW, limit=10)[0] == reported
+    # … or simply with age
+    save_report(db, reported, "auto", 1, {"project_title": "reported"}, NOW - timedelta(hours=1))
+    assert reported in select_candidates(db, policy, "auto", NOW, limit=10)
+
+
+def test_concurrent_saves_keep_the_newest_version(db):
+    project_id = _project(db, "racy", 0)
+    # neither builder reads first – two first inserts for one key can't collide
+    with Session(bind=db.get_bind()) as other:
+        assert save_report(other, project_id, "auto", 2, {"v": "2"}, NOW)
+    assert save_report(db, project_id, "auto", 1, {"v": "1"}, NOW) is False
+    assert save_report(db, project_id, "auto", 2, {"v": "2b"}, NOW)
+    db.expire_all()
+    row = db.get(ProjectRiskReport, (project_id, "auto"))
+    assert (row.data_version, row.report) == (2, {"v": "2b"})
+
+
+def test_analyze_risks_answers_when_storing_the_report_fails(monkeypatch, ai_client, db):
+    project_id = _project(db, "unstored", 0)
+
+    def locked(*args, **kwargs):
+        raise OperationalError("INSERT INTO project_risk_reports", {}, Exception("locked"))
+
+    monkeypatch.setattr(sug_mod, "save_report", locked)
+    monkeypatch.setattr(sug_mod, "client", FakeOpenAI('{"summary": "Slipping."}'))
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": project_id})
+    assert r.status_code == 200
+    assert r.headers["X-Risk-Cache"] == "miss"
+    assert db.get(ProjectRiskReport, (project_id, "auto")) is None
+
+
+def test_batch_builds_in_bounded_parallel_and_persists(monkeypatch, db):
+    ids = [_project(db, f"p{i}", i) for i in range(5)]
+    fake = FakeOpenAI('{"summary": "Slipping."}', delay=0.01)
+    monkeypatch.setattr(sug_mod, "client", fake)
+
+    # the test engine is one shared SQLite connection: let the workers'
+    # sessions take turns on it (the narration awaits still overlap)
+    db_turn = threading.Lock()
+    run_in_threadpool = sug_mod.run_in_threadpool
+
+    def one_at_a_time(fn, *args):
+        def locked():
+            with db_turn:
+                return fn(*args)
+        return run_in_threadpool(locked)
+    monkeypatch.setattr(sug_mod, "run_in_threadpool", one_at_a_time)
+
+    running, peak, throttled = 0, 0, []
+
+    class CountingLimiter(RateLimiter):
+        async def acquire(self):
+            throttled.append(1)
+
+    async def build(project_id, limiter):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await sug_mod.build_risk_report(db.get_bind(), project_id, "auto",
+                                                   throttle=limiter)
+        finally:
+            running -= 1
+
+    policy = BatchPolicy(batch_size=2, workers=2)
+    result = asyncio.run(run_risk_batch(db.get_bind(), build, policy, limiter=CountingLimiter(60)))
+
+    assert result == {"built": 5, "failed": 0}
+    assert peak <= 2
+    assert len(throttled) == len(fake.calls) == 5
+    rows = {r.project_id: r for r in db.query(ProjectRiskReport).filter_by(mode="auto")}
+    assert set(rows) == set(ids)
+    assert rows[ids[0]].report["summary"] == "Slipping."
+
+    # nothing changed → nothing to do
+    again = asyncio.run(run_risk_batch(db.get_bind(), build, policy, limiter=CountingLimiter(60)))
+    assert again == {"built": 0, "failed": 0}
+
+
+def test_analyze_risks_serves_the_precomputed_report(monkeypatch, ai_client, db):
+    project_id = _project(db, "warm", 0)
+    save_report(db, project_id, "auto", 0, {
+        "project_title": "warm", "total_risks": 0, "risk_alerts": [],
+        "summary": "Precomputed.", "data_version": 0,
+    }, NOW - timedelta(seconds=5))
+    fake = FakeOpenAI('{"summary": "Fresh narrative."}')
+    monkeypatch.setattr(sug_mod, "client", fake)
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": project_id})
+    assert r.headers["X-Risk-Cache"] == "fresh"
+    assert r.json()["summary"] == "Precomputed."
+    assert fake.calls == []
+
+    # outdated row → served once while rebuilt (and re-persisted) in the background
+    sug_mod.risk_cache.clear()
+    db.query(Project).filter(Project.id == project_id).update({Project.data_version: 1})
+    db.commit()
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": project_id})
+    assert r.headers["X-Risk-Cache"] == "stale"
+    assert r.json()["summary"] == "Precomputed."
+    db.expire_all()
+    row = db.get(ProjectRiskReport, (project_id, "auto"))
+    assert row.data_version == 1 and row.report["summary"] == "Fresh narrative."
+
+
+def test_rate_limiter_spaces_out_acquisitions():
+    clock = [0.0]
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+        clock[0] += seconds
+
+    limiter = RateLimiter(30, clock=lambda: clock[0], sleep=sleep)   # one every 2 s
+
+    async def take(n):
+        for _ in range(n):
+            await limiter.acquire()
+
+    asyncio.run(take(3))
+    assert slept == [2.0, 2.0]
+    assert clock[0] == 4.0
@@ -0,0 +1,145 @@
+# tests/integration/test_risk_engine.py
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from openai import OpenAIError
+
+import services.ai_service.routers.suggestions as sug_mod
+from common.enums import Priority
+from services.ai_service.fake_openai import FakeOpenAI
+from services.ai_service.risk_engine import build_alerts, compute_metrics
+from tests.factories import make_project, make_task, make_user
+
+BASE = "/api/ai"
+NOW  = datetime.now(timezone.utc)
+PAST = NOW.replace(tzinfo=None) - timedelta(days=20)
+
+
+@pytest.fixture
+def risky_project(db):
+    alice = make_user(db, "alice")
+    bob   = make_user(db, "bob")
+    carol = make_user(db, "carol")
+    p = make_project(db, owner_id=1, title="Apollo")
+
+    def task(**kw):
+        return make_task(db, project_id=p.id, big_task_id=None, reporter_id=1, **kw)
+
+    for i in range(7):                            # team average 4 → alice is overloaded
+        task(title=f"alice {i}", assignee_id=alice.id)
+    task(title="bob 0", assignee_id=bob.id)
+    task(title="carol 0", assignee_id=carol.id)
+    task(title="late 1", due_date=PAST, assignee_id=bob.id)
+    task(title="late 2", due_date=PAST + timedelta(days=5), assignee_id=bob.id)
+    task(title="orphan", priority=Priority.HIGHEST)
+    task(title="stuck", status="In Progress", assignee_id=bob.id,
+         updated_at=NOW - timedelta(days=30))
+    task(title="finished late", status="Done", due_date=PAST)  # done → ignored
+    return p
+
+
+def test_metrics_are_computed_in_sql(db, risky_project, query_budget):
+    project_id = risky_project.id
+    with query_budget(5):
+        m = compute_metrics(db, project_id, now=NOW)
+
+    assert m.open_tasks == 13
+    assert m.overdue == 2 and m.max_days_overdue == 20
+    assert m.samples["overdue"] == ["late 1", "late 2"]
+    assert m.unassigned_high == 1 and m.highest_unassigned == 1
+    assert m.samples["unassigned_high"] == ["orphan"]
+    assert m.stale_in_progress == 1
+    assert [(w.assignee, w.open) for w in m.overloaded] == [("alice", 7)]
+
+    types = {a["risk_type"]: a["severity"] for a in build_alerts(m)}
+    assert types == {
+        "Overdue Tasks":       "High",        # oldest is 20 days late
+        "Resource Overload":   "Medium",
+        "Missing Assignments": "High",        # a Highest-priority orphan
+        "Stalled Work":        "Medium",
+    }
+
+
+def test_local_mode_never_calls_upstream(monkeypatch, ai_client, risky_project):
+    fake = FakeOpenAI(OpenAIError("must not be called"))
+    monkeypatch.setattr(sug_mod, "client", fake)
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": risky_project.id, "mode": "local"})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["project_title"] == "Apollo"
+    assert data["total_risks"] == 4
+    assert data["summary_source"] == "local"
+    assert data["metrics"]["open_tasks"] == 13
+    assert fake.calls == []
+
+
+def test_llm_only_narrates_compact_facts(monkeypatch, ai_client, risky_project):
+    fake = FakeOpenAI('```json\n{"summary": "Apollo is slipping."}\n```')
+    monkeypatch.setattr(sug_mod, "client", fake)
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": risky_project.id})
+    assert r.status_code == 200
+    assert r.json()["summary"] == "Apollo is slipping."
+    assert r.json()["summary_source"] == "llm"
+
+    prompt = fake.calls[0]["messages"][0]["content"]
+    facts = json.loads(prompt.split("Facts: ", 1)[1])
+    assert facts["open_tasks"] == 13 and len(facts["risks"]) == 4
+    assert "alice 3" not in prompt                # no per-task dump
+    assert len(prompt) < 1500
+
+
+def test_upstream_failure_falls_back_to_local_summary(monkeypatch, ai_client, risky_project):
+    monkeypatch.setattr(sug_mod, "client", FakeOpenAI(OpenAIError("down")))
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": risky_project.id})
+    assert r.status_code == 200
+    assert r.json()["summary_source"] == "local"
+    assert r.json()["total_risks"] == 4
+
+
+@pytest.mark.usefixtures("db")
+def test_analyze_risks_unknown_project(ai_client):
+    r = ai_client.post(f"{BASE}/analyze_risks", json={"project_id": 999_999, "mode": "local"})
+    assert r.status_code == 404
+
+
+def test_reports_are_cached_per_data_version(monkeypatch, ai_client, db, risky_project):
+    from common.models.project import Project
+
+    fake = FakeOpenAI('{"summary": "Narrative."}')
+    monkeypatch.setattr(sug_mod, "client", fake)
+    project_id = risky_project.id
+    payload = {"project_id": project_id}
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json=payload)
+    assert r.headers["X-Risk-Cache"] == "miss"
+    assert r.json()["total_risks"] == 4 and r.json()["stale"] is False
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json=payload)
+    assert r.headers["X-Risk-Cache"] == "fresh"
+    assert len(fake.calls) == 1                       # nothing recomputed
+
+    # a task write bumps data_version: the old report is served at once and
+    # rebuilt after the response
+    make_task(db, project_id=project_id, big_task_id=None, reporter_id=1,
+              title="late 3", due_date=PAST)
+    db.query(Project).filter(Project.id == project_id).update(
+        {Project.data_version: Project.data_version + 1}
+    )
+    db.commit()
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json=payload)
+    assert r.headers["X-Risk-Cache"] == "stale"
+    assert r.json()["stale"] is True
+    assert r.json()["metrics"]["overdue"] == 2
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json=payload)
+    assert r.headers["X-Risk-Cache"] == "fresh"
+    assert r.json()["metrics"]["overdue"] == 3
+    assert len(fake.calls) == 2
+
+    r = ai_client.post(f"{BASE}/analyze_risks", json={**payload, "refresh": True})
+    assert r.headers["X-Risk-Cache"] == "miss"
+    assert len(fake.calls) == 3
@@ -0,0 +1,103 @@
+# tests/integration/test_search.py
+import pytest
+
+from common.models.project_member import ProjectMember
+from common.models.task import Task
+from common.models.task_comment import TaskComment
+from tests.factories import make_project, make_task, make_user
+
+BASE = "/api/projects/search/"
+
+
+@pytest.fixture
+def board(client, db):
+    client.get("/api/projects/")                     # materialise "tester" (id 1)
+    stranger = make_user(db, "search_stranger")
+    mine     = make_project(db, owner_id=1, title="Mine")
+    shared   = make_project(db, owner_id=stranger.id, title="Shared")
+    hidden   = make_project(db, owner_id=stranger.id, title="Hidden")
+    db.add(ProjectMember(project_id=shared.id, user_id=1))
+    db.commit()
+
+    def task(project, title, description=None):
+        return make_task(db, project_id=project.id, big_task_id=None, reporter_id=1,
+                         title=title, description=description).id
+
+    ids = {
+        "title":       task(mine, "Fix login redirect"),
+        "description": task(mine, "Polish settings page", "the login form jumps on submit"),
+        "shared":      task(shared, "Login audit"),
+        "hidden":      task(hidden, "Login secrets"),
+        "other":       task(mine, "Write release notes"),
+    }
+    db.add_all([
+        TaskComment(task_id=ids["other"], user_id=1, content="Blocked until login ships"),
+        TaskComment(task_id=ids["hidden"], user_id=stranger.id, content="login keys rotated"),
+    ])
+    db.commit()
+    return {"ids": ids, "mine": mine.id, "shared": shared.id}
+
+
+def test_ranked_results_only_from_accessible_projects(client, board):
+    r = client.get(BASE, params={"q": "login"})
+    assert r.status_code == 200
+    hits = r.json()["items"]
+    ids  = board["ids"]
+
+    got = {(h["kind"], h["task_id"]) for h in hits}
+    assert got == {
+        ("task", ids["title"]), ("task", ids["description"]), ("task", ids["shared"]),
+        ("comment", ids["other"]),
+    }                                                # nothing from "Hidden"
+    scores = [h["score"] for h in hits]
+    assert scores == sorted(scores, reverse=True)
+    ranked = [h["task_id"] for h in hits if h["kind"] == "task"]
+    assert ranked.index(ids["title"]) < ranked.index(ids["description"])   # title outweighs body
+
+    comment = next(h for h in hits if h["kind"] == "comment")
+    assert comment["title"] == "Write release notes"
+    assert comment["excerpt"] == "Blocked until login ships"
+
+
+def test_prefix_stemming_and_filters(client, board):
+    ids = board["ids"]
+
+    def found(**params):
+        return {(h["kind"], h["task_id"]) for h in client.get(BASE, params=params).json()["items"]}
+
+    assert found(q="redir") == {("task", ids["title"])}              # last word is a prefix
+    assert found(q="jumping") == {("task", ids["description"])}      # stemmed
+    assert found(q="login fix") == {("task", ids["title"])}          # every word must match
+    assert found(q="login", kind="comments") == {("comment", ids["other"])}
+    assert found(q="login", project_id=board["shared"]) == {("task", ids["shared"])}
+    assert found(q='"login" -(*') == found(q="login")                 # operators are just text
+
+
+def test_pagination(client, board):
+    first = client.get(BASE, params={"q": "login", "limit": 3}).json()
+    assert len(first["items"]) == 3 and first["next_offset"] == 3
+    rest = client.get(BASE, params={"q": "login", "limit": 3, "offset": 3}).json()
+    assert len(rest["items"]) == 1 and rest["next_offset"] is None
+    seen = [(h["kind"], h["task_id"]) for h in first["items"] + rest["items"]]
+    assert len(set(seen)) == 4
+
+
+def test_index_follows_updates_and_deletes(client, db, board):
+    ids = board["ids"]
+    task = db.get(Task, ids["other"])
+    task.title = "Write login release notes"
+    db.commit()
+    tasks = {h["task_id"] for h in client.get(BASE, params={"q": "login", "kind": "tasks"}).json()["items"]}
+    assert ids["other"] in tasks
+
+    db.query(TaskComment).filter(TaskComment.task_id == ids["other"]).delete()
+    db.commit()
+    r = client.get(BASE, params={"q": "login", "kind": "comments"})
+    assert r.json()["items"] == []
+
+
+def test_query_validation(client):
+    assert client.get(BASE, params={"q": "x"}).status_code == 422
+    assert client.get(BASE, params={"q": "login", "offset": 5000}).status_code == 422
+    r = client.get(BASE, params={"q": "?!"})
+    assert r.status_code == 200 and r.json() == {"items": [], "next_offset": None}
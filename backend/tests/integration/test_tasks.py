@@ -2,6 +2,7 @@ from datetime import datetime
 import pytest
 from tests.factories      import make_project, make_big_task, make_task
 from common.enums         import TaskStatus, IssueType, Priority
+from common.models.notification import Notification
 
 BASE = "/api/projects/tasks"
 
@@ -84,6 +85,22 @@ def test_get_update_delete_task(client, db):
     assert r.json()["detail"] == "Task deleted successfully"
 
 
+@pytest.mark.usefixtures("db")
+def test_status_change_notification_shows_status_values(client, db):
+    proj = make_project(db, owner_id=1)
+    t = make_task(db, project_id=proj.id, big_task_id=None, reporter_id=1,
+                  assignee_id=1, title="Status text")
+
+    r = client.put(f"{BASE}/{t.id}", json={
+        "title": "Status text", "status": TaskStatus.DONE.value,
+        "issue_type": IssueType.TASK.value, "priority": Priority.MEDIUM.value,
+        "project_id": proj.id, "assignee_id": 1,
+    })
+    assert r.status_code == 200
+    note = db.query(Notification).filter(Notification.message.contains("Status text")).one()
+    assert note.message == "Your task “Status text” status changed from To Do to Done"
+
+
 @pytest.mark.usefixtures("db")
 def test_cannot_assign_to_non_member(client, db):
     # project owned by 1
@@ -0,0 +1,66 @@
+# tests/integration/test_user_search.py
+import pytest
+
+from services.user_service.search import TTLCache
+from tests.factories import make_user
+
+BASE = "/api/users/search"
+
+
+@pytest.fixture
+def people(db):
+    # the users table survives between tests – keep the names unusual
+    make_user(db, "quillan", display_name="Quillan Lee")
+    make_user(db, "quill")
+    make_user(db, "maquilla", display_name="Mo Q")
+    make_user(db, "bob_quill", display_name="Bob")
+    make_user(db, "tr_quorra", display_name="Quorra Smith")
+    make_user(db, "100%_real")
+    return db
+
+
+def names(r):
+    assert r.status_code == 200
+    return [u["username"] for u in r.json()]
+
+
+@pytest.mark.usefixtures("people")
+def test_prefix_matches_come_first(user_client):
+    r = user_client.get(BASE, params={"q": "Quill"})
+    assert names(r)[:2] == ["quill", "quillan"]         # prefix, shortest first
+    assert set(names(r)) == {"quill", "quillan", "maquilla", "bob_quill"}
+    assert set(r.json()[0]) == {"id", "username", "display_name", "avatar_url"}   # no email
+    assert r.headers["Cache-Control"].startswith("private, max-age=")
+
+
+@pytest.mark.usefixtures("people")
+def test_short_queries_match_prefixes_only(user_client):
+    assert names(user_client.get(BASE, params={"q": "qu"})) == ["quill", "quillan", "tr_quorra"]
+    assert names(user_client.get(BASE, params={"q": "quo"})) == ["tr_quorra"]   # display name
+
+
+@pytest.mark.usefixtures("people")
+def test_limit_and_wildcards(user_client):
+    assert len(names(user_client.get(BASE, params={"q": "quill", "limit": 2}))) == 2
+    assert names(user_client.get(BASE, params={"q": "100%"})) == ["100%_real"]
+    assert names(user_client.get(BASE, params={"q": "%"})) == []                  # not a wildcard
+    assert user_client.get(BASE, params={"q": "a", "limit": 100}).status_code == 422
+
+
+def test_results_are_cached_briefly(user_client, db):
+    make_user(db, "zephyr")
+    assert names(user_client.get(BASE, params={"q": "zeph"})) == ["zephyr"]
+    make_user(db, "zephyrine")
+    assert names(user_client.get(BASE, params={"q": "ZEPH "})) == ["zephyr"]    # same normalized key
+    assert names(user_client.get(BASE, params={"q": "zephy"})) == ["zephyr", "zephyrine"]
+
+
+def test_ttl_cache_expiry_and_bound():
+    now = [0.0]
+    cache = TTLCache(ttl=30, max_entries=2, clock=lambda: now[0])
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.set("c", [3])
+    assert cache.get("a") is None and cache.get("c") == [3]
+    now[0] = 31
+    assert cache.get("c") is None
@@ -0,0 +1,178 @@
+# tests/unit/test_ai_cache.py
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from openai import OpenAIError
+
+from services.ai_service.cache import TOUCH_INTERVAL, ResponseCache, cache_key, normalize_text
+from services.ai_service.fake_openai import FakeOpenAI
+from services.ai_service.routers import suggestions
+from services.ai_service.routers.suggestions import SuggestRequest, suggest_subtasks
+
+
+class Clock:
+    def __init__(self): self.now = 1_000.0
+    def __call__(self): return self.now
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Keys
+# ───────────────────────────────────────────────────────────────────────────────
+def test_normalized_descriptions_share_a_key():
+    a = cache_key(normalize_text("  Build the   Login\tpage "), 3, "m", 0.7)
+    b = cache_key(normalize_text("build the login page"), 3, "m", 0.7)
+    assert a == b
+    assert a != cache_key(normalize_text("build the login page"), 4, "m", 0.7)
+    assert a != cache_key(normalize_text("build the login page"), 3, "m", 0.2)
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Memory tier
+# ───────────────────────────────────────────────────────────────────────────────
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = ResponseCache(ttl=60, clock=clock)
+    cache.set("k", ["a"])
+    clock.now += 59
+    assert cache.get("k") == ["a"]
+    clock.now += 2
+    assert cache.get("k") is None
+
+
+def test_memory_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")               # a is now the most recent
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Disk tier
+# ───────────────────────────────────────────────────────────────────────────────
+def test_disk_tier_survives_a_new_process(tmp_path):
+    path = str(tmp_path / "ai.sqlite3")
+    ResponseCache(path=path).set("k", ["x", "y"])
+    assert ResponseCache(path=path).get("k") == ["x", "y"]
+
+
+def test_disk_tier_honours_ttl_and_cap(tmp_path):
+    clock = Clock()
+    path  = str(tmp_path / "ai.sqlite3")
+    cache = ResponseCache(ttl=60, max_entries=1, path=path, max_disk_entries=2, clock=clock)
+    for i, key in enumerate("abc"):
+        clock.now += 1
+        cache.set(key, i)
+    assert len(cache._disk) == 2
+    fresh = ResponseCache(ttl=60, path=path, clock=clock)
+    assert fresh.get("a") is None and fresh.get("c") == 2
+    clock.now += 120
+    assert fresh.get("b") is None
+
+
+def test_disk_hits_touch_last_used_lazily(tmp_path):
+    clock = Clock()
+    path  = str(tmp_path / "ai.sqlite3")
+    ResponseCache(path=path, clock=clock).set("k", 1)
+
+    def last_used(cache):
+        return cache._disk._conn.execute("SELECT last_used FROM ai_cache").fetchone()[0]
+
+    clock.now += 10
+    cache = ResponseCache(path=path, clock=clock)
+    assert cache.get("k") == 1 and last_used(cache) == 1_000.0      # no write on a warm hit
+    clock.now += TOUCH_INTERVAL
+    assert ResponseCache(path=path, clock=clock).get("k") == 1
+    assert last_used(cache) == clock.now
+
+
+def test_async_paths_keep_the_disk_off_the_event_loop(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "ai.sqlite3"))
+    threads = []
+    for name in ("get", "set"):
+        real = getattr(cache._disk, name)
+        def spy(*args, _real=real):
+            threads.append(threading.current_thread())
+            return _real(*args)
+        setattr(cache._disk, name, spy)
+
+    async def compute():
+        return ["x"]
+
+    async def main():
+        await cache.get_or_compute("k", compute)      # disk miss, then write
+        cache._memory.clear()
+        return await cache.aget("k")                   # disk hit
+
+    assert asyncio.run(main()) == ["x"]
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Single-flight
+# ───────────────────────────────────────────────────────────────────────────────
+def test_concurrent_misses_make_one_call():
+    cache = ResponseCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["done"]
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(8)))
+
+    assert asyncio.run(main()) == [["done"]] * 8
+    assert len(calls) == 1
+    assert not cache._inflight
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache = ResponseCache()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("x")
+
+    async def ok():
+        return ["ok"]
+
+    async def main():
+        results = await asyncio.gather(cache.get_or_compute("k", boom),
+                                       cache.get_or_compute("k", boom),
+                                       return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        return await cache.get_or_compute("k", ok)
+
+    assert asyncio.run(main()) == ["ok"]
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Route
+# ───────────────────────────────────────────────────────────────────────────────
+def test_suggest_subtasks_reuses_cached_completion(monkeypatch):
+    fake = FakeOpenAI('["one","two"]')
+    monkeypatch.setattr(suggestions, "client", fake)
+
+    first  = asyncio.run(suggest_subtasks(SuggestRequest(description="Ship the beta", n=2)))
+    second = asyncio.run(suggest_subtasks(SuggestRequest(description="  ship THE   beta ", n=2)))
+    assert first.suggestions == second.suggestions == ["one", "two"]
+    assert len(fake.calls) == 1
+
+    asyncio.run(suggest_subtasks(SuggestRequest(description="Ship the beta", n=1)))
+    assert len(fake.calls) == 2          # different n → different entry
+
+
+def test_upstream_failure_is_retried_next_time(monkeypatch):
+    monkeypatch.setattr(suggestions, "client", FakeOpenAI(OpenAIError("down")))
+    with pytest.raises(HTTPException):
+        asyncio.run(suggest_subtasks(SuggestRequest(description="Ship the beta", n=2)))
+
+    monkeypatch.setattr(suggestions, "client", FakeOpenAI('["ok"]'))
+    resp = asyncio.run(suggest_subtasks(SuggestRequest(description="Ship the beta", n=2)))
+    assert resp.suggestions == ["ok"]
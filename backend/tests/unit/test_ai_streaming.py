@@ -0,0 +1,63 @@
+# tests/unit/test_ai_streaming.py
+import json
+
+import pytest
+
+from services.ai_service.streaming import JsonListParser, StreamFormatError, sse
+
+
+def feed_in_pieces(parser, text, size):
+    out = []
+    for i in range(0, len(text), size):
+        out.extend(parser.feed(text[i:i + size]))
+    return out
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_items_come_out_as_they_complete(size):
+    raw = '```json\n["Design login UI", "Say \\"hi\\" \\u00e9", "Write tests"]\n```'
+    parser = JsonListParser()
+    assert feed_in_pieces(parser, raw, size) == ["Design login UI", 'Say "hi" é', "Write tests"]
+    assert parser.done
+
+
+def test_first_item_is_emitted_before_the_list_closes():
+    parser = JsonListParser()
+    assert parser.feed('Sure! ["one", "tw') == ["one"]
+    assert parser.feed('o"') == ["two"]
+    assert not parser.done
+
+
+def test_subtasks_wrapper_and_limit():
+    parser = JsonListParser(limit=2)
+    assert parser.feed('{"subtasks": [" a ", "b", "c"]}') == ["a", "b"]
+    assert parser.done
+
+
+def test_non_string_items_are_rejected():
+    parser = JsonListParser()
+    with pytest.raises(StreamFormatError, match="strings"):
+        parser.feed('["ok", 123]')
+
+
+def test_missing_list_is_reported_at_finish():
+    parser = JsonListParser()
+    parser.feed("no list here")
+    with pytest.raises(StreamFormatError):
+        parser.finish()
+
+
+def test_truncated_list_is_reported_at_finish():
+    parser = JsonListParser(limit=5)
+    assert parser.feed('["Plan", "Build", "Shi') == ["Plan", "Build"]
+    with pytest.raises(StreamFormatError, match="Invalid JSON"):
+        parser.finish()
+
+    closed = JsonListParser(limit=5)
+    closed.feed('["Plan", "Build"]')
+    closed.finish()                               # a short but complete list is fine
+
+
+def test_sse_frame():
+    assert sse("done", {"count": 1}) == 'event: done\ndata: {"count": 1}\n\n'
+    assert json.loads(sse("x", {"t": "é"}).split("data: ")[1]) == {"t": "é"}
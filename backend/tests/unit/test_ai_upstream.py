@@ -0,0 +1,107 @@
+# tests/unit/test_ai_upstream.py
+import asyncio
+
+import pytest
+from openai import BadRequestError, InternalServerError
+
+from services.ai_service.fake_openai import FakeOpenAI
+from services.ai_service.stub_openai import StubOpenAI
+from services.ai_service.upstream import RETRIES, Upstream, UpstreamBusy, UpstreamDeadline
+
+CALL = dict(model="gpt-3.5-turbo", messages=[{"role": "user", "content": "hi"}])
+
+
+def make_upstream(**kw):
+    slept = []
+
+    async def sleep(delay):
+        slept.append(delay)
+
+    kw.setdefault("max_retries", 2)
+    up = Upstream(sleep=sleep, **kw)
+    up.slept = slept
+    return up
+
+
+def content(completion):
+    return completion.choices[0].message.content
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Retries (real SDK against the stub server)
+# ───────────────────────────────────────────────────────────────────────────────
+def test_retries_429_honouring_retry_after():
+    stub = StubOpenAI().reply(status=429, headers={"retry-after": "3"}).reply('["ok"]')
+    up = make_upstream()
+    before = RETRIES.value(reason="429")
+
+    result = asyncio.run(up.create(stub.client(), **CALL))
+
+    assert content(result) == '["ok"]'
+    assert len(stub.requests) == 2
+    assert up.slept == [3.0]
+    assert RETRIES.value(reason="429") == before + 1
+
+
+def test_gives_up_after_max_retries_on_5xx():
+    stub = StubOpenAI().reply(status=503, times=5)
+    up = make_upstream(max_retries=2)
+    with pytest.raises(InternalServerError):
+        asyncio.run(up.create(stub.client(), **CALL))
+    assert len(stub.requests) == 3
+    assert len(up.slept) == 2
+
+
+def test_client_errors_are_not_retried():
+    stub = StubOpenAI().reply(status=400)
+    up = make_upstream()
+    with pytest.raises(BadRequestError):
+        asyncio.run(up.create(stub.client(), **CALL))
+    assert len(stub.requests) == 1 and up.slept == []
+
+
+def test_backoff_is_bounded():
+    up = Upstream(backoff_base=0.5, backoff_max=2.0)
+    assert all(0 <= up.backoff(a) <= 2.0 for a in range(10) for _ in range(20))
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# Deadline & concurrency
+# ───────────────────────────────────────────────────────────────────────────────
+def test_deadline_covers_slow_upstream():
+    stub = StubOpenAI().reply(delay=1.0)
+    up = make_upstream(deadline=0.05)
+    with pytest.raises(UpstreamDeadline):
+        asyncio.run(up.create(stub.client(), **CALL))
+    assert up.active == 0
+
+
+def test_concurrency_is_capped():
+    fake = FakeOpenAI("[]", delay=0.02)
+    up = make_upstream(max_concurrency=2)
+    peak = []
+
+    async def watch():
+        while len(fake.calls) < 6 or up.active:
+            peak.append(up.active)
+            await asyncio.sleep(0.001)
+
+    async def main():
+        await asyncio.gather(watch(), *(up.create(fake, **CALL) for _ in range(6)))
+
+    asyncio.run(main())
+    assert len(fake.calls) == 6
+    assert max(peak) == 2
+
+
+def test_full_queue_rejects_after_queue_timeout():
+    up = make_upstream(max_concurrency=1, queue_timeout=0.01)
+    fake = FakeOpenAI("[]", delay=0.2)
+
+    async def main():
+        return await asyncio.gather(up.create(fake, **CALL), up.create(fake, **CALL),
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert sum(isinstance(r, UpstreamBusy) for r in results) == 1
+    assert up.waiting == 0 and up.active == 0
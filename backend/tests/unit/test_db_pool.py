@@ -0,0 +1,61 @@
+"""
+Pool profiles + pool telemetry in common/db_pool.py
+Uses a throw-away SQLite file, never the shared test engine.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool
+
+from common import metrics
+from common.db_pool import (
+    POOL_PROFILES,
+    PoolProfile,
+    engine_kwargs,
+    instrument_engine,
+    resolve_pool_profile,
+)
+
+
+def test_unknown_profile_falls_back_to_default():
+    assert resolve_pool_profile("nope") == POOL_PROFILES["default"]
+
+
+def test_explicit_settings_override_profile():
+    prof = resolve_pool_profile("project", pool_size=9, pool_timeout=1.5)
+    assert prof.pool_size == 9
+    assert prof.pool_timeout == 1.5
+    assert prof.max_overflow == POOL_PROFILES["project"].max_overflow
+
+
+def test_pgbouncer_mode_uses_null_pool():
+    kw = engine_kwargs("postgresql+psycopg2://u:p@h/db", POOL_PROFILES["default"], pgbouncer=True)
+    assert kw["poolclass"] is NullPool
+    assert "pool_size" not in kw
+
+
+def test_pool_metrics_track_checkout_and_timeouts(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    prof = PoolProfile(pool_size=1, max_overflow=0, pool_timeout=0.05)
+    eng = instrument_engine(create_engine(url, **engine_kwargs(url, prof)), "unit")
+
+    checked_out = metrics.REGISTRY.get("db_pool_checked_out")
+    timeouts = metrics.REGISTRY.get("db_pool_timeouts_total")
+    waits = metrics.REGISTRY.get("db_pool_wait_seconds")
+
+    with eng.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert checked_out.value(pool="unit") == 1
+
+        # second checkout has nowhere to go → pool timeout
+        with pytest.raises(PoolTimeoutError):
+            eng.connect()
+
+    assert checked_out.value(pool="unit") == 0
+    assert timeouts.value(pool="unit") == 1
+    assert waits.count(pool="unit") >= 2
+
+    body = metrics.REGISTRY.render()
+    assert 'db_pool_checked_out{pool="unit"} 0' in body
+    assert 'db_pool_timeouts_total{pool="unit"} 1' in body
+    eng.dispose()
@@ -0,0 +1,108 @@
+"""
+Read-replica routing (common/db_routing.py) against two SQLite files:
+"primary" and "replica" hold different rows, so each read shows where it went.
+"""
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, create_engine, text
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from common.db_routing import (
+    LAST_WRITE_HEADER, ReplicaRouter, RoutingSession, WriteStampMiddleware, track_writes,
+)
+
+_Base = declarative_base()
+
+
+class _Note(_Base):
+    __tablename__ = "notes"
+    id = Column(Integer, primary_key=True)
+
+
+def _engine(path, marker):
+    eng = create_engine(f"sqlite:///{path}")
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE whoami (name TEXT)"))
+        conn.execute(text("INSERT INTO whoami VALUES (:m)"), {"m": marker})
+    return eng
+
+
+@pytest.fixture
+def setup(tmp_path):
+    primary = _engine(tmp_path / "primary.db", "primary")
+    replica = _engine(tmp_path / "replica.db", "replica")
+    _Base.metadata.create_all(primary)
+    lag = {"value": 0.0}
+
+    def probe(engine):
+        if lag["value"] is None:
+            raise RuntimeError("replica down")
+        return lag["value"]
+
+    router = ReplicaRouter(primary, replica, max_lag=5, ryw_window=60,
+                           check_interval=0, lag_probe=probe)
+    writes = sessionmaker(bind=primary)
+    reads = sessionmaker(class_=RoutingSession, info={"router": router})
+    track_writes(writes)
+    yield router, writes, reads, lag
+    primary.dispose()
+    replica.dispose()
+
+
+def _read_as(reads, last_write=None):
+    with reads(info={"last_write": last_write}) as db:
+        return db.execute(text("SELECT name FROM whoami")).scalar()
+
+
+def test_reads_go_to_replica_when_healthy(setup):
+    _, _, reads, _ = setup
+    assert _read_as(reads, 1) == "replica"
+
+
+def test_lagging_or_broken_replica_falls_back_to_primary(setup):
+    _, _, reads, lag = setup
+    lag["value"] = 30.0
+    assert _read_as(reads, 1) == "primary"
+    lag["value"] = None
+    assert _read_as(reads, 1) == "primary"
+
+
+def test_read_your_writes_follows_the_stamp_not_the_process(setup):
+    router, _, reads, lag = setup
+    lag["value"] = 4.0
+    now = time.time()
+    assert _read_as(reads, now - 1) == "primary"             # maybe not replayed yet
+    assert _read_as(reads, None) == "replica"
+    assert _read_as(reads, now - 30) == "replica"            # replica is past it
+
+    # the window is what the replica can still be missing, capped by ryw_window
+    router.check_interval = 2
+    assert router.recently_wrote(now - 2, 0.5, now=now)
+    assert not router.recently_wrote(now - 3, 0.5, now=now)
+    assert not router.recently_wrote(now - 61, 300, now=now)
+
+
+def test_committing_requests_get_a_write_stamp(setup):
+    _, writes, _, _ = setup
+    app = FastAPI()
+    app.add_middleware(WriteStampMiddleware)
+
+    @app.post("/notes")
+    def add_note():
+        with writes() as db:
+            db.add(_Note())
+            db.commit()
+
+    @app.get("/notes")
+    def count_notes():
+        with writes() as db:
+            return db.query(_Note).count()
+
+    client = TestClient(app)
+    before = time.time()
+    stamp = float(client.post("/notes").headers[LAST_WRITE_HEADER])
+    assert before - 1 <= stamp <= time.time() + 1
+    assert LAST_WRITE_HEADER not in client.get("/notes").headers
@@ -0,0 +1,105 @@
+"""
+Per-socket send queues (services/realtime_gateway/connection.py).
+"""
+import asyncio
+
+from services.realtime_gateway.connection import Connection, PING
+
+
+class FakeSocket:
+    """send_text blocks until `unblock` is set – a client that stopped reading."""
+
+    def __init__(self, blocked=False):
+        self.sent    = []
+        self.closed  = None
+        self.unblock = asyncio.Event()
+        self.inbox   = asyncio.Queue()
+        if not blocked:
+            self.unblock.set()
+
+    async def send_text(self, text):
+        await self.unblock.wait()
+        self.sent.append(text)
+
+    async def receive_text(self):
+        return await self.inbox.get()
+
+    async def close(self, code=1000, reason=None):
+        self.closed = code
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_same_key_messages_are_coalesced():
+    async def go():
+        conn = Connection(FakeSocket(), "u")
+        conn.offer("a")
+        conn.offer("unread=1", coalesce_key="unread")
+        conn.offer("b")
+        conn.offer("unread=2", coalesce_key="unread")
+        return [text for _, text in conn.queue]
+
+    assert _run(go()) == ["a", "b", "unread=2"]
+
+
+def test_full_queue_disconnects_slow_consumer():
+    async def go():
+        ws   = FakeSocket(blocked=True)
+        conn = Connection(ws, "u", max_queue=2)
+        serving = asyncio.create_task(conn.serve())
+        await asyncio.sleep(0)
+        for i in range(5):
+            conn.offer(str(i))
+        return await serving, ws.closed
+
+    reason, code = _run(go())
+    assert reason == "slow_consumer" and code == 4408
+
+
+def test_drop_oldest_keeps_newest_messages():
+    async def go():
+        conn = Connection(FakeSocket(), "u", max_queue=2, policy="drop_oldest")
+        for i in range(5):
+            assert conn.offer(str(i))
+        return [text for _, text in conn.queue], conn.done.is_set()
+
+    assert _run(go()) == (["3", "4"], False)
+
+
+def test_stalled_send_times_out():
+    async def go():
+        ws   = FakeSocket(blocked=True)
+        conn = Connection(ws, "u", send_timeout=0.05)
+        conn.offer("x")
+        return await conn.serve()
+
+    assert _run(go()) == "send_timeout"
+
+
+def test_heartbeat_pings_and_closes_idle_clients():
+    async def go():
+        ws   = FakeSocket()
+        conn = Connection(ws, "u", ping_interval=0.02, idle_timeout=0.1)
+        return await conn.serve(), ws
+
+    reason, ws = _run(go())
+    assert PING in ws.sent
+    assert reason == "idle" and ws.closed == 4000
+
+
+def test_client_messages_keep_the_socket_alive():
+    async def go():
+        ws   = FakeSocket()
+        conn = Connection(ws, "u", ping_interval=0.02, idle_timeout=0.1)
+        serving = asyncio.create_task(conn.serve())
+        for _ in range(10):
+            await asyncio.sleep(0.03)
+            ws.inbox.put_nowait("pong")
+        alive = not conn.done.is_set()
+        conn.finish("test")
+        await serving
+        return alive
+
+    assert _run(go())
@@ -0,0 +1,56 @@
+"""
+Request metrics middleware + threadpool probe (common/http_metrics.py).
+"""
+import time
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from common import metrics
+from common.http_metrics import IN_FLIGHT, REQUEST_DB_TIME, REQUEST_LATENCY, THREADPOOL_QUEUE, instrument_app
+from common.query_stats import QueryStatsMiddleware
+
+
+def _app():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+    instrument_app(app)
+    app.include_router(metrics.metrics_router)
+
+    @app.get("/things/{thing_id}")
+    def get_thing(thing_id: int):
+        if thing_id == 0:
+            raise HTTPException(status_code=404, detail="nope")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"id": thing_id}
+
+    return app
+
+
+def test_latency_is_labelled_by_route_template_and_status():
+    client = TestClient(_app())
+    before = REQUEST_LATENCY.count(method="GET", route="/things/{thing_id}", status="200")
+
+    client.get("/things/1")
+    client.get("/things/2")
+    client.get("/things/0")
+
+    assert REQUEST_LATENCY.count(method="GET", route="/things/{thing_id}", status="200") == before + 2
+    assert REQUEST_LATENCY.count(method="GET", route="/things/{thing_id}", status="404") >= 1
+    assert REQUEST_DB_TIME.count(method="GET", route="/things/{thing_id}", status="200") >= 2
+    assert IN_FLIGHT.value() == 0
+
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/things/{thing_id}",status="200",le="+Inf"}' in body
+
+
+def test_threadpool_probe_runs_with_the_app():
+    before = THREADPOOL_QUEUE.count()
+    with TestClient(_app()):
+        deadline = time.time() + 2
+        while THREADPOOL_QUEUE.count() == before and time.time() < deadline:
+            time.sleep(0.01)
+    assert THREADPOOL_QUEUE.count() > before
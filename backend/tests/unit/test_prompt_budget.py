@@ -0,0 +1,72 @@
+# tests/unit/test_prompt_budget.py
+import json
+from types import SimpleNamespace
+
+from services.ai_service import prompt_budget
+from services.ai_service.prompt_budget import (
+    budget_risk_facts, estimate_tokens, group_titles, record_usage,
+)
+
+HEADER = {"project": "Apollo", "open_tasks": 2000}
+
+
+def render(facts):
+    return "Instructions. Facts: " + json.dumps(facts, separators=(",", ":"))
+
+
+def alert(kind, severity, items=(), text=None):
+    return {"risk_type": kind, "severity": severity, "description": text or f"{kind} facts",
+            "affected_items": list(items), "recommendations": []}
+
+
+def test_estimate_is_about_four_characters_a_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_numbered_look_alikes_collapse():
+    assert group_titles(["Fix login 1", "Docs", "fix  login 22", "Fix login 3"]) == [
+        "Fix login 1 (+2 similar)", "Docs",
+    ]
+
+
+def test_alerts_are_ranked_and_merged_by_type():
+    out = budget_risk_facts(HEADER, [
+        alert("Missing Due Dates", "Low"),
+        alert("Resource Overload", "Medium", ["alice"], "alice has 40"),
+        alert("Resource Overload", "High", ["bob"], "bob has 90"),
+        alert("Overdue Tasks", "High", ["late 1", "late 2"]),
+    ], budget=10_000, render=render)
+
+    risks = out.facts["risks"]
+    assert [r["type"] for r in risks] == ["Resource Overload", "Overdue Tasks", "Missing Due Dates"]
+    assert risks[0]["severity"] == "High"
+    assert risks[0]["facts"] == "alice has 40 (+1 more like this)"
+    assert risks[0]["examples"] == ["alice", "bob"]
+    assert "examples" not in risks[2]
+    assert out.dropped_examples == out.dropped_risks == 0
+
+
+def test_large_inputs_are_trimmed_to_the_budget():
+    alerts = [alert(f"Risk {i}", "Low" if i else "High",
+                    [f"very long task title number {i}-{j} " * 3 for j in range(5)])
+              for i in range(200)]
+    out = budget_risk_facts(HEADER, alerts, budget=300, render=render)
+
+    assert out.tokens <= 300
+    assert out.tokens == estimate_tokens(render(out.facts))
+    assert out.facts["risks"][0]["type"] == "Risk 0"            # highest severity stays
+    assert out.dropped_risks == 200 - len(out.facts["risks"])
+    assert out.facts["more_risks_not_listed"] == out.dropped_risks
+    assert out.dropped_examples > 0
+
+
+def test_usage_is_counted_when_the_upstream_reports_it():
+    used = prompt_budget.TOKENS_USED
+    before = used.value(route="test", kind="prompt"), used.value(route="test", kind="completion")
+    record_usage("test", SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120,
+                                                               completion_tokens=30)))
+    record_usage("test", SimpleNamespace())                          # no usage → ignored
+    assert used.value(route="test", kind="prompt") == before[0] + 120
+    assert used.value(route="test", kind="completion") == before[1] + 30
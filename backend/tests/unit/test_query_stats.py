@@ -0,0 +1,44 @@
+"""
+Per-request SQL stats (common/query_stats.py).
+"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from common.query_stats import QueryStats, QueryStatsMiddleware, capture, statement_shape
+
+
+def test_statement_shape_collapses_in_lists_and_whitespace():
+    a = statement_shape("SELECT * FROM users\n  WHERE id IN (?, ?, ?)")
+    b = statement_shape("SELECT * FROM users WHERE id IN (?, ?)")
+    assert a == b == "SELECT * FROM users WHERE id IN (…)"
+
+
+def test_repeated_shapes_are_reported():
+    stats = QueryStats()
+    for _ in range(6):
+        stats.record("SELECT * FROM users WHERE id = ?", 0.001)
+    stats.record("SELECT 1", 0.001)
+    assert stats.count == 7
+    assert stats.max_repeat() == 6
+    assert stats.repeated() == [("SELECT * FROM users WHERE id = ?", 6)]
+
+
+def test_middleware_headers_and_capture():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, headers=True)
+
+    @app.get("/ping")
+    def ping():
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    with capture() as stats:
+        r = TestClient(app).get("/ping")
+    assert r.headers["x-db-query-count"] == "3"
+    assert r.headers["x-db-max-repeat"] == "3"
+    assert float(r.headers["x-db-time-ms"]) >= 0
+    assert stats.count == 3
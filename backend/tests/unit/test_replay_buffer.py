@@ -0,0 +1,77 @@
+"""
+Gateway replay buffer (services/realtime_gateway/replay.py).
+"""
+import json
+
+from services.realtime_gateway.replay import ReplayBuffer
+
+
+def _push(buf, user, n=1):
+    return [buf.append(user, lambda seq: json.dumps({"seq": seq}))[0] for _ in range(n)]
+
+
+def test_replays_the_gap_in_order():
+    buf = ReplayBuffer()
+    a = _push(buf, "alice", 3)
+    _push(buf, "bob", 2)
+
+    missed, complete = buf.replay("alice", a[0])
+    assert [seq for seq, _ in missed] == a[1:]
+    assert complete
+    assert buf.replay("alice", None) == ([], True)
+
+
+def test_per_user_ring_marks_gap_incomplete():
+    buf = ReplayBuffer(per_user=2)
+    seqs = _push(buf, "alice", 5)
+
+    missed, complete = buf.replay("alice", seqs[0])
+    assert [seq for seq, _ in missed] == seqs[-2:]
+    assert not complete
+    # a client that is only one behind still gets a complete replay
+    assert buf.replay("alice", seqs[-2])[1]
+
+
+def test_global_cap_evicts_least_recently_active_user():
+    buf = ReplayBuffer(max_messages=4)
+    old = _push(buf, "idle", 2)
+    _push(buf, "busy", 3)
+
+    assert buf.total == 4
+    missed, complete = buf.replay("idle", old[0] - 1)
+    assert [seq for seq, _ in missed] == old[1:]
+    assert not complete
+
+
+def test_ttl_and_gateway_restart():
+    now = [0.0]
+    buf = ReplayBuffer(ttl=10, clock=lambda: now[0])
+    seqs = _push(buf, "alice", 2)
+    now[0] = 60.0
+
+    assert buf.replay("alice", seqs[0]) == ([], False)
+    assert buf.total == 0
+
+
+def test_cursor_from_an_earlier_run_is_never_trusted():
+    wall = [1_000.0]
+    before = ReplayBuffer(wall_clock=lambda: wall[0])
+    old = _push(before, "alice", 3)
+
+    wall[0] += 5                                  # restart five seconds later
+    buf = ReplayBuffer(wall_clock=lambda: wall[0])
+    assert buf.replay("alice", old[0]) == ([], False)
+    # even after the new run has sent many more messages than the old one
+    new = _push(buf, "alice", 50)
+    assert new[0] > old[-1]
+    assert not buf.replay("alice", old[-1])[1]
+    # a cursor from this run (e.g. the seq sent with "resync") is fine
+    assert buf.replay("alice", buf.first_seq)[1]
+    # one ahead of last_seq belongs to another run (booted later) – rejected
+    assert buf.replay("alice", buf.last_seq + 10) == ([], False)
+
+
+def test_quiet_user_reconnect_is_complete():
+    buf = ReplayBuffer()
+    seqs = _push(buf, "bob", 3)
+    assert buf.replay("alice", seqs[1]) == ([], True)
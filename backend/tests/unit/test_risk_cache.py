@@ -0,0 +1,68 @@
+# tests/unit/test_risk_cache.py
+import asyncio
+
+from services.ai_service.risk_cache import RiskReportCache
+
+
+class Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+
+def test_fresh_stale_and_miss():
+    clock = Clock()
+    cache = RiskReportCache(ttl=60, max_stale=600, clock=clock)
+    assert cache.lookup("p", 1) == (None, "miss")
+
+    cache.store("p", 1, "report v1")
+    assert cache.lookup("p", 1)[1] == "fresh"
+    assert cache.lookup("p", 2)[1] == "stale"        # project changed
+    clock.now = 61
+    assert cache.lookup("p", 1)[1] == "stale"         # same data, but time moved
+    clock.now = 601
+    assert cache.lookup("p", 1) == (None, "miss")     # too old to show at all
+
+
+def test_older_version_never_replaces_newer():
+    cache = RiskReportCache()
+    cache.store("p", 5, "v5")
+    cache.store("p", 4, "v4")
+    assert cache.lookup("p", 5)[0].report == "v5"
+
+
+def test_lru_bound():
+    cache = RiskReportCache(max_entries=2)
+    for key in "abc":
+        cache.store(key, 1, key)
+    assert cache.lookup("a", 1)[1] == "miss"
+
+
+def test_concurrent_misses_compute_once():
+    cache = RiskReportCache()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 3, "report"
+
+    async def main():
+        return await asyncio.gather(*(cache.compute("p", fn) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["report"] * 5
+    assert len(calls) == 1
+    assert cache.lookup("p", 3)[1] == "fresh"
+
+
+def test_single_refresh_and_failures_keep_stale_entry():
+    cache = RiskReportCache()
+    cache.store("p", 1, "old")
+    assert cache.claim_refresh("p")
+    assert not cache.claim_refresh("p")               # one refresh at a time
+
+    async def boom():
+        raise RuntimeError("db down")
+
+    asyncio.run(cache.refresh("p", boom))
+    assert cache.lookup("p", 2)[0].report == "old"
+    assert cache.claim_refresh("p")                   # released after the attempt
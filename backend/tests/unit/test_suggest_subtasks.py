@@ -1,5 +1,7 @@
 # tests/unit/test_suggest_subtasks.py
 
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 
@@ -25,7 +27,7 @@ class FakeClient:
         class Completions:
             def __init__(inner, outer):
                 inner._outer = outer
-            def create(inner, model, messages, temperature, max_tokens):
+            async def create(inner, model, messages, temperature, max_tokens):
                 return DummyResponse(inner._outer._raw)
 
         class Chat:
@@ -41,14 +43,14 @@ def test_parses_list_json_and_strips_fences(monkeypatch):
     raw = '```json\n["eat breakfast","write tests"]\n```'
     monkeypatch.setattr(suggestions, "client", FakeClient(raw))
     req = SuggestRequest(description="Plan my morning", n=2)
-    resp = suggest_subtasks(req)
+    resp = asyncio.run(suggest_subtasks(req))
     assert resp.suggestions == ["eat breakfast", "write tests"]
 
 def test_parses_object_with_subtasks_key(monkeypatch):
     raw = '```{"subtasks": ["a","b","c"]}```'
     monkeypatch.setattr(suggestions, "client", FakeClient(raw))
     req = SuggestRequest(description="Epic work", n=3)
-    resp = suggest_subtasks(req)
+    resp = asyncio.run(suggest_subtasks(req))
     assert resp.suggestions == ["a", "b", "c"]
 
 def test_raises_on_invalid_json(monkeypatch):
@@ -56,5 +58,5 @@ def test_raises_on_invalid_json(monkeypatch):
     monkeypatch.setattr(suggestions, "client", FakeClient(raw))
     req = SuggestRequest(description="Whatever", n=1)
     with pytest.raises(HTTPException) as exc:
-        suggest_subtasks(req)
+        asyncio.run(suggest_subtasks(req))
     assert exc.value.status_code == 502
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 
@@ -16,7 +18,7 @@ class FakeClient:
         self._raw = raw
         class Completions:
             def __init__(inner, outer): inner._outer = outer
-            def create(inner, *a, **k): return _Resp(inner._outer._raw)
+            async def create(inner, *a, **k): return _Resp(inner._outer._raw)
         class Chat:
             def __init__(inner, outer): inner.completions = Completions(outer)
         self.chat = Chat(self)
@@ -28,7 +30,7 @@ def test_trims_to_requested_count(monkeypatch):
     raw = '["one","two","three"]'
     monkeypatch.setattr(suggestions, "client", FakeClient(raw))
     req = SuggestRequest(description="Whatever", n=2)
-    resp = suggest_subtasks(req)
+    resp = asyncio.run(suggest_subtasks(req))
     assert resp.suggestions == ["one", "two"]  # only first n items kept
 
 def test_rejects_non_string_elements(monkeypatch):
@@ -36,7 +38,7 @@ def test_rejects_non_string_elements(monkeypatch):
     monkeypatch.setattr(suggestions, "client", FakeClient(raw))
     req = SuggestRequest(description="Bad types", n=3)
     with pytest.raises(HTTPException) as exc:
-        suggest_subtasks(req)
+        asyncio.run(suggest_subtasks(req))
     assert exc.value.status_code == 502
     assert "strings" in exc.value.detail.lower()
 
@@ -45,6 +47,6 @@ def test_rejects_unexpected_json_shape(monkeypatch):
     monkeypatch.setattr(suggestions, "client", FakeClient(raw))
     req = SuggestRequest(description="Wrong shape", n=1)
     with pytest.raises(HTTPException) as exc:
-        suggest_subtasks(req)
+        asyncio.run(suggest_subtasks(req))
     assert exc.value.status_code == 502
     assert "expected a json list" in exc.value.detail.lower()
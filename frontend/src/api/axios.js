@@ -13,12 +13,34 @@ async function attachAuth(config) {
     return config;
 }
 
+/* ------------------------------------------------------------
+   Read-your-writes: responses to writes carry X-Last-Write; echo
+   the newest stamp to every service so reads that follow a write
+   skip a read replica that may not have it yet
+   ------------------------------------------------------------ */
+let lastWrite = 0;
+
+function sendLastWrite(config) {
+    if (lastWrite) {
+        config.headers = { ...config.headers, 'X-Last-Write': String(lastWrite) };
+    }
+    return config;
+}
+
+function keepLastWrite(response) {
+    const stamp = Number(response.headers?.['x-last-write']);
+    if (stamp > lastWrite) lastWrite = stamp;
+    return response;
+}
+
 /* ------------------------------------------------------------
    Factory – create one Axios client per micro-service
    ------------------------------------------------------------ */
 function makeClient(baseURL) {
     const client = axios.create({ baseURL });
     client.interceptors.request.use(attachAuth);
+    client.interceptors.request.use(sendLastWrite);
+    client.interceptors.response.use(keepLastWrite);
     return client;
 }
 
@@ -0,0 +1,44 @@
+// src/api/sse.js
+/* ------------------------------------------------------------
+   POST + server-sent events (EventSource can only GET).
+   Calls onEvent(event, data) for every frame as it arrives.
+   Rejects with { status, detail } when the request itself fails.
+   ------------------------------------------------------------ */
+export async function postSSE(baseURL, path, body, { onEvent, signal } = {}) {
+    const getToken = window.getAuth0Token;            // set in main.jsx
+    const headers = { 'Content-Type': 'application/json', Accept: 'text/event-stream' };
+    if (getToken) headers.Authorization = `Bearer ${await getToken()}`;
+
+    const res = await fetch(`${baseURL.replace(/\/$/, '')}${path}`, {
+        method: 'POST',
+        headers,
+        body: JSON.stringify(body),
+        signal,
+    });
+    if (!res.ok) {
+        let detail = null;
+        try { detail = (await res.json()).detail; } catch { /* not JSON */ }
+        throw { status: res.status, detail };
+    }
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let end;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            let event = 'message';
+            let data = '';
+            for (const line of frame.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            onEvent?.(event, data ? JSON.parse(data) : null);
+        }
+    }
+}
@@ -31,6 +31,7 @@ import {
 } from 'lucide-react';
 import { useSnackbar } from 'notistack';
 import { API } from '../api/axios';
+import { postSSE } from '../api/sse';
 import DeleteConfirmModal from './DeleteConfirmModal';
 import ModernSelectMenu from './ModernSelectMenu';
 
@@ -155,15 +156,23 @@ export default function BigTaskDetailsModal({
         setAiLoading(true);
         setAiSuggestions([]);
         try {
-            const { data } = await API.ai.post('/ai/suggest_subtasks', {
+            // streamed: each suggestion shows up as soon as the model writes it
+            await postSSE(import.meta.env.VITE_AI_API, '/ai/suggest_subtasks/stream', {
                 description,
                 n: 5,
+            }, {
+                onEvent: (event, data) => {
+                    if (event === 'suggestion') {
+                        setAiSuggestions(prev => [...prev, data.text]);
+                    } else if (event === 'error') {
+                        throw data;
+                    }
+                },
             });
-            setAiSuggestions(data.suggestions || []);
         } catch (error) {
             // Handle specific validation errors
-            if (error.response?.status === 422) {
-                const validationErrors = error.response.data?.detail;
+            if (error.status === 422) {
+                const validationErrors = error.detail;
                 if (validationErrors && Array.isArray(validationErrors)) {
                     const descriptionError = validationErrors.find(err =>
                         err.loc?.includes('description') && err.type === 'string_too_short'
@@ -9,12 +9,12 @@ import {
     ListItem,
     ListItemText,
     Button,
-    TextField,
     Divider,
     Chip,
 } from '@mui/material';
 import { useSnackbar } from 'notistack';
 import { API } from '../api/axios';
+import UserTypeahead from './UserTypeahead';
 
 /* ─────────────── Shared design tokens (copied from ProjectMembersModal) ─────────────── */
 const inputSx = {
@@ -238,12 +238,9 @@ export default function BigTaskMembersModal({ open, onClose, bigTaskId, containe
                         Add Member
                     </Typography>
 
-                    <TextField
-                        label="Username"
-                        fullWidth
-                        variant="outlined" // Ensure variant is set
+                    <UserTypeahead
                         value={newUsername}
-                        onChange={(e) => setNewUsername(e.target.value)}
+                        onChange={setNewUsername}
                         sx={{ ...inputSx, mb: 2 }}
                         InputLabelProps={{ sx: { color: '#bbb' } }}
                     />
@@ -16,6 +16,7 @@ import ColorModeContext from '../themes/ColorModeContext';
 import { API } from '../api/axios';
 import ProfileMenu from './ProfileMenu';
 import NotificationsMenu from './NotificationsMenu';
+import { useUnread } from './NotificationProvider';
 import ProjectNavigation from './ProjectNavigation';
 
 /* ────────────────────────────── constants ─── */
@@ -88,14 +89,8 @@ export default function Header({ onMenuClick, sidebarOpen }) {
   /* ───────────── profile / notifications ───── */
   const [profileEl, setProfileEl] = useState(null);
   const [bellEl, setBellEl]       = useState(null);
-  const [unread, setUnread]       = useState(0);
-
-  useEffect(() => {
-    API.notification
-      .get('/notifications/')
-      .then(({ data }) => setUnread((data || []).filter((n) => !n.read).length))
-      .catch(console.error);
-  }, []);
+  // kept live over the realtime gateway – no polling
+  const { unread, setUnread }     = useUnread();
 
   const { projectId } = useParams();
   const isProjectPage =
@@ -1,32 +1,125 @@
-import React, { useCallback } from 'react';
+import React, { createContext, useCallback, useContext, useEffect, useRef, useState } from 'react';
 import { SnackbarProvider, useSnackbar } from 'notistack';
 import useRealtimeGateway from '../hooks/useRealtimeGateway';
+import { API } from '../api/axios';
 
-function LiveToasts() {
+/**
+ * Unread badge state, kept current by the gateway:
+ *  – {type:'notification', id, unread} on every new notification
+ *  – {type:'unread', unread}           after notifications are marked read
+ *  – the gateway replays anything missed across a reconnect; only on the
+ *    first connect or a {type:'resync'} do we catch up over REST
+ *    (/notifications/sync?since=<last id>)
+ * so the bell never has to poll the notification service.
+ *
+ * The same socket carries board channels ('project:<id>', 'big_task:<id>'):
+ * useChannel(channel, onMsg) subscribes while the calling component is
+ * mounted; the gateway checks membership before it lets us in.
+ */
+const UnreadContext = createContext({ unread: 0, setUnread: () => {} });
+const ChannelContext = createContext(() => () => {});
+
+export function useUnread() {
+    return useContext(UnreadContext);
+}
+
+export function useChannel(channel, onMsg) {
+    const listen = useContext(ChannelContext);
+    const handlerRef = useRef(onMsg);
+
+    useEffect(() => {
+        handlerRef.current = onMsg;
+    }, [onMsg]);
+
+    useEffect(() => {
+        if (!channel) return undefined;
+        return listen(channel, msg => handlerRef.current(msg));
+    }, [channel, listen]);
+}
+
+function LiveToasts({ setUnread, listenersRef, gatewayRef }) {
     const { enqueueSnackbar } = useSnackbar();
+    const lastIdRef = useRef(null);
+    const syncRef = useRef(null);
 
     // stable across renders
     const handleMsg = useCallback(msg => {
-        if (msg.type === 'notification') {
+        if (msg.channel) {
+            listenersRef.current.get(msg.channel)?.forEach(fn => fn(msg));
+        } else if (msg.type === 'notification') {
             enqueueSnackbar(msg.message, { variant: 'info' });
+            if (typeof msg.unread === 'number') setUnread(msg.unread);
+            if (msg.id) lastIdRef.current = Math.max(lastIdRef.current ?? 0, msg.id);
+        } else if (msg.type === 'unread') {
+            setUnread(msg.unread);
+        } else if (msg.type === 'resync') {
+            syncRef.current?.();
+        }
+    }, [enqueueSnackbar, setUnread, listenersRef]);
+
+    const syncFromRest = useCallback(async () => {
+        try {
+            if (lastIdRef.current === null) {
+                // first connect: current badge + newest id as the sync cursor
+                const [{ data: count }, { data: latest }] = await Promise.all([
+                    API.notification.get('/notifications/unread_count'),
+                    API.notification.get('/notifications/', { params: { limit: 1 } }),
+                ]);
+                setUnread(count?.unread ?? 0);
+                lastIdRef.current = latest?.[0]?.id ?? 0;
+            } else {
+                const { data } = await API.notification.get('/notifications/sync', {
+                    params: { since: lastIdRef.current },
+                });
+                setUnread(data.unread);
+                lastIdRef.current = data.last_id;
+            }
+        } catch (err) {
+            console.error('Notification sync failed', err);
         }
-    }, [enqueueSnackbar]);
+    }, [setUnread]);
+    syncRef.current = syncFromRest;
 
-    useRealtimeGateway(handleMsg);
+    const handleOpen = useCallback(() => {
+        // later reconnects are covered by the gateway's replay
+        if (lastIdRef.current === null) syncFromRest();
+    }, [syncFromRest]);
+
+    gatewayRef.current = useRealtimeGateway(handleMsg, handleOpen);
     return null;
 }
 
 export default function NotificationProvider({ children }) {
+    const [unread, setUnread] = useState(0);
+    const listenersRef = useRef(new Map());   // channel → Set of handlers
+    const gatewayRef = useRef(null);
+
+    const listen = useCallback((channel, fn) => {
+        const listeners = listenersRef.current;
+        if (!listeners.has(channel)) listeners.set(channel, new Set());
+        listeners.get(channel).add(fn);
+        gatewayRef.current?.subscribe(channel);
+        return () => {
+            listeners.get(channel)?.delete(fn);
+            if (!listeners.get(channel)?.size) listeners.delete(channel);
+            gatewayRef.current?.unsubscribe(channel);
+        };
+    }, []);
+
     return (
-        <SnackbarProvider
-            maxSnack={3}
-            dense
-            anchorOrigin={{ vertical: 'top', horizontal: 'right' }}
-            autoHideDuration={4000}
-            iconVariant={{ success: '✅', error: '❌', warning: '⚠️', info: '🔔' }}
-        >
-            {children}
-            <LiveToasts />
-        </SnackbarProvider>
+        <UnreadContext.Provider value={{ unread, setUnread }}>
+        <ChannelContext.Provider value={listen}>
+            <SnackbarProvider
+                maxSnack={3}
+                dense
+                anchorOrigin={{ vertical: 'top', horizontal: 'right' }}
+                autoHideDuration={4000}
+                iconVariant={{ success: '✅', error: '❌', warning: '⚠️', info: '🔔' }}
+            >
+                {children}
+                <LiveToasts setUnread={setUnread} listenersRef={listenersRef} gatewayRef={gatewayRef} />
+            </SnackbarProvider>
+        </ChannelContext.Provider>
+        </UnreadContext.Provider>
     );
 }
@@ -46,16 +46,15 @@ export default function NotificationsMenu({
     if (open) fetchNotes();
   }, [open, fetchNotes]);
 
-  useEffect(() => {
-    onUnreadChange?.(unreadCount);
-  }, [unreadCount, onUnreadChange]);
-
+  // the badge itself comes from the server (pushed over the gateway);
+  // these updates are only optimistic until that push arrives
   const markRead = async (id) => {
     if (!id) return;
+    const wasUnread = notes.some(n => n.id === id && !n.read);
     setNotes(prev =>
       prev.map(n => (n.id === id ? { ...n, read: true } : n))
     );
-    onUnreadChange?.(unreadCount - 1);
+    if (wasUnread) onUnreadChange?.(u => Math.max(0, u - 1));
     try {
       await API.notification.post(`/notifications/${id}/read`);
     } catch (err) {
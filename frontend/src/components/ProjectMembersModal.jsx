@@ -9,7 +9,6 @@ import {
     ListItem,
     ListItemText,
     Button,
-    TextField,
     FormControl,
     InputLabel,
     Select,
@@ -21,6 +20,7 @@ import {
 import { useSnackbar } from 'notistack';
 import { useAuth0 } from '@auth0/auth0-react';
 import { API } from '../api/axios';
+import UserTypeahead from './UserTypeahead';
 
 /* ─────────────── Shared design tokens (matching BigTaskMembersModal) ─────────────── */
 const inputSx = {
@@ -278,12 +278,9 @@ export default function ProjectMembersModal({ open, onClose, projectId, containe
                         Add Member
                     </Typography>
 
-                    <TextField
-                        label="Username"
-                        fullWidth
-                        variant="outlined"
+                    <UserTypeahead
                         value={newUsername}
-                        onChange={(e) => setNewUsername(e.target.value)}
+                        onChange={setNewUsername}
                         sx={{ ...inputSx, mb: 2 }}
                         InputLabelProps={{ sx: { color: '#bbb' } }}
                     />
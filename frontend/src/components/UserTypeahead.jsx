@@ -0,0 +1,79 @@
+// src/components/UserTypeahead.jsx
+import React, { useEffect, useState } from 'react';
+import { Autocomplete, TextField, Avatar, Box, Typography } from '@mui/material';
+import { API } from '../api/axios';
+
+/* ------------------------------------------------------------
+   Username field with server-side suggestions (/users/search).
+   Debounced; a newer keystroke aborts the previous request.
+   Free text still works – the value is whatever is typed/picked.
+   ------------------------------------------------------------ */
+const DEBOUNCE_MS = 200;
+
+export default function UserTypeahead({ value, onChange, label = 'Username', sx, InputLabelProps }) {
+    const [options, setOptions] = useState([]);
+    const [loading, setLoading] = useState(false);
+
+    useEffect(() => {
+        const q = value.trim();
+        if (!q) {
+            setOptions([]);
+            return undefined;
+        }
+        const controller = new AbortController();
+        const timer = setTimeout(async () => {
+            setLoading(true);
+            try {
+                const { data } = await API.user.get('/users/search', {
+                    params: { q, limit: 8 },
+                    signal: controller.signal,
+                });
+                setOptions(data);
+            } catch {
+                /* aborted or failed – keep typing */
+            } finally {
+                if (!controller.signal.aborted) setLoading(false);
+            }
+        }, DEBOUNCE_MS);
+        return () => {
+            clearTimeout(timer);
+            controller.abort();
+        };
+    }, [value]);
+
+    return (
+        <Autocomplete
+            freeSolo
+            options={options}
+            loading={loading}
+            filterOptions={(x) => x}                  /* the server already ranked them */
+            getOptionLabel={(o) => (typeof o === 'string' ? o : o.username)}
+            inputValue={value}
+            onInputChange={(_, v) => onChange(v)}
+            onChange={(_, o) => onChange(o ? (typeof o === 'string' ? o : o.username) : '')}
+            renderOption={(props, o) => (
+                <Box component="li" {...props} key={o.id} sx={{ display: 'flex', gap: 1 }}>
+                    <Avatar src={o.avatar_url || undefined} sx={{ width: 24, height: 24 }}>
+                        {o.username[0]?.toUpperCase()}
+                    </Avatar>
+                    <Typography variant="body2">{o.username}</Typography>
+                    {o.display_name && (
+                        <Typography variant="body2" sx={{ color: 'text.secondary' }}>
+                            {o.display_name}
+                        </Typography>
+                    )}
+                </Box>
+            )}
+            renderInput={(params) => (
+                <TextField
+                    {...params}
+                    label={label}
+                    fullWidth
+                    variant="outlined"
+                    sx={sx}
+                    InputLabelProps={{ ...params.InputLabelProps, ...InputLabelProps }}
+                />
+            )}
+        />
+    );
+}
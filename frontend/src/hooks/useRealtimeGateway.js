@@ -1,5 +1,5 @@
 // src/hooks/useRealtimeGateway.js
-import { useEffect, useRef } from 'react';
+import { useCallback, useEffect, useRef } from 'react';
 import { useAuth0 } from '@auth0/auth0-react';
 
 /**
@@ -7,17 +7,50 @@ import { useAuth0 } from '@auth0/auth0-react';
  * – Adds the Auth0 access‑token as ?token=… (gateway verifies it)
  * – Auto‑reconnects every 3s until success
  * – Keeps the latest onMsg handler without reopening the socket
+ * – Remembers the last message `seq` and reconnects with ?since=<seq>, so
+ *   the gateway replays what was missed; if it can't, it sends
+ *   {type:'resync'} and the caller refetches over REST
+ * – Calls onOpen after every (re)connect
+ * – Answers the gateway's {type:'ping'} heartbeat with 'pong' (an idle
+ *   socket is closed by the gateway and we reconnect)
+ * – Returns { subscribe, unsubscribe } for channels such as 'project:12';
+ *   subscriptions are re-sent after every reconnect
  */
-export default function useRealtimeGateway(onMsg) {
+export default function useRealtimeGateway(onMsg, onOpen) {
     const { getAccessTokenSilently } = useAuth0();
 
     const wsRef = useRef(null);
     const handlerRef = useRef(onMsg);
+    const openRef = useRef(onOpen);
+    const seqRef = useRef(null);
+    const channelsRef = useRef(new Map());   // channel → subscriber count
 
-    // Keep the ref updated so we always call the latest callback
+    const sendIfOpen = useCallback((msg) => {
+        const ws = wsRef.current;
+        if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify(msg));
+    }, []);
+
+    const subscribe = useCallback((channel) => {
+        const count = channelsRef.current.get(channel) ?? 0;
+        channelsRef.current.set(channel, count + 1);
+        if (count === 0) sendIfOpen({ type: 'subscribe', channel });
+    }, [sendIfOpen]);
+
+    const unsubscribe = useCallback((channel) => {
+        const count = channelsRef.current.get(channel) ?? 0;
+        if (count <= 1) {
+            channelsRef.current.delete(channel);
+            sendIfOpen({ type: 'unsubscribe', channel });
+        } else {
+            channelsRef.current.set(channel, count - 1);
+        }
+    }, [sendIfOpen]);
+
+    // Keep the refs updated so we always call the latest callbacks
     useEffect(() => {
         handlerRef.current = onMsg;
-    }, [onMsg]);
+        openRef.current = onOpen;
+    }, [onMsg, onOpen]);
 
     useEffect(() => {
         let mounted = true;
@@ -32,18 +65,33 @@ export default function useRealtimeGateway(onMsg) {
 
                 // 2) Build ws / wss URL that matches the page host (no trailing slash)
                 const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
-                const wsUrl = `${protocol}://${window.location.host}/ws?token=${encodeURIComponent(token)}`;
+                const since = seqRef.current !== null ? `&since=${seqRef.current}` : '';
+                const wsUrl = `${protocol}://${window.location.host}/ws?token=${encodeURIComponent(token)}${since}`;
 
                 const ws = new WebSocket(wsUrl);
                 wsRef.current = ws;
 
                 ws.onopen = () => {
                     console.debug('[WS] ✅ connected');
+                    for (const channel of channelsRef.current.keys()) {
+                        ws.send(JSON.stringify({ type: 'subscribe', channel }));
+                    }
+                    openRef.current?.();
                 };
 
                 ws.onmessage = (e) => {
                     try {
                         const data = JSON.parse(e.data);
+                        if (data.type === 'ping') {
+                            ws.send('pong');
+                            return;
+                        }
+                        if (typeof data.seq === 'number') {
+                            // a live message can race a replayed one – drop dupes
+                            if (data.type !== 'resync' && seqRef.current !== null
+                                && data.seq <= seqRef.current) return;
+                            seqRef.current = data.seq;
+                        }
                         handlerRef.current(data);
                     } catch (err) {
                         console.warn('[WS] ⚠️ non‑JSON message', e.data);
@@ -72,4 +120,6 @@ export default function useRealtimeGateway(onMsg) {
             wsRef.current = null;
         };
     }, [getAccessTokenSilently]); // runs once per login session
+
+    return { subscribe, unsubscribe };
 }
@@ -2,6 +2,7 @@
 import React, {useEffect, useState, useMemo, useRef} from 'react';
 import {useParams, useNavigate, useLocation} from 'react-router-dom';
 import {API} from '../api/axios';
+import {useChannel} from '../components/NotificationProvider';
 import {
     Box,
     Typography,
@@ -97,6 +98,20 @@ export default function TaskBoard() {
 
     const isLoading = loading && authorized;
 
+    // board version the task list reflects (projects.data_version)
+    const versionRef = useRef(null);
+    const tasksRef = useRef(tasks);
+    tasksRef.current = tasks;
+
+    const loadTasks = async () => {
+        const params = {project_id: projectId};
+        if (epicId) params.big_task_id = epicId;
+        const {data: t, headers} = await API.project.get('/projects/tasks/', {params});
+        const version = Number(headers['x-data-version']);
+        versionRef.current = Number.isFinite(version) ? version : null;
+        setTasks(t);
+    };
+
     useEffect(() => {
         (async () => {
             try {
@@ -106,10 +121,7 @@ export default function TaskBoard() {
                     const {data: e} = await API.project.get(`/projects/big_tasks/big_tasks/${epicId}`);
                     setEpic(e);
                 }
-                const params = {project_id: projectId};
-                if (epicId) params.big_task_id = epicId;
-                const {data: t} = await API.project.get('/projects/tasks/', {params});
-                setTasks(t);
+                await loadTasks();
             } catch (err) {
                 if (err.response?.status === 403) setAuthorized(false);
                 else console.error(err);
@@ -142,6 +154,56 @@ export default function TaskBoard() {
         setSelectedTask(prev => (prev && prev.id === payload.id ? payload : prev));
     };
 
+    // Live board: change events ({entity, op, id, version, fields}) from the
+    // gateway channel are patched into local state – no full reload. On the
+    // project channel every write bumps the version by one, so a gap means
+    // we missed something and reload once.
+    const handleBoardEvent = msg => {
+        if (msg.type !== 'change') return;
+        const seen = versionRef.current;
+        if (seen !== null && msg.version <= seen) return;          // already in our list
+        if (!epicId && seen !== null && msg.version > seen + 1) {
+            loadTasks().catch(console.error);
+            return;
+        }
+        versionRef.current = msg.version;
+
+        if (msg.entity === 'big_task') {
+            if (epicId && msg.id === Number(epicId) && msg.op === 'update') {
+                setEpic(prev => (prev ? {...prev, ...msg.fields} : prev));
+            }
+            return;
+        }
+
+        const dropTask = () => setTasks(prev => prev.filter(t => t.id !== msg.id));
+        const leavesEpic = epicId && 'big_task_id' in msg.fields
+            && msg.fields.big_task_id !== Number(epicId);
+        if (msg.op === 'delete' || leavesEpic) {
+            dropTask();
+            setSelectedTask(prev => (prev && prev.id === msg.id ? null : prev));
+            return;
+        }
+
+        if (msg.op === 'create') {
+            setTasks(prev => prev.some(t => t.id === msg.id)
+                ? prev
+                : [{id: msg.id, project: project, ...msg.fields}, ...prev]);
+            return;
+        }
+
+        // update: patch in place; a task that just moved onto this big task
+        // isn't in our list yet and only carries the changed fields
+        if (!tasksRef.current.some(t => t.id === msg.id)) {
+            API.project.get(`/projects/tasks/${msg.id}`)
+                .then(({data: task}) => setTasks(cur => [task, ...cur.filter(t => t.id !== task.id)]))
+                .catch(console.error);
+            return;
+        }
+        setTasks(prev => prev.map(t => (t.id === msg.id ? {...t, ...msg.fields} : t)));
+        setSelectedTask(prev => (prev && prev.id === msg.id ? {...prev, ...msg.fields} : prev));
+    };
+    useChannel(epicId ? `big_task:${epicId}` : `project:${projectId}`, handleBoardEvent);
+
     const openDueMenu = e => setDueAnchor(e.currentTarget);
     const closeDueMenu = () => {
         setDueAnchor(null);